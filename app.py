@@ -2,13 +2,21 @@
 Flask 웹 서버 - AI 챗봇 메인 애플리케이션
 CSV 데이터 기반으로 동작합니다.
 """
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
 from flask_cors import CORS
-from csv_loader import CSVDataLoader
 from chatbot import ChatBot
+from data_reloader import DataReloader
+from history_store import create_history_store
+from resilience import CircuitBreaker, ResilientCaller, RetryPolicy
+from response_cache import ResponseCache, make_cache_key
+from collections import Counter
+import json
 import logging
 import config
 import os
+import threading
+import time
+import uuid
 
 app = Flask(__name__)
 CORS(app)
@@ -16,35 +24,257 @@ CORS(app)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# CSV 파일 경로
+POSTS_CSV = os.path.join(os.path.dirname(__file__), '20251125_PPM학습용데이터_원글.csv')
+COMMENTS_CSV = os.path.join(os.path.dirname(__file__), '20251125_PPM학습용데이터_댓글.csv')
+
 # 전역 변수
+# csv_loader는 새로고침 때마다 통째로 바뀌므로, 요청 처리 중에는 처음 읽은 로더를 계속 사용
 csv_loader = None
+data_reloader = None
 chatbot = None
+response_cache = None
+history_store = None
+
+# 대화 기록을 구분하는 세션 쿠키
+SESSION_COOKIE = 'chat_session'
+
+# /api/stats에 추가로 보고할 항목 (이름 -> 통계 dict를 반환하는 함수, ASGI 진입점 등에서 등록)
+stats_providers = {}
+
+# 고객사 감지 경로별 횟수 (exact / fuzzy / llm / none)
+client_detection_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def _record_detection(path):
+    with _stats_lock:
+        client_detection_stats[path] += 1
+
+
+def create_resilience():
+    """설정값으로 OpenAI 호출 재시도/회로 차단기 생성"""
+    return ResilientCaller(
+        RetryPolicy(max_attempts=config.OPENAI_MAX_ATTEMPTS,
+                    base_delay=config.OPENAI_RETRY_BASE_DELAY,
+                    max_delay=config.OPENAI_RETRY_MAX_DELAY),
+        CircuitBreaker(failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+                       reset_timeout=config.CIRCUIT_RESET_SECONDS)
+    )
 
 
 def init_services():
     """서비스 초기화"""
-    global csv_loader, chatbot
+    global chatbot, response_cache, history_store, data_reloader
     
     # 설정에서 값 읽기
     api_key = config.OPENAI_API_KEY
     
-    # CSV 파일 경로 설정
-    posts_csv = os.path.join(os.path.dirname(__file__), '20251125_PPM학습용데이터_원글.csv')
-    comments_csv = os.path.join(os.path.dirname(__file__), '20251125_PPM학습용데이터_댓글.csv')
-    
     # 서비스 초기화
-    csv_loader = CSVDataLoader(posts_csv, comments_csv)
-    chatbot = ChatBot(api_key)
+    response_cache = ResponseCache(
+        max_bytes=config.RESPONSE_CACHE_MAX_BYTES,
+        ttl_seconds=config.RESPONSE_CACHE_TTL_SECONDS
+    )
+    history_store = create_history_store(
+        config.HISTORY_BACKEND,
+        db_path=config.HISTORY_DB_PATH,
+        max_messages=config.HISTORY_MAX_MESSAGES,
+        idle_ttl_seconds=config.HISTORY_IDLE_TTL_SECONDS,
+        max_sessions=config.HISTORY_MAX_SESSIONS
+    )
+    chatbot = ChatBot(api_key, response_cache=response_cache, base_url=config.OPENAI_BASE_URL,
+                      history_store=history_store, model=config.CHAT_MODEL,
+                      max_tokens=config.CHAT_MAX_TOKENS, context_budget=config.CONTEXT_TOKEN_BUDGET,
+                      reserved_tokens=config.CONTEXT_RESERVED_TOKENS, resilience=create_resilience())
+    
+    # CSV 데이터 (첫 로드는 동기로 스냅샷 또는 CSV, 이후 새로고침은 백그라운드에서 만든 뒤 교체)
+    data_reloader = DataReloader(POSTS_CSV, COMMENTS_CSV, poll_interval=config.DATA_RELOAD_POLL_SECONDS,
+                                 snapshot_path=config.DATA_SNAPSHOT_PATH or None)
+    data_reloader.on_reload.append(_on_data_reload)
+    data_reloader.load()
+    data_reloader.start_watching()
     
     logger.info("서비스 초기화 완료")
 
 
+def _on_data_reload(loader):
+    global csv_loader
+    csv_loader = loader
+    # 이전 데이터 기준 응답은 더 이상 유효하지 않음
+    if response_cache:
+        response_cache.clear()
+
+
+@app.before_request
+def load_session_id():
+    """요청한 브라우저의 대화 세션 ID (없으면 새로 발급)"""
+    session_id = request.cookies.get(SESSION_COOKIE, '')
+    g.new_session = not (0 < len(session_id) <= 64)
+    g.session_id = uuid.uuid4().hex if g.new_session else session_id
+
+
+@app.after_request
+def save_session_id(response):
+    if g.get('new_session'):
+        response.set_cookie(SESSION_COOKIE, g.session_id, httponly=True, samesite='Lax',
+                            max_age=int(config.HISTORY_IDLE_TTL_SECONDS))
+    return response
+
+
 @app.route('/')
 def index():
     """메인 페이지"""
     return render_template('index.html')
 
 
+def _detect_client_locally(user_message, loader):
+    """
+    로컬 고객사 감지 (정확한 매칭 -> 근사 매칭)
+
+    Returns:
+        (고객사 이름 또는 None, GPT 추출이 필요한지 여부)
+    """
+    if not loader:
+        return None, False
+    
+    # 1. 정확한 매칭 (로드 시 생성한 오토마톤으로 1회 순회)
+    client_name = loader.match_client_name(user_message)
+    if client_name:
+        _record_detection('exact')
+        logger.info(f"고객사 감지: {client_name}")
+        return client_name, False
+    
+    # 2. 근사 매칭 (자모 n-gram 유사도, 오타/띄어쓰기 차이 허용)
+    fuzzy_name, fuzzy_score = loader.fuzzy_match_client_name(user_message)
+    if fuzzy_name and fuzzy_score >= config.CLIENT_FUZZY_THRESHOLD:
+        _record_detection('fuzzy')
+        logger.info(f"고객사 감지 (근사 매칭, 신뢰도 {fuzzy_score:.2f}): {fuzzy_name}")
+        return fuzzy_name, False
+    
+    # 3. 근사 매칭 신뢰도가 애매한 경우에만 GPT로 추출
+    if loader.get_client_names() and fuzzy_score >= config.CLIENT_LLM_FALLBACK_MIN_SCORE:
+        _record_detection('llm')
+        return None, True
+    
+    _record_detection('none')
+    return None, False
+
+
+def _client_extraction_prompt(user_message, loader):
+    """GPT 고객사 이름 추출 프롬프트"""
+    client_list = ", ".join(loader.get_client_names()[:50])  # 최대 50개만
+    return f"""다음 메시지에서 고객사 이름을 추출해주세요. 
+가능한 고객사 목록: {client_list}
+메시지: {user_message}
+고객사 이름만 답변해주세요. 없으면 "없음"이라고 답변해주세요."""
+
+
+def _match_extracted_client(extracted_name, loader):
+    """GPT가 추출한 이름이 고객사 목록에 있는지 확인"""
+    extracted_name = extracted_name.strip()
+    if extracted_name and extracted_name != "없음":
+        for name in loader.get_client_names():
+            if extracted_name in name or name in extracted_name:
+                logger.info(f"고객사 감지 (GPT 추출): {name}")
+                return name
+    return None
+
+
+def _prepare_chat(user_message):
+    """
+    메시지 분석 (고객사, 날짜 필터, 질문 유형) 후 응답 생성에 필요한 인자 구성
+
+    /api/chat과 /api/chat/stream이 공통으로 사용합니다.
+    도중에 데이터가 새로고침되어도 처음 읽은 로더 하나로 끝까지 처리합니다.
+    """
+    loader = csv_loader
+    client_name, needs_extraction = _detect_client_locally(user_message, loader)
+    if needs_extraction:
+        try:
+            # 추출용 호출은 대화 기록을 사용하지도, 남기지도 않음
+            extracted_name = chatbot.get_response(_client_extraction_prompt(user_message, loader), "",
+                                                  record_history=False)
+            client_name = _match_extracted_client(extracted_name, loader)
+        except Exception as e:
+            logger.warning(f"GPT로 고객사 이름 추출 실패: {str(e)}")
+    return _chat_arguments(user_message, client_name, loader)
+
+
+def _chat_arguments(user_message, client_name, loader):
+    """고객사가 정해진 뒤 날짜 필터, 질문 유형, 담당자, 게시판 컨텍스트로 응답 생성 인자 구성"""
+    # 날짜 필터 감지
+    date_filter = None
+    date_keywords = {
+        '오늘': 'today',
+        '어제': 'yesterday',
+        '이번 주': 'this_week',
+        '이번주': 'this_week',
+        '지난 주': 'last_week',
+        '지난주': 'last_week',
+        '이번 달': 'this_month',
+        '이번달': 'this_month',
+        '지난 달': 'last_month',
+        '지난달': 'last_month',
+        '최근': 'recent',
+        '최근 일주일': 'recent',
+        '최근 7일': 'recent',
+    }
+    
+    for keyword, filter_value in date_keywords.items():
+        if keyword in user_message:
+            date_filter = filter_value
+            logger.info(f"날짜 필터 감지: {keyword} -> {filter_value}")
+            break
+    
+    # 문제/어려운 케이스 관련 질문인지 감지
+    is_problem_query = any(keyword in user_message for keyword in [
+        '문제', '어려움', '이슈', '오류', '에러', '장애', '트러블', '난제', 
+        '복잡', '어려웠', '문제가', '이슈가', '오류가', '에러가'
+    ])
+    
+    # 담당자 문의인지 감지
+    is_contact_query = any(keyword in user_message for keyword in [
+        '담당자', '문의', '연락', '누구', '누가', '어디', '어느', '담당', '접촉'
+    ])
+    
+    # 담당자 정보 추출 (담당자 문의인 경우)
+    responsible_person_info = None
+    if is_contact_query and loader and client_name:
+        try:
+            responsible_person_info = loader.get_responsible_person(client_name)
+            if responsible_person_info:
+                logger.info(f"고객사 '{client_name}'의 담당자 정보: {responsible_person_info}")
+        except Exception as e:
+            logger.warning(f"담당자 정보 추출 실패: {str(e)}")
+    
+    # CSV 데이터에서 게시판 정보 가져오기
+    board_context = ""
+    try:
+        if loader:
+            # 모델 토큰 예산 안에 들어가는 게시글만 순위대로 통째로 포함
+            board_context = loader.get_posts_text(
+                limit=30, 
+                client_name=client_name, 
+                date_filter=date_filter,
+                token_budget=chatbot.context_token_budget if chatbot else None,
+                comments_per_post=config.CONTEXT_COMMENTS_PER_POST
+            )
+            
+            if not board_context:
+                logger.warning("게시판 정보가 비어있습니다.")
+            elif date_filter:
+                logger.info(f"날짜 필터 적용됨: {date_filter}")
+    except Exception as e:
+        logger.warning(f"게시판 정보 수집 실패: {str(e)}")
+    
+    return {
+        'board_context': board_context,
+        'is_problem_query': is_problem_query,
+        'responsible_person_info': responsible_person_info,
+        'cache_key': make_cache_key(user_message, client_name, date_filter, board_context),
+    }
+
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """챗봇 API 엔드포인트"""
@@ -55,113 +285,9 @@ def chat():
         if not user_message:
             return jsonify({'error': '메시지가 필요합니다.'}), 400
         
-        # 고객사 이름 추출
-        client_name = None
-        
-        # CSV에서 고객사 목록 가져오기
-        if csv_loader:
-            client_names = csv_loader.get_client_names()
-            
-            # 사용자 메시지에서 고객사 이름 찾기
-            for name in client_names:
-                if name in user_message or any(word in name for word in user_message.split() if len(word) > 2):
-                    client_name = name
-                    logger.info(f"고객사 감지: {client_name}")
-                    break
-            
-            # 정확한 매칭이 없으면 GPT로 추출 시도
-            if not client_name and client_names:
-                try:
-                    client_list = ", ".join(client_names[:50])  # 최대 50개만
-                    extraction_prompt = f"""다음 메시지에서 고객사 이름을 추출해주세요. 
-가능한 고객사 목록: {client_list}
-메시지: {user_message}
-고객사 이름만 답변해주세요. 없으면 "없음"이라고 답변해주세요."""
-                    
-                    extracted_name = chatbot.get_response(extraction_prompt, "")
-                    extracted_name = extracted_name.strip()
-                    
-                    # 추출된 이름이 고객사 목록에 있는지 확인
-                    if extracted_name and extracted_name != "없음":
-                        for name in client_names:
-                            if extracted_name in name or name in extracted_name:
-                                client_name = name
-                                break
-                    
-                    if client_name:
-                        logger.info(f"고객사 감지 (GPT 추출): {client_name}")
-                except Exception as e:
-                    logger.warning(f"GPT로 고객사 이름 추출 실패: {str(e)}")
-        
-        # 날짜 필터 감지
-        date_filter = None
-        date_keywords = {
-            '오늘': 'today',
-            '어제': 'yesterday',
-            '이번 주': 'this_week',
-            '이번주': 'this_week',
-            '지난 주': 'last_week',
-            '지난주': 'last_week',
-            '이번 달': 'this_month',
-            '이번달': 'this_month',
-            '지난 달': 'last_month',
-            '지난달': 'last_month',
-            '최근': 'recent',
-            '최근 일주일': 'recent',
-            '최근 7일': 'recent',
-        }
-        
-        for keyword, filter_value in date_keywords.items():
-            if keyword in user_message:
-                date_filter = filter_value
-                logger.info(f"날짜 필터 감지: {keyword} -> {filter_value}")
-                break
-        
-        # 문제/어려운 케이스 관련 질문인지 감지
-        is_problem_query = any(keyword in user_message for keyword in [
-            '문제', '어려움', '이슈', '오류', '에러', '장애', '트러블', '난제', 
-            '복잡', '어려웠', '문제가', '이슈가', '오류가', '에러가'
-        ])
-        
-        # 담당자 문의인지 감지
-        is_contact_query = any(keyword in user_message for keyword in [
-            '담당자', '문의', '연락', '누구', '누가', '어디', '어느', '담당', '접촉'
-        ])
-        
-        # 담당자 정보 추출 (담당자 문의인 경우)
-        responsible_person_info = None
-        if is_contact_query and csv_loader and client_name:
-            try:
-                responsible_person_info = csv_loader.get_responsible_person(client_name)
-                if responsible_person_info:
-                    logger.info(f"고객사 '{client_name}'의 담당자 정보: {responsible_person_info}")
-            except Exception as e:
-                logger.warning(f"담당자 정보 추출 실패: {str(e)}")
-        
-        # CSV 데이터에서 게시판 정보 가져오기
-        board_context = ""
-        try:
-            if csv_loader:
-                board_context = csv_loader.get_posts_text(
-                    limit=30, 
-                    client_name=client_name, 
-                    date_filter=date_filter
-                )
-                
-                if not board_context:
-                    logger.warning("게시판 정보가 비어있습니다.")
-                elif date_filter:
-                    logger.info(f"날짜 필터 적용됨: {date_filter}")
-        except Exception as e:
-            logger.warning(f"게시판 정보 수집 실패: {str(e)}")
-        
         # 챗봇 응답 생성
-        response = chatbot.get_response(
-            user_message, 
-            board_context, 
-            is_problem_query=is_problem_query,
-            responsible_person_info=responsible_person_info
-        )
+        response = chatbot.get_response(user_message, session_id=g.session_id,
+                                        **_prepare_chat(user_message))
         
         return jsonify({
             'response': response,
@@ -173,27 +299,96 @@ def chat():
         return jsonify({'error': str(e)}), 500
 
 
+def _sse_event(data, event=None):
+    """SSE 이벤트 문자열 (data는 JSON 한 줄)"""
+    payload = json.dumps(data, ensure_ascii=False)
+    if event:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f"data: {payload}\n\n"
+
+
+@app.route('/api/chat/stream', methods=['POST'])
+def chat_stream():
+    """
+    스트리밍 챗봇 API 엔드포인트 (server-sent events)
+
+    응답 조각마다 `data: {"delta": ...}` 이벤트를 보내고, 마지막에
+    `event: done` 이벤트로 첫 조각까지 걸린 시간(ttfb_ms)과 전체 시간(total_ms)을 보냅니다.
+    응답 생성 중 오류가 나면 done 대신 `event: error` 이벤트(`{"error": ...}`)를 보내고, 대화 기록과 캐시에는 남기지 않습니다.
+    """
+    started = time.perf_counter()
+    data = request.json or {}
+    user_message = data.get('message', '')
+    
+    if not user_message:
+        return jsonify({'error': '메시지가 필요합니다.'}), 400
+    
+    try:
+        chat_args = _prepare_chat(user_message)
+    except Exception as e:
+        logger.error(f"챗봇 API 오류: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+    
+    session_id = g.session_id
+    
+    def generate():
+        first_delta_at = None
+        try:
+            for delta in chatbot.get_response(user_message, stream=True, session_id=session_id,
+                                              **chat_args):
+                if first_delta_at is None:
+                    first_delta_at = time.perf_counter()
+                yield _sse_event({'delta': delta})
+        except Exception as e:
+            logger.error(f"스트리밍 응답 오류: {str(e)}")
+            yield _sse_event({'error': str(e)}, event='error')
+            return
+        
+        finished = time.perf_counter()
+        ttfb_ms = ((first_delta_at or finished) - started) * 1000
+        total_ms = (finished - started) * 1000
+        logger.info(f"스트리밍 응답 시간: 첫 조각 {ttfb_ms:.0f}ms, 전체 {total_ms:.0f}ms")
+        yield _sse_event({'ttfb_ms': round(ttfb_ms, 1), 'total_ms': round(total_ms, 1)}, event='done')
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            # 프록시(nginx 등)가 응답을 모아서 보내지 않도록
+            'X-Accel-Buffering': 'no',
+        }
+    )
+
+
 @app.route('/api/refresh-board', methods=['POST'])
 def refresh_board():
-    """CSV 데이터 새로고침"""
+    """
+    CSV 데이터 새로고침 (백그라운드)
+
+    새 데이터와 인덱스를 백그라운드에서 만든 뒤 교체하므로 바로 응답하며 (202),
+    진행 상태와 소요 시간은 GET /api/refresh-board로 확인합니다.
+    요청 본문에 {"wait": true}를 주면 새로고침이 끝날 때까지 기다렸다가 결과를 반환합니다.
+    """
     try:
-        global csv_loader
-        
-        # CSV 파일 경로 설정
-        posts_csv = os.path.join(os.path.dirname(__file__), '20251125_PPM학습용데이터_원글.csv')
-        comments_csv = os.path.join(os.path.dirname(__file__), '20251125_PPM학습용데이터_댓글.csv')
+        data = request.get_json(silent=True) or {}
+        started = data_reloader.reload_async()
+        if data.get('wait'):
+            data_reloader.wait(config.DATA_RELOAD_WAIT_SECONDS)
         
-        # 재초기화
-        csv_loader = CSVDataLoader(posts_csv, comments_csv)
-        
-        posts_count = len(csv_loader.posts_data) if csv_loader.posts_data else 0
-        comments_count = len(csv_loader.comments_data) if csv_loader.comments_data else 0
+        status = data_reloader.stats()
+        if status['reloading']:
+            message = ('CSV 데이터 새로고침을 시작했습니다.' if started
+                       else 'CSV 데이터 새로고침이 이미 진행 중입니다. 끝난 뒤 한 번 더 새로고침합니다.')
+            return jsonify({'success': True, 'message': message, **status}), 202
         
+        if status['last_error']:
+            return jsonify({'success': False, 'message': status['last_error'], **status}), 500
         return jsonify({
             'success': True,
-            'message': f'CSV 데이터를 새로고침했습니다. (원글: {posts_count}개, 댓글: {comments_count}개)',
-            'posts_count': posts_count,
-            'comments_count': comments_count
+            'message': (f"CSV 데이터를 새로고침했습니다. (원글: {status['posts_count']}개, "
+                        f"댓글: {status['comments_count']}개, {status['last_duration_ms']:.0f}ms)"),
+            **status
         })
             
     except Exception as e:
@@ -201,11 +396,36 @@ def refresh_board():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/refresh-board', methods=['GET'])
+def refresh_board_status():
+    """CSV 데이터 새로고침 진행 상태와 마지막 새로고침 소요 시간"""
+    return jsonify(data_reloader.stats() if data_reloader else {})
+
+
+@app.route('/api/stats', methods=['GET'])
+def stats():
+    """고객사 감지 경로별 횟수 등 운영 통계"""
+    with _stats_lock:
+        detection = dict(client_detection_stats)
+    result = {
+        'client_detection': detection,
+        'response_cache': response_cache.stats() if response_cache else None,
+        'history': history_store.stats() if history_store else None,
+        'openai_calls': chatbot.resilience.stats() if chatbot else None,
+        'data_reload': data_reloader.stats() if data_reloader else None,
+        'client_fuzzy_threshold': config.CLIENT_FUZZY_THRESHOLD,
+        'client_llm_fallback_min_score': config.CLIENT_LLM_FALLBACK_MIN_SCORE,
+    }
+    for name, provider in stats_providers.items():
+        result[name] = provider()
+    return jsonify(result)
+
+
 @app.route('/api/clear-history', methods=['POST'])
 def clear_history():
-    """대화 기록 초기화"""
+    """요청한 세션의 대화 기록만 초기화"""
     try:
-        chatbot.clear_history()
+        chatbot.clear_history(g.session_id)
         return jsonify({'success': True, 'message': '대화 기록이 초기화되었습니다.'})
     except Exception as e:
         logger.error(f"대화 기록 초기화 오류: {str(e)}")
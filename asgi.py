@@ -0,0 +1,193 @@
+"""
+ASGI 진입점
+/api/chat, /api/chat/stream은 AsyncOpenAI 기반 비동기 경로로 처리하고,
+나머지 경로(메인 페이지, 새로고침, 통계 등)는 기존 Flask 앱으로 넘깁니다.
+
+실행:
+    uvicorn asgi:application --host 0.0.0.0 --port 5000
+    (여러 워커를 쓸 때는 HISTORY_BACKEND=sqlite로 대화 기록을 공유)
+"""
+import json
+import time
+import uuid
+from http.cookies import SimpleCookie
+import logging
+
+from asgiref.wsgi import WsgiToAsgi
+
+import app as flask_app
+import config
+from async_chatbot import AsyncChatBot, ChatBusyError
+
+logger = logging.getLogger(__name__)
+
+# 비동기 챗봇 (lifespan 시작 시 생성, Flask 앱과 캐시/대화 기록 저장소 공유)
+async_chatbot = None
+
+_flask_asgi = WsgiToAsgi(flask_app.app)
+_ASYNC_PATHS = ('/api/chat', '/api/chat/stream')
+
+
+def init_async_services():
+    """Flask 앱 서비스와 비동기 챗봇 초기화"""
+    global async_chatbot
+    flask_app.init_services()
+    async_chatbot = AsyncChatBot(
+        config.OPENAI_API_KEY,
+        max_concurrency=config.OPENAI_MAX_CONCURRENCY,
+        queue_timeout=config.OPENAI_QUEUE_TIMEOUT_SECONDS,
+        request_timeout=config.OPENAI_TIMEOUT_SECONDS,
+        connect_timeout=config.OPENAI_CONNECT_TIMEOUT_SECONDS,
+        max_connections=config.OPENAI_MAX_CONNECTIONS,
+        response_cache=flask_app.response_cache,
+        base_url=config.OPENAI_BASE_URL,
+        history_store=flask_app.history_store,
+        model=config.CHAT_MODEL,
+        max_tokens=config.CHAT_MAX_TOKENS,
+        context_budget=config.CONTEXT_TOKEN_BUDGET,
+        reserved_tokens=config.CONTEXT_RESERVED_TOKENS,
+        # 같은 OpenAI API를 호출하므로 회로 차단 상태와 통계를 Flask 챗봇과 공유
+        resilience=flask_app.chatbot.resilience
+    )
+    flask_app.stats_providers['async_chat'] = async_chatbot.stats
+    logger.info("비동기 챗봇 초기화 완료")
+
+
+async def _read_json(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body'):
+            break
+    return json.loads(body or b'{}')
+
+
+def _session_id(scope):
+    """쿠키의 대화 세션 ID와 새로 발급했는지 여부"""
+    cookie = SimpleCookie()
+    for name, value in scope.get('headers', []):
+        if name == b'cookie':
+            cookie.load(value.decode('latin-1'))
+    morsel = cookie.get(flask_app.SESSION_COOKIE)
+    session_id = morsel.value if morsel else ''
+    if 0 < len(session_id) <= 64:
+        return session_id, False
+    return uuid.uuid4().hex, True
+
+
+def _headers(content_type, session_id, new_session):
+    headers = [(b'content-type', content_type.encode())]
+    if new_session:
+        cookie = (f"{flask_app.SESSION_COOKIE}={session_id}; Path=/; HttpOnly; SameSite=Lax; "
+                  f"Max-Age={int(config.HISTORY_IDLE_TTL_SECONDS)}")
+        headers.append((b'set-cookie', cookie.encode()))
+    return headers
+
+
+async def _send_json(send, status, data, session_id=None, new_session=False):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': _headers('application/json; charset=utf-8', session_id, new_session)})
+    await send({'type': 'http.response.body', 'body': json.dumps(data, ensure_ascii=False).encode('utf-8')})
+
+
+async def _prepare_chat_async(user_message):
+    """app._prepare_chat의 비동기 버전 (GPT 고객사 추출만 비동기 호출)"""
+    loader = flask_app.csv_loader
+    client_name, needs_extraction = flask_app._detect_client_locally(user_message, loader)
+    if needs_extraction:
+        # 추출용 호출은 대화 기록을 사용하지도, 남기지도 않음
+        extracted_name = await async_chatbot.get_response_async(
+            flask_app._client_extraction_prompt(user_message, loader), "", record_history=False)
+        client_name = flask_app._match_extracted_client(extracted_name, loader)
+    return flask_app._chat_arguments(user_message, client_name, loader)
+
+
+async def _handle_chat(scope, receive, send, stream):
+    started = time.perf_counter()
+    session_id, new_session = _session_id(scope)
+    try:
+        data = await _read_json(receive)
+    except ValueError:
+        await _send_json(send, 400, {'error': '잘못된 요청입니다.'})
+        return
+    user_message = data.get('message', '')
+    if not user_message:
+        await _send_json(send, 400, {'error': '메시지가 필요합니다.'})
+        return
+
+    try:
+        chat_args = await _prepare_chat_async(user_message)
+        if not stream:
+            response = await async_chatbot.get_response_async(user_message, session_id=session_id, **chat_args)
+            await _send_json(send, 200, {'response': response, 'success': True}, session_id, new_session)
+            return
+
+        deltas = async_chatbot.stream_response_async(user_message, session_id=session_id, **chat_args)
+        # 첫 조각을 받은 뒤 헤더를 보내야 대기 한도 초과를 503으로 응답할 수 있음
+        first_delta = await deltas.__anext__()
+    except ChatBusyError as e:
+        await _send_json(send, 503, {'error': str(e)}, session_id, new_session)
+        return
+    except StopAsyncIteration:
+        first_delta = None
+    except Exception as e:
+        logger.error(f"챗봇 API 오류: {str(e)}")
+        await _send_json(send, 500, {'error': str(e)}, session_id, new_session)
+        return
+
+    first_delta_at = time.perf_counter()
+    try:
+        headers = _headers('text/event-stream; charset=utf-8', session_id, new_session)
+        headers += [(b'cache-control', b'no-cache'), (b'x-accel-buffering', b'no')]
+        await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+
+        async def send_event(payload, event=None):
+            await send({'type': 'http.response.body', 'body': flask_app._sse_event(payload, event).encode('utf-8'),
+                        'more_body': True})
+
+        try:
+            if first_delta is not None:
+                await send_event({'delta': first_delta})
+                async for delta in deltas:
+                    await send_event({'delta': delta})
+        except Exception as e:
+            logger.error(f"스트리밍 응답 오류: {str(e)}")
+            await send_event({'error': str(e)}, event='error')
+        else:
+            finished = time.perf_counter()
+            ttfb_ms = (first_delta_at - started) * 1000
+            total_ms = (finished - started) * 1000
+            logger.info(f"스트리밍 응답 시간: 첫 조각 {ttfb_ms:.0f}ms, 전체 {total_ms:.0f}ms")
+            await send_event({'ttfb_ms': round(ttfb_ms, 1), 'total_ms': round(total_ms, 1)}, event='done')
+        await send({'type': 'http.response.body', 'body': b''})
+    finally:
+        # 클라이언트 연결이 끊겨 send가 실패해도 제너레이터가 잡은 동시 호출 한도를 바로 반환
+        await deltas.aclose()
+
+
+async def _handle_lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            try:
+                init_async_services()
+            except Exception as e:
+                await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+                return
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if async_chatbot:
+                await async_chatbot.aclose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def application(scope, receive, send):
+    """ASGI 앱"""
+    if scope['type'] == 'lifespan':
+        await _handle_lifespan(receive, send)
+    elif scope['type'] == 'http' and scope['method'] == 'POST' and scope['path'] in _ASYNC_PATHS:
+        await _handle_chat(scope, receive, send, stream=scope['path'].endswith('/stream'))
+    else:
+        await _flask_asgi(scope, receive, send)
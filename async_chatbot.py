@@ -0,0 +1,222 @@
+"""
+비동기 챗봇 모듈
+AsyncOpenAI 클라이언트(연결 풀 공유)로 응답을 생성하며,
+동시 호출 수 제한과 요청별 제한 시간을 적용합니다.
+일시적 오류 재시도, 회로 차단, 같은 요청 합치기는 ChatBot.resilience를 함께 사용합니다.
+프롬프트 구성, 대화 기록, 응답 캐시는 ChatBot과 같은 로직을 사용하며,
+대화 기록/응답 캐시 접근(SQLite 잠금 대기 포함)은 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+"""
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+import time
+import httpx
+from openai import AsyncOpenAI
+import logging
+
+from chatbot import ChatBot, DEFAULT_SESSION_ID
+
+logger = logging.getLogger(__name__)
+
+
+class ChatBusyError(Exception):
+    """동시 호출 한도가 찬 상태로 대기 시간이 지나 요청을 시작하지 못함"""
+
+
+class AsyncChatBot(ChatBot):
+    """
+    asyncio 기반 챗봇
+
+    max_concurrency: 동시에 진행하는 OpenAI 호출 수 (초과분은 대기)
+    queue_timeout: 호출 순서를 기다리는 최대 시간 (초과 시 ChatBusyError)
+    request_timeout: 호출 1회의 전체 제한 시간 (스트리밍은 첫 조각부터 마지막 조각까지 포함)
+    max_connections: 연결 풀 크기 (keep-alive 연결 재사용)
+    """
+
+    def __init__(self, api_key, max_concurrency=32, queue_timeout=10.0, request_timeout=60.0,
+                 connect_timeout=5.0, max_connections=100, **kwargs):
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.request_timeout = request_timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        super().__init__(api_key, **kwargs)
+
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        self._semaphore = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _create_client(self, api_key, base_url):
+        return AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,
+            timeout=httpx.Timeout(self.request_timeout, connect=self.connect_timeout),
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections)
+            )
+        )
+
+    @asynccontextmanager
+    async def _slot(self):
+        """동시 호출 한도 안에서 실행 (queue_timeout 안에 순서가 오지 않으면 ChatBusyError)"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ChatBusyError("요청이 많아 잠시 후 다시 시도해주세요.")
+        finally:
+            self.waiting -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    async def get_response_async(self, user_message, board_context="", is_problem_query=False,
+                                 responsible_person_info=None, record_history=True, cache_key=None,
+                                 session_id=DEFAULT_SESSION_ID):
+        """
+        사용자 메시지에 대한 응답 생성 (비동기)
+
+        동시 호출 한도 대기 시간을 넘기면 ChatBusyError를 발생시키고,
+        그 외 오류는 ChatBot.get_response와 같이 오류 안내 문자열로 반환합니다.
+        동시 호출 한도는 시도마다 따로 잡으므로 재시도 대기 중에는 다른 요청이 호출할 수 있습니다.
+        """
+        history_session = session_id if record_history else None
+        cached = await asyncio.to_thread(self._cached_response, user_message, cache_key, history_session)
+        if cached is not None:
+            return cached
+
+        messages = await asyncio.to_thread(self._build_messages, user_message, board_context, is_problem_query,
+                                           responsible_person_info, history_session)
+
+        async def complete():
+            async with self._slot():
+                try:
+                    return await asyncio.wait_for(
+                        self.client.chat.completions.create(
+                            model=self.model,
+                            messages=messages,
+                            temperature=0.7,
+                            max_tokens=self.max_tokens
+                        ),
+                        self.request_timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    raise
+
+        try:
+            response = await self.resilience.call_async(complete, key=self._request_key(messages))
+        except ChatBusyError:
+            raise
+        except asyncio.TimeoutError:
+            logger.error(f"응답 생성 시간 초과 ({self.request_timeout}초)")
+            return "죄송합니다. 응답 생성 시간이 초과되었습니다. 다시 시도해주세요."
+        except Exception as e:
+            logger.error(f"응답 생성 중 오류: {str(e)}")
+            return f"죄송합니다. 오류가 발생했습니다: {str(e)}"
+
+        assistant_message = response.choices[0].message.content
+        await asyncio.to_thread(self._finish_response, user_message, assistant_message, cache_key, history_session)
+        return assistant_message
+
+    async def stream_response_async(self, user_message, board_context="", is_problem_query=False,
+                                    responsible_person_info=None, record_history=True, cache_key=None,
+                                    session_id=DEFAULT_SESSION_ID):
+        """
+        스트리밍 응답 생성 (비동기 제너레이터, 응답 조각을 생성되는 대로 반환)
+
+        동시 호출 한도는 연결 시도마다 잡고, 연결되면 마지막 조각을 읽을 때까지 유지합니다
+        (재시도 대기 중에는 다른 요청이 호출할 수 있음). request_timeout은 연결된 시도의 한도를 잡은 때부터 적용합니다.
+        시간 초과와 API 오류는 응답 조각으로 내보내지 않고 예외로 올라갑니다 (라우트가 error 이벤트로 전달).
+        """
+        history_session = session_id if record_history else None
+        cached = await asyncio.to_thread(self._cached_response, user_message, cache_key, history_session)
+        if cached is not None:
+            yield cached
+            return
+
+        messages = await asyncio.to_thread(self._build_messages, user_message, board_context, is_problem_query,
+                                           responsible_person_info, history_session)
+        loop = asyncio.get_running_loop()
+
+        async def connect():
+            """한도를 잡고 스트림 연결, (한도를 놓는 스택, 응답, 마감 시각) 반환"""
+            slot = AsyncExitStack()
+            await slot.enter_async_context(self._slot())
+            deadline = loop.time() + self.request_timeout
+            try:
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=0.7,
+                        max_tokens=self.max_tokens,
+                        stream=True
+                    ),
+                    self.request_timeout
+                )
+            except BaseException:
+                await slot.aclose()
+                raise
+            return slot, response, deadline
+
+        parts = []
+        started = time.perf_counter()
+        first_token_at = None
+        try:
+            # 첫 조각 전의 연결 단계만 재시도 (요청 합치기 없음)
+            slot, response, deadline = await self.resilience.call_async(connect)
+            async with slot:
+                chunks = response.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), deadline - loop.time())
+                    except StopAsyncIteration:
+                        break
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if not delta:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    parts.append(delta)
+                    yield delta
+        except ChatBusyError:
+            raise
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.error(f"스트리밍 응답 시간 초과 ({self.request_timeout}초)")
+            raise asyncio.TimeoutError(f"응답 생성 시간이 초과되었습니다 ({self.request_timeout}초)") from None
+        except Exception as e:
+            logger.error(f"스트리밍 응답 생성 중 오류: {str(e)}")
+            raise
+
+        total_ms = (time.perf_counter() - started) * 1000
+        ttfb_ms = (first_token_at - started) * 1000 if first_token_at else total_ms
+        logger.info(f"스트리밍 응답 완료: 첫 토큰 {ttfb_ms:.0f}ms, 전체 {total_ms:.0f}ms")
+        await asyncio.to_thread(self._finish_response, user_message, ''.join(parts), cache_key, history_session)
+
+    def stats(self):
+        return {
+            'max_concurrency': self.max_concurrency,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+        }
+
+    async def aclose(self):
+        """연결 풀 정리"""
+        await self.client.close()
@@ -0,0 +1,135 @@
+"""
+벤치마크 공용 유틸리티
+"""
+import csv
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+DEFAULT_POSTS_CSV = os.path.join(BASE_DIR, '20251125_PPM학습용데이터_원글.csv')
+DEFAULT_COMMENTS_CSV = os.path.join(BASE_DIR, '20251125_PPM학습용데이터_댓글.csv')
+
+
+def csv_paths_from_argv(argv=None):
+    """명령행 인자에서 (원글 CSV, 댓글 CSV) 경로 읽기"""
+    argv = sys.argv[1:] if argv is None else argv
+    posts_csv = argv[0] if len(argv) > 0 else DEFAULT_POSTS_CSV
+    comments_csv = argv[1] if len(argv) > 1 else DEFAULT_COMMENTS_CSV
+    for path in (posts_csv, comments_csv):
+        if not os.path.exists(path):
+            print(f"오류: CSV 파일을 찾을 수 없습니다: {path}")
+            sys.exit(1)
+    return posts_csv, comments_csv
+
+
+# 합성 CSV의 고객사 이름 (서로 부분 문자열인 이름, 날짜 접두사/법인 표기처럼 정규화가 필요한 이름 포함)
+SAMPLE_CLIENTS = [
+    '블루타이거', '블루타이거 솔루션', '[08.14] 상상우리', '[09.15] 상상우리', '(주)한빛소프트', '한빛',
+    '대한물류센터', '대한물류', 'ABC Corp', 'abc', '미래에셋', '미래정보기술', '그린푸드', '그린',
+    '스마트팩토리', '코리아테크', '한국전력기술', '서울대학교병원', '제주항공', '엘지유플러스',
+    '에스케이텔레콤', '삼성SDS', '카카오뱅크', '우리은행', '신한카드', '현대오토에버', '넥슨코리아', '티몬',
+]
+SAMPLE_WORDS = ['서버', '오류', '결제', '로그인', '요청', '확인', '배포', '수정', '<b>긴급</b>', '문의', '&nbsp;', '장애']
+
+
+def _sample_date(rng, now):
+    """최근 75일 안의 등록일 (내보내기 형식이 섞이고, 일부는 비어 있거나 날짜가 아님)"""
+    date = now - timedelta(days=rng.uniform(0, 75))
+    roll = rng.random()
+    if roll < 0.6:
+        return date.strftime('%Y%m%d%H%M%S')
+    if roll < 0.8:
+        return date.strftime('%Y-%m-%d %H:%M:%S')
+    if roll < 0.9:
+        return date.strftime('%Y/%m/%d')
+    return '' if roll < 0.95 else 'N/A'
+
+
+def _sample_text(rng, low, high):
+    """HTML 태그/엔티티, 큰따옴표, 줄바꿈(CRLF 포함)이 섞인 본문"""
+    words = rng.choices(SAMPLE_WORDS, k=rng.randrange(low, high))
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words) + 1), '"인용"')
+    if rng.random() < 0.3:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(['\n', '\r\n']))
+    return ' '.join(words)
+
+
+def write_sample_csv(posts_csv, comments_csv, posts=3000, comments=6000, seed=0):
+    """
+    실제 내보내기와 같은 컬럼의 합성 원글/댓글 CSV (원본 CSV 없이 검증할 때 사용)
+
+    등록일은 현재 시각 기준 최근 75일에 흩어 두어 모든 날짜 필터(오늘, 어제, 이번 주 ...)에 해당하는 게시글이 있습니다.
+    """
+    rng = random.Random(seed)
+    now = datetime.now()
+    with open(posts_csv, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'name', 'writer', 'subject', 'content', 'reg_date', 'comm_cnt', 'hit_cnt'])
+        for i in range(posts):
+            writer.writerow([
+                1000 + i, rng.choice(SAMPLE_CLIENTS) if rng.random() > 0.01 else '', f"담당자{rng.randrange(40)}",
+                _sample_text(rng, 2, 6), _sample_text(rng, 5, 40), _sample_date(rng, now),
+                rng.randrange(15), rng.randrange(300),
+            ])
+    with open(comments_csv, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'post_id', 'writer', 'content', 'reg_date'])
+        for i in range(comments):
+            writer.writerow([i, 1000 + rng.randrange(posts), f"담당자{rng.randrange(40)}",
+                             _sample_text(rng, 2, 20), _sample_date(rng, now)])
+
+
+def csv_paths_or_sample(tmp_dir, argv=None):
+    """
+    명령행 인자의 (원글 CSV, 댓글 CSV) 경로, 인자가 없으면 기본 경로
+
+    인자가 'sample'이거나 인자 없이 기본 CSV가 없으면 tmp_dir에 합성 CSV(write_sample_csv)를 만들어 사용합니다.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['sample'] or (not argv and not os.path.exists(DEFAULT_POSTS_CSV)):
+        posts_csv = os.path.join(tmp_dir, 'sample_posts.csv')
+        comments_csv = os.path.join(tmp_dir, 'sample_comments.csv')
+        write_sample_csv(posts_csv, comments_csv)
+        print(f"합성 CSV 사용 (원글 {os.path.getsize(posts_csv) // 1024}KB, "
+              f"댓글 {os.path.getsize(comments_csv) // 1024}KB)")
+        return posts_csv, comments_csv
+    return csv_paths_from_argv(argv)
+
+
+def measure_memory(fn):
+    """fn 실행 결과와 (유지 메모리, 최대 메모리) 바이트 반환"""
+    tracemalloc.start()
+    try:
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
+
+
+def time_per_call(fn, repeat=50):
+    """fn 1회 호출당 평균 소요 시간(ms)"""
+    fn()  # 워밍업
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def print_header(title):
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+
+
+def print_row(label, before, after, unit):
+    ratio = before / after if after else float('inf')
+    print(f"{label:<32} {before:>10.2f}{unit} -> {after:>10.2f}{unit}  (x{ratio:.1f})")
@@ -0,0 +1,84 @@
+// 엣지 함수(functions/api/chat.js) 요청당 데이터 전송량 / JSON 파싱 시간 측정
+// bench_edge_bundle.py가 실행합니다: node _edge_bench.mjs <기존 JSON 디렉터리> <번들 디렉터리> <chat.js> <기준 시각>
+// 기존 JSON 디렉터리에는 manifest.json이 없으므로 핸들러를 그 디렉터리로 실행하면 posts.json / comments.json 대체 경로를 탐
+import fs from 'fs';
+import { pathToFileURL } from 'url';
+
+const [, , legacyDir, bundleDir, handlerPath, nowIso] = process.argv;
+const REPEAT = 20;
+const MESSAGES = JSON.parse(fs.readFileSync(0, 'utf8'));
+
+// 데이터 날짜에 맞춰 날짜 필터 질문이 결과를 갖도록 현재 시각 고정
+const RealDate = Date;
+globalThis.Date = class extends RealDate {
+  constructor(...args) {
+    super(...(args.length ? args : [nowIso]));
+  }
+  static now() {
+    return new RealDate(nowIso).getTime();
+  }
+};
+
+const stats = { bytes: 0, files: 0, parseMs: 0 };
+const fileCache = new Map();
+let lastPrompt = null;
+
+// /data/ 아래 파일은 dataDir에서 읽고, OpenAI 호출은 고정 응답
+function installFetch(dataDir) {
+  globalThis.fetch = async (url, options) => {
+    if (url.startsWith('https://api.openai.com')) {
+      lastPrompt = JSON.parse(options.body).messages[0].content;
+      return { ok: true, json: async () => ({ choices: [{ message: { content: 'ok' } }] }) };
+    }
+    const path = `${dataDir}/${url.split('/data/')[1]}`;
+    if (!fileCache.has(path)) fileCache.set(path, fs.existsSync(path) ? fs.readFileSync(path, 'utf8') : null);
+    const text = fileCache.get(path);
+    if (text === null) return { ok: false, json: async () => null };
+    stats.bytes += Buffer.byteLength(text);
+    stats.files += 1;
+    return {
+      ok: true,
+      json: async () => {
+        const started = performance.now();
+        const value = JSON.parse(text);
+        stats.parseMs += performance.now() - started;
+        return value;
+      },
+    };
+  };
+}
+
+async function measure(run) {
+  await run(); // 워밍업
+  Object.assign(stats, { bytes: 0, files: 0, parseMs: 0 });
+  const started = performance.now();
+  for (let i = 0; i < REPEAT; i++) await run();
+  return {
+    bytes: stats.bytes / REPEAT,
+    files: stats.files / REPEAT,
+    parseMs: stats.parseMs / REPEAT,
+    totalMs: (performance.now() - started) / REPEAT,
+  };
+}
+
+// 기존 핸들러가 요청마다 하던 일: posts/comments/indexed.json 전체를 받아 파싱
+installFetch(legacyDir);
+const legacy = await measure(async () => {
+  for (const name of ['posts.json', 'comments.json', 'indexed.json']) {
+    await (await fetch(`https://bench.local/data/${name}`)).json();
+  }
+});
+
+const { onRequestPost } = await import(pathToFileURL(handlerPath).href);
+const results = [];
+for (const message of MESSAGES) {
+  const request = { url: 'https://bench.local/api/chat', json: async () => ({ message }) };
+  installFetch(bundleDir);
+  const result = await measure(() => onRequestPost({ request, env: {} }));
+  const prompt = lastPrompt;
+  // 번들이 없을 때 (posts.json / comments.json 대체 경로)
+  installFetch(legacyDir);
+  const fallback = await measure(() => onRequestPost({ request, env: {} }));
+  results.push({ message, ...result, fallback: { ...fallback, samePrompt: lastPrompt === prompt } });
+}
+console.log(JSON.stringify({ legacy, results }));
@@ -0,0 +1,224 @@
+"""
+벤치마크 비교 기준용 기존 구현
+최적화 이전의 dict-of-strings 방식 로직을 그대로 보관합니다.
+"""
+import csv
+import re
+from datetime import datetime, timedelta
+
+
+def load_rows(csv_path):
+    """csv.DictReader 행을 그대로 리스트로 로드"""
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def parse_date(date_str):
+    if not date_str:
+        return None
+
+    date_formats = [
+        '%Y-%m-%d %H:%M:%S',
+        '%Y-%m-%d',
+        '%Y/%m/%d %H:%M:%S',
+        '%Y/%m/%d'
+    ]
+
+    for fmt in date_formats:
+        try:
+            return datetime.strptime(date_str.strip(), fmt)
+        except:
+            continue
+
+    return None
+
+
+def filter_by_date(date_str, date_filter, parse=parse_date):
+    if not date_filter or not date_str:
+        return True
+
+    post_date = parse(date_str)
+    if not post_date:
+        return True
+
+    now = datetime.now()
+
+    if date_filter == 'today':
+        return post_date.date() == now.date()
+    elif date_filter == 'yesterday':
+        return post_date.date() == (now - timedelta(days=1)).date()
+    elif date_filter == 'this_week':
+        week_start = now - timedelta(days=now.weekday())
+        return post_date >= week_start
+    elif date_filter == 'last_week':
+        week_start = now - timedelta(days=now.weekday() + 7)
+        week_end = now - timedelta(days=now.weekday())
+        return week_start <= post_date < week_end
+    elif date_filter == 'this_month':
+        return post_date.year == now.year and post_date.month == now.month
+    elif date_filter == 'last_month':
+        last_month = now - timedelta(days=now.day)
+        return post_date.year == last_month.year and post_date.month == last_month.month
+    elif date_filter == 'recent':
+        week_ago = now - timedelta(days=7)
+        return post_date >= week_ago
+
+    return True
+
+
+def filter_posts(posts_data, client_name=None, date_filter=None, parse=parse_date):
+    """기존 get_posts_text의 필터 + 정렬 단계 (행 dict 리스트 반환)"""
+    filtered_posts = []
+
+    for post in posts_data:
+        if client_name:
+            post_client = post.get('name', '')
+            if client_name not in post_client and post_client not in client_name:
+                continue
+
+        reg_date = post.get('reg_date', '')
+        if not filter_by_date(reg_date, date_filter, parse):
+            continue
+
+        filtered_posts.append(post)
+
+    filtered_posts.sort(key=lambda x: int(x.get('comm_cnt', 0) or 0), reverse=True)
+    return filtered_posts
+
+
+def get_posts_text(posts_data, limit=30, client_name=None, date_filter=None):
+    """기존 CSVDataLoader.get_posts_text"""
+    if not posts_data:
+        return ""
+
+    selected_posts = filter_posts(posts_data, client_name, date_filter)[:limit]
+
+    result_lines = []
+    for post in selected_posts:
+        name = post.get('name', '')
+        writer = post.get('writer', '')
+        subject = post.get('subject', '[제목 없음]')
+        content = post.get('content', '')
+        reg_date = post.get('reg_date', '')
+        comm_cnt = post.get('comm_cnt', '0')
+
+        content = re.sub(r'<[^>]+>', '', content)
+        content = content.replace('&nbsp;', ' ').strip()
+
+        result_lines.append(
+            f"[고객사: {name}] 작성자: {writer} | 제목: {subject}\n"
+            f"내용: {content[:200]}...\n"
+            f"등록일: {reg_date} | 댓글 수: {comm_cnt}\n"
+        )
+
+    return "\n---\n".join(result_lines)
+
+
+def get_client_names(posts_data):
+    client_names = set()
+    for post in posts_data:
+        name = post.get('name', '')
+        if name:
+            client_names.add(name)
+    return sorted(list(client_names))
+
+
+def get_responsible_person(posts_data, client_name):
+    client_posts = [post for post in posts_data
+                    if client_name in post.get('name', '')]
+    if not client_posts:
+        return None
+
+    latest_post = max(client_posts,
+                      key=lambda x: parse_date(x.get('reg_date', '')) or datetime.min)
+    return {
+        'name': latest_post.get('writer', ''),
+        'last_activity': latest_post.get('reg_date', '')
+    }
+
+
+def get_comments_for_post(comments_data, post_id):
+    return [comment for comment in comments_data
+            if comment.get('post_id') == post_id]
+
+
+def clean_html(text):
+    """기존 convert_csv_to_json.clean_html"""
+    if not text:
+        return ""
+    text = re.sub(r'<[^>]+>', '', text)
+    text = text.replace('&nbsp;', ' ').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+    text = ' '.join(text.split())
+    return text.strip()
+
+
+def clean_content(text):
+    """기존 get_posts_text의 게시글별 HTML 처리"""
+    content = re.sub(r'<[^>]+>', '', text)
+    return content.replace('&nbsp;', ' ').strip()
+
+
+def detect_client(client_names, user_message):
+    """기존 app.chat의 고객사 감지 루프"""
+    for name in client_names:
+        if name in user_message or any(word in name for word in user_message.split() if len(word) > 2):
+            return name
+    return None
+
+
+def create_indexed_data(posts, comments):
+    """기존 indexed.json 내용: 검색을 위한 인덱스 데이터 (메모리 버전)"""
+    from convert_csv_to_json import month_key
+
+    # 댓글 수 내림차순 순위 (동률은 원래 순서) - 엣지 함수는 정렬 없이 앞에서부터 선택
+    ranking = sorted(range(len(posts)), key=lambda i: (-posts[i].get('comm_cnt', 0), i))
+
+    # 고객사별로 그룹화 (순위 순서 유지)
+    clients = {}
+    # 월별 게시글 인덱스 (순위 순서 유지)
+    posts_by_month = {}
+    for i in ranking:
+        post = posts[i]
+        client_name = post.get('name', '')
+        if client_name not in clients:
+            clients[client_name] = []
+        clients[client_name].append(post)
+
+        key = month_key(post.get('reg_date'))
+        if key not in posts_by_month:
+            posts_by_month[key] = []
+        posts_by_month[key].append(i)
+
+    # 게시글 ID별 댓글 매핑
+    comments_by_post = {}
+    for comment in comments:
+        post_id = comment.get('post_id', '')
+        if post_id not in comments_by_post:
+            comments_by_post[post_id] = []
+        comments_by_post[post_id].append(comment)
+    # 게시글별 댓글은 등록일 순으로 정렬
+    for post_comments in comments_by_post.values():
+        post_comments.sort(key=lambda c: c.get('reg_date') or '')
+
+    return {
+        'clients': clients,
+        'comments_by_post': comments_by_post,
+        'client_names': sorted(list(clients.keys())),
+        'ranking': ranking,
+        'posts_by_month': posts_by_month
+    }
+
+
+def convert_csv_to_json(posts_csv, comments_csv, posts_json, comments_json, indexed_json):
+    """기존 변환 방식: 모든 행을 리스트로 모은 뒤 json.dump, 인덱스는 메모리에서 생성"""
+    import json
+    from convert_csv_to_json import read_comments, read_posts
+
+    posts = list(read_posts(posts_csv))
+    with open(posts_json, 'w', encoding='utf-8') as f:
+        json.dump(posts, f, ensure_ascii=False, indent=2)
+    comments = list(read_comments(comments_csv))
+    with open(comments_json, 'w', encoding='utf-8') as f:
+        json.dump(comments, f, ensure_ascii=False, indent=2)
+    with open(indexed_json, 'w', encoding='utf-8') as f:
+        json.dump(create_indexed_data(posts, comments), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,108 @@
+"""
+동기 / 비동기 챗봇 부하 테스트
+로컬 가짜 OpenAI 서버를 상대로 동시 사용자 1, 10, 100명일 때
+ChatBot(스레드당 요청 1개, Flask 개발 서버 방식)과 AsyncChatBot(이벤트 루프 1개)의
+p50/p99 지연과 초당 처리량을 비교합니다. 실제 OpenAI API는 호출하지 않습니다.
+
+사용법:
+    python benchmarks/bench_async_load.py [모델 응답 지연(초)] [사용자당 요청 수]
+"""
+import asyncio
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import _common
+from async_chatbot import AsyncChatBot, ChatBusyError
+from chatbot import ChatBot
+from fake_openai_server import FakeOpenAIServer
+
+USER_LEVELS = [1, 10, 100]
+MESSAGE = "블루타이거 최근 문제 알려줘"
+
+
+def user_message(user, i):
+    # 같은 요청은 하나로 합쳐지므로(resilience.ResilientCaller) 요청마다 메시지를 다르게 함
+    return f"{MESSAGE} ({user}-{i})"
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def summarize(label, users, latencies, elapsed, rejected=0):
+    print(f"  {label:22s} 사용자 {users:3d}명: p50 {percentile(latencies, 50) * 1000:7.1f}ms | "
+          f"p99 {percentile(latencies, 99) * 1000:7.1f}ms | {len(latencies) / elapsed:7.1f} req/s"
+          + (f" | 거절 {rejected}건" if rejected else ""))
+
+
+def run_sync(base_url, users, requests_per_user):
+    chatbot = ChatBot('test-key', base_url=base_url)
+
+    def user_loop(user):
+        latencies = []
+        for i in range(requests_per_user):
+            started = time.perf_counter()
+            chatbot.get_response(user_message(user, i), record_history=False)
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        results = list(pool.map(user_loop, range(users)))
+    return [latency for result in results for latency in result], time.perf_counter() - started
+
+
+async def run_async(base_url, users, requests_per_user, max_concurrency, queue_timeout=30.0):
+    chatbot = AsyncChatBot('test-key', base_url=base_url, max_concurrency=max_concurrency,
+                           queue_timeout=queue_timeout)
+    rejected = 0
+
+    async def user_loop(user):
+        nonlocal rejected
+        latencies = []
+        for i in range(requests_per_user):
+            started = time.perf_counter()
+            try:
+                await chatbot.get_response_async(user_message(user, i), record_history=False)
+            except ChatBusyError:
+                rejected += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(user_loop(user) for user in range(users)))
+    elapsed = time.perf_counter() - started
+    await chatbot.aclose()
+    return [latency for result in results for latency in result], elapsed, rejected
+
+
+def main():
+    model_delay = float(sys.argv[1]) if len(sys.argv) > 1 else 0.2
+    requests_per_user = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    _common.print_header(f"챗봇 부하 테스트 (모델 응답 {model_delay}s, 사용자당 {requests_per_user}회)")
+
+    with FakeOpenAIServer(first_token_delay=model_delay, token_delay=0) as server:
+        for users in USER_LEVELS:
+            latencies, elapsed = run_sync(server.base_url, users, requests_per_user)
+            summarize("ChatBot (스레드)", users, latencies, elapsed)
+            latencies, elapsed, rejected = asyncio.run(
+                run_async(server.base_url, users, requests_per_user, max_concurrency=100))
+            summarize("AsyncChatBot", users, latencies, elapsed, rejected)
+
+        # 동시 호출 한도: 초과 요청은 대기하고, 대기 한도를 넘으면 거절
+        print("\n[동시 호출 한도 10, 사용자 100명]")
+        latencies, elapsed, rejected = asyncio.run(
+            run_async(server.base_url, 100, requests_per_user, max_concurrency=10))
+        summarize("대기 한도 30s", 100, latencies, elapsed, rejected)
+        latencies, elapsed, rejected = asyncio.run(
+            run_async(server.base_url, 100, requests_per_user, max_concurrency=10,
+                      queue_timeout=model_delay * 3))
+        summarize(f"대기 한도 {model_delay * 3:.1f}s", 100, latencies, elapsed, rejected)
+        print(f"\n가짜 서버 수신 요청: {server.requests}건")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+게시판 크롤러 백엔드 비교
+가짜 게시판 서버(fake_board_server.py)에 로그인 -> 게시판 목록 -> 게시판마다 get_posts를 실행해
+Selenium(Chrome) / HTTP 세션(연결 재사용 안 함) / HTTP 세션(keep-alive 연결 풀)의
+초당 페이지 수와 최대 메모리(RSS, Chrome 등 자식 프로세스 포함)를 비교합니다.
+백엔드마다 별도 프로세스에서 실행하고, Chrome이 없으면 Selenium은 건너뜁니다.
+HTTP 백엔드가 수집한 게시글이 서버 데이터와 같은지도 확인합니다.
+
+사용법:
+    python benchmarks/bench_board_crawler.py [게시판 수] [게시판당 게시글 수] [페이지 지연(초)] [연결 수립 지연(초)]
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import _common
+from fake_board_server import EMAIL, PASSWORD, FakeBoardServer
+
+CHROME_BINARIES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+SAMPLE_SECONDS = 0.02
+
+
+def tree_rss_kb(root_pid):
+    """root_pid와 모든 자손 프로세스의 RSS 합 (KB)"""
+    children = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        ppid = int(stat[stat.rindex(')') + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1])
+                        break
+        except OSError:
+            pass
+    return total
+
+
+def crawl(backend, base_url):
+    """자식 프로세스: 로그인 후 모든 게시판 get_posts, 결과 요약을 JSON으로 출력"""
+    import logging
+    from board_crawler import SELENIUM_DETAIL_LIMIT, BoardCrawler
+
+    logging.disable(logging.WARNING)
+    keep_alive = backend != 'http-close'
+    # 백엔드(페이지 전송 방식)만 비교하도록 상세 페이지는 처음 5개를 차례대로 가져옴
+    crawler = BoardCrawler(base_url, EMAIL, PASSWORD, backend='selenium' if backend == 'selenium' else 'http',
+                           max_workers=1, rate_limit=0)
+    started = time.perf_counter()
+    if not keep_alive:
+        crawler._setup_session()
+        crawler.session.headers['Connection'] = 'close'
+    categories = crawler.get_board_categories()
+    posts = {}
+    for name, category in categories.items():
+        posts[category['url']] = crawler.get_posts(limit=50, board_url=category['url'],
+                                                   detail_limit=SELENIUM_DETAIL_LIMIT)
+    elapsed = time.perf_counter() - started
+    crawler.close()
+    print(json.dumps({'seconds': elapsed, 'boards': len(categories), 'posts': posts}, ensure_ascii=False))
+
+
+def run_backend(backend, server, workdir):
+    """별도 프로세스에서 크롤링하며 프로세스 트리 RSS를 측정"""
+    server.reset_stats()
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--run', backend, server.base_url],
+                            cwd=workdir, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    peak = [0]
+
+    def sample():
+        while proc.poll() is None:
+            peak[0] = max(peak[0], tree_rss_kb(proc.pid))
+            time.sleep(SAMPLE_SECONDS)
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    stdout, stderr = proc.communicate()
+    sampler.join()
+    if proc.returncode != 0:
+        raise RuntimeError(stderr.strip().splitlines()[-1] if stderr.strip() else f"종료 코드 {proc.returncode}")
+    result = json.loads(stdout.strip().splitlines()[-1])
+    result.update(pages=server.pages, connections=server.connections, peak_rss_mb=peak[0] / 1024)
+    return result
+
+
+def check_posts(server, posts_by_url):
+    """수집한 게시글이 서버 데이터와 같은지 (다른 게시글 수 반환)"""
+    mismatches = 0
+    for pid, board in server.boards.items():
+        posts = posts_by_url.get(server.board_url(pid), [])
+        if len(posts) != len(board['posts']):
+            mismatches += abs(len(board['posts']) - len(posts))
+        for i, (post, expected) in enumerate(zip(posts, board['posts'])):
+            same = (post['title'] == expected['title'] and post['author'] == expected['author']
+                    and post['date'] == f"{expected['date']} {expected['time']}"
+                    and post['comment_count'] == len(expected['comments']))
+            if i < 5:  # 처음 5개만 상세 페이지를 가져옴
+                same = same and post['content'] == expected['content'].strip()[:1000] and \
+                    [c['text'] for c in post['comments']] == [c['text'] for c in expected['comments']]
+            mismatches += not same
+    return mismatches
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--run':
+        crawl(sys.argv[2], sys.argv[3])
+        return
+
+    boards = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    posts_per_board = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    page_delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.02
+    connect_delay = float(sys.argv[4]) if len(sys.argv) > 4 else 0.03
+    _common.print_header(f"게시판 크롤러 백엔드 (게시판 {boards}개 x 게시글 {posts_per_board}개, "
+                         f"페이지 지연 {page_delay * 1000:.0f}ms, 연결 수립 {connect_delay * 1000:.0f}ms)")
+
+    backends = [('selenium', 'Selenium (Chrome)'), ('http-close', 'HTTP (연결 재사용 안 함)'),
+                ('http', 'HTTP (keep-alive 연결 풀)')]
+    results = {}
+    with FakeBoardServer(boards=boards, posts_per_board=posts_per_board, page_delay=page_delay,
+                         connect_delay=connect_delay) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        for backend, label in backends:
+            if backend == 'selenium' and not any(shutil.which(name) for name in CHROME_BINARIES):
+                print(f"  {label:28s}: Chrome이 없어 건너뜀")
+                continue
+            try:
+                result = run_backend(backend, server, workdir)
+            except Exception as e:
+                print(f"  {label:28s}: 실패 ({e})")
+                continue
+            results[backend] = result
+            print(f"  {label:28s}: {result['pages']}페이지 {result['seconds']:6.2f}s "
+                  f"({result['pages'] / result['seconds']:7.1f} 페이지/s) | 최대 RSS {result['peak_rss_mb']:6.1f}MB "
+                  f"| TCP 연결 {result['connections']}개")
+
+        if 'http' in results:
+            mismatches = check_posts(server, results['http']['posts'])
+            print(f"\nHTTP 백엔드 수집 결과: 서버 데이터와 {'동일' if not mismatches else f'{mismatches}건 다름'}")
+        before = results.get('selenium') or results.get('http-close')
+        after = results.get('http')
+        if before and after:
+            print()
+            _common.print_row("페이지당 시간", before['seconds'] / before['pages'] * 1000,
+                              after['seconds'] / after['pages'] * 1000, "ms")
+            _common.print_row("최대 RSS", before['peak_rss_mb'], after['peak_rss_mb'], "MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+게시글 상세 페이지 동시 수집 측정
+가짜 게시판 서버(fake_board_server.py)의 게시판 하나에서 get_posts를 실행해
+기존 방식(처음 5개만 차례대로) / 전체 차례대로 / 전체 동시 수집(스레드 풀 + 호스트별 요청 수 제한)의
+소요 시간, 서버에서 본 최대 동시 요청 수, 1초 구간 최대 요청 수를 비교합니다.
+수집한 본문과 덧글이 목록 순서대로 서버 데이터와 같은지도 확인합니다.
+
+사용법:
+    python benchmarks/bench_board_details.py [게시글 수] [페이지 지연(초)] [동시 요청 수] [초당 요청 수]
+"""
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import _common
+from board_crawler import DETAIL_WORKERS, HTTP_RATE_LIMIT, BoardCrawler
+from fake_board_server import EMAIL, PASSWORD, FakeBoardServer
+
+
+def crawl(server, detail_limit, max_workers, rate_limit):
+    crawler = BoardCrawler(server.base_url, EMAIL, PASSWORD, backend='http',
+                           max_workers=max_workers, rate_limit=rate_limit)
+    crawler.login()
+    server.reset_stats()
+    started = time.perf_counter()
+    posts = crawler.get_posts(limit=100, board_url=server.board_url(1000), detail_limit=detail_limit)
+    elapsed = time.perf_counter() - started
+    crawler.close()
+    return posts, elapsed
+
+
+def detail_mismatches(server, posts, detail_limit):
+    expected = server.boards[1000]['posts']
+    if len(posts) != len(expected):
+        return abs(len(posts) - len(expected))
+    mismatches = 0
+    for post, exp in list(zip(posts, expected))[:detail_limit]:
+        same = post['title'] == exp['title'] and post['content'] == exp['content'].strip()[:1000] and \
+            [(c['author'], c['date'], c['text']) for c in post['comments']] == \
+            [(c['author'], c['date'], c['text']) for c in exp['comments']]
+        mismatches += not same
+    return mismatches
+
+
+def main():
+    posts_per_board = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    page_delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else DETAIL_WORKERS
+    rate_limit = float(sys.argv[4]) if len(sys.argv) > 4 else HTTP_RATE_LIMIT
+    _common.print_header(f"상세 페이지 수집 (게시글 {posts_per_board}개, 페이지 지연 {page_delay * 1000:.0f}ms, "
+                         f"동시 {workers}개, 초당 {rate_limit:g}회)")
+    logging.disable(logging.WARNING)
+
+    cases = [
+        ("기존 (처음 5개, 차례대로)", 5, 1, 0),
+        ("전체, 차례대로", posts_per_board, 1, 0),
+        ("전체, 동시 수집", posts_per_board, workers, rate_limit),
+    ]
+    timings = {}
+    cwd = os.getcwd()
+    with FakeBoardServer(boards=1, posts_per_board=posts_per_board, page_delay=page_delay) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # get_posts가 저장하는 디버그 HTML
+        try:
+            for label, detail_limit, max_workers, rate in cases:
+                posts, elapsed = crawl(server, detail_limit, max_workers, rate)
+                mismatches = detail_mismatches(server, posts, detail_limit)
+                timings[label] = elapsed
+                print(f"  {label:22s}: 상세 {min(detail_limit, len(posts)):3d}개 {elapsed:6.2f}s | "
+                      f"최대 동시 요청 {server.max_inflight}개 | 1초 최대 {server.max_pages_per_second()}회 | "
+                      f"서버 데이터와 {'동일' if not mismatches else f'{mismatches}건 다름'}")
+        finally:
+            os.chdir(cwd)
+
+    print()
+    _common.print_row("전체 상세 수집", timings["전체, 차례대로"], timings["전체, 동시 수집"], "s")
+    print(f"(페이지 하나를 차례대로 가져오는 시간 약 {page_delay * 1000:.0f}ms + 파싱)")
+
+
+if __name__ == '__main__':
+    main()
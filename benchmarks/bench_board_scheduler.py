@@ -0,0 +1,81 @@
+"""
+여러 게시판 병렬 크롤링 측정
+가짜 게시판 서버(fake_board_server.py)의 게시판들을 BoardCrawlScheduler로 처음 크롤링할 때
+게시판을 하나씩 (크롤러 1개, 상세 페이지도 차례대로) 크롤링하는 경우와 여러 게시판을 동시에 크롤링하는 경우를 비교합니다.
+로그인 횟수(크롤러끼리 쿠키 공유), 서버에서 본 최대 동시 요청 수와 1초 최대 요청 수(공유 rate_limit)를 확인하고,
+일부 게시판에 새 글이 생긴 뒤 다시 크롤링해 최근 활동이 있는 게시판이 먼저 크롤링되는지와
+없는 게시판 주소가 게시판별 오류로 보고되는지 확인합니다.
+
+사용법:
+    python benchmarks/bench_board_scheduler.py [게시판 수] [게시판당 게시글 수] [페이지 지연(초)] [동시 게시판 수] [게시판별 동시 요청 수] [초당 요청 수]
+"""
+import logging
+import os
+import sys
+import tempfile
+
+import _common
+from crawl_scheduler import BOARD_WORKERS, MAX_BOARDS, BoardCrawlScheduler, format_report
+from crawl_state import CrawlStateStore
+from fake_board_server import EMAIL, PASSWORD, FakeBoardServer
+
+PAGE_SIZE = 20
+
+
+def crawl(server, state, boards, max_boards, board_workers, rate_limit):
+    server.reset_stats()
+    scheduler = BoardCrawlScheduler(server.base_url, EMAIL, PASSWORD, state, backend='http',
+                                    max_boards=max_boards, board_workers=board_workers, rate_limit=rate_limit)
+    try:
+        report = scheduler.run(boards)
+    finally:
+        scheduler.close()
+    return report
+
+
+def main():
+    boards = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    posts_per_board = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    page_delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    max_boards = int(sys.argv[4]) if len(sys.argv) > 4 else MAX_BOARDS
+    board_workers = int(sys.argv[5]) if len(sys.argv) > 5 else BOARD_WORKERS
+    rate_limit = float(sys.argv[6]) if len(sys.argv) > 6 else 40
+    _common.print_header(f"게시판 병렬 크롤링 (게시판 {boards}개 x 게시글 {posts_per_board}개, "
+                         f"페이지 지연 {page_delay * 1000:.0f}ms, 동시 게시판 {max_boards}개 x {board_workers}, "
+                         f"초당 {rate_limit:g}회)")
+    logging.disable(logging.CRITICAL)  # 없는 게시판 오류 로그 포함
+
+    with FakeBoardServer(boards=boards, posts_per_board=posts_per_board, page_delay=page_delay,
+                         page_size=PAGE_SIZE) as server, tempfile.TemporaryDirectory() as workdir:
+        urls = {board['name']: server.board_url(pid) for pid, board in server.boards.items()}
+        timings = {}
+        for label, limits in (("게시판 하나씩", (1, 1)), ("병렬", (max_boards, board_workers))):
+            state = CrawlStateStore(os.path.join(workdir, f"state-{limits[0]}.db"))
+            report = crawl(server, state, urls, *limits, rate_limit)
+            timings[label] = report['seconds']
+            print(f"  {label:12s}: {report['seconds']:6.2f}s | 목록 {report['pages']}페이지, 상세 {report['details']}개 | "
+                  f"로그인 {server.logins}회 | 최대 동시 요청 {server.max_inflight}개 | "
+                  f"1초 최대 {server.max_pages_per_second()}회 | 오류 {report['errors']}개")
+
+        # 게시판 2개에 새 글, 1개에 덧글 -> 활동이 있던 게시판이 다음 크롤링에서 먼저
+        pids = list(server.boards)
+        for pid in (pids[-1], pids[-3]):
+            server.add_post(pid)
+        server.add_comment(pids[2], server.boards[pids[2]]['posts'][0]['idx'])
+        report = crawl(server, state, urls, max_boards, board_workers, rate_limit)
+        print(f"\n  새 글/덧글 후 다시 크롤링 (새 글: {server.boards[pids[-1]]['name']}, "
+              f"{server.boards[pids[-3]]['name']} / 덧글: {server.boards[pids[2]]['name']})")
+        print('  ' + format_report(report).replace('\n', '\n  '))
+
+        # 다음 크롤링: 기록 없는 게시판 -> 방금 활동이 있던 게시판 순, 없는 게시판은 오류로 보고
+        urls['없는게시판'] = server.board_url(9999)
+        report = crawl(server, state, urls, max_boards, board_workers, rate_limit)
+        print("\n  없는 게시판을 추가해 다시 크롤링 (크롤링 순서)")
+        print('  ' + format_report(report).replace('\n', '\n  '))
+        print()
+
+    _common.print_row("처음 크롤링", timings["게시판 하나씩"], timings["병렬"], "s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Selenium 페이지 대기 시간 측정
+가짜 게시판 서버(fake_board_server.py)를 Selenium 백엔드로 크롤링하고 (로그인 -> 게시판 목록 -> 게시판마다 get_posts)
+요소 기반 대기(BoardCrawler.wait_report)에 실제로 걸린 시간을
+기존 고정 대기(time.sleep)로 같은 페이지들을 열었을 때의 시간과 비교합니다.
+Chrome이 설치되어 있어야 합니다.
+
+사용법:
+    python benchmarks/bench_board_waits.py [게시판 수] [게시판당 게시글 수] [페이지 지연(초)]
+"""
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import _common
+from board_crawler import BoardCrawler
+from fake_board_server import EMAIL, PASSWORD, FakeBoardServer
+
+CHROME_BINARIES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+
+# 기존 코드의 고정 대기 (초)
+# - list: navigate_to_board 3초 + get_posts 2초를 대기 두 번으로 나눔
+LEGACY_SLEEPS = {'login_page': 2, 'login': 5, 'main': 3, 'list': 2.5, 'detail': 2}
+
+
+def main():
+    boards = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    posts_per_board = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    page_delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+    _common.print_header(f"Selenium 페이지 대기 (게시판 {boards}개 x 게시글 {posts_per_board}개, "
+                         f"페이지 지연 {page_delay * 1000:.0f}ms)")
+    if not any(shutil.which(name) for name in CHROME_BINARIES):
+        print("Chrome이 없어 측정할 수 없습니다.")
+        return
+    logging.disable(logging.WARNING)
+
+    cwd = os.getcwd()
+    with FakeBoardServer(boards=boards, posts_per_board=posts_per_board, page_delay=page_delay) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)  # get_posts가 저장하는 디버그 HTML
+        crawler = BoardCrawler(server.base_url, EMAIL, PASSWORD, backend='selenium')
+        try:
+            started = time.perf_counter()
+            categories = crawler.get_board_categories()
+            posts = sum(len(crawler.get_posts(limit=50, board_url=category['url']))
+                        for category in categories.values())
+            elapsed = time.perf_counter() - started
+        finally:
+            crawler.close()
+            os.chdir(cwd)
+
+    report = crawler.wait_report()
+    waited = sum(stats['total_ms'] for stats in report.values()) / 1000
+    legacy = sum(LEGACY_SLEEPS[name] * stats['count'] for name, stats in report.items())
+    print(f"  게시판 {len(categories)}개, 게시글 {posts}개, 페이지 {server.pages}개 수집: {elapsed:.2f}s\n")
+    print(f"  {'대기':12s} {'횟수':>4s} {'총 대기':>10s} {'최대':>9s} {'시간 초과':>6s} {'기존 고정 대기':>12s}")
+    for name, stats in report.items():
+        print(f"  {name:12s} {stats['count']:4d} {stats['total_ms']:8.0f}ms {stats['max_ms']:7.0f}ms "
+              f"{stats['timeouts']:6d} {LEGACY_SLEEPS[name] * stats['count']:12.1f}s")
+    print()
+    _common.print_row("페이지 대기 합계", legacy, waited, "s")
+    print(f"(기존 방식의 예상 소요 시간: 약 {elapsed - waited + legacy:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+HTML 정리 처리량 벤치마크 (MB/s)
+기존 convert_csv_to_json.clean_html(정규식 + replace 4회 + split/join),
+기존 get_posts_text의 게시글별 정리와 parsers.clean_html을 실제 CSV의
+content/subject 컬럼으로 비교합니다.
+원본 CSV가 없으면 (또는 'sample'을 주면) 합성 CSV(_common.write_sample_csv)로 실행합니다.
+
+사용법:
+    python benchmarks/bench_clean_html.py [원글 CSV | sample] [댓글 CSV]
+"""
+import tempfile
+import time
+
+import _common
+import _legacy
+import parsers
+
+
+def throughput(values, fn, repeat=3):
+    """(MB/s, 총 소요 ms) - 가장 빠른 회차 기준"""
+    total_bytes = sum(len(value.encode('utf-8')) for value in values)
+    best = float('inf')
+    for _ in range(repeat):
+        parsers._clean_html_cached.cache_clear()
+        start = time.perf_counter()
+        for value in values:
+            fn(value)
+        best = min(best, time.perf_counter() - start)
+    return total_bytes / 1024 / 1024 / best, best * 1000
+
+
+def main():
+    _common.print_header("HTML 정리 처리량 벤치마크")
+    with tempfile.TemporaryDirectory() as tmp:
+        run(*_common.csv_paths_or_sample(tmp))
+
+
+def run(posts_csv, comments_csv):
+    post_rows = _legacy.load_rows(posts_csv)
+    comment_rows = _legacy.load_rows(comments_csv)
+    columns = [
+        ('원글 content', [row.get('content', '') or '' for row in post_rows]),
+        ('원글 subject', [row.get('subject', '') or '' for row in post_rows]),
+        ('댓글 content', [row.get('content', '') or '' for row in comment_rows]),
+    ]
+    cleaners = [
+        ('기존 clean_html (변환기)', _legacy.clean_html),
+        ('기존 get_posts_text 정리', _legacy.clean_content),
+        ('parsers.clean_html', parsers.clean_html),
+    ]
+
+    for label, values in columns:
+        size_mb = sum(len(value.encode('utf-8')) for value in values) / 1024 / 1024
+        print(f"\n[{label}] {len(values)}행, {size_mb:.2f}MB")
+        for cleaner_label, fn in cleaners:
+            mb_per_s, elapsed_ms = throughput(values, fn)
+            print(f"  {cleaner_label:<28} {mb_per_s:>8.1f}MB/s  ({elapsed_ms:.1f}ms)")
+
+    # 기존에는 /api/chat 요청마다 선택된 30개 게시글을 다시 정리했음 (이제 로드 시 1회)
+    contents = columns[0][1][:30]
+    per_request = _common.time_per_call(
+        lambda: [_legacy.clean_content(value) for value in contents], repeat=200)
+    print(f"\n기존 요청당 정리 비용 (게시글 30개): {per_request:.3f}ms -> 0ms (로드 시 1회 정리)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+고객사 근사 매칭 경로 분포 / 속도 측정
+오타를 넣은 고객사 질문과 고객사가 없는 질문을 app.chat과 같은 순서
+(정확 매칭 -> 근사 매칭 -> 애매할 때만 GPT)로 분류해 GPT 호출 비율을 확인합니다.
+원본 CSV가 없으면 (또는 'sample'을 주면) 합성 CSV의 고객사 목록을 사용합니다.
+
+사용법:
+    python benchmarks/bench_client_fuzzy.py [원글 CSV | sample] [댓글 CSV] [근사 매칭 기준] [GPT 최소 신뢰도]
+"""
+import sys
+import tempfile
+from collections import Counter
+
+import _common
+from bench_client_match import NO_CLIENT_MESSAGES
+from client_matcher import normalize_client_name
+from csv_loader import CSVDataLoader
+
+DEFAULT_THRESHOLD = 0.6
+DEFAULT_LLM_MIN_SCORE = 0.35
+
+
+def with_typo(name):
+    """마지막 한글 음절의 모음을 바꾼 이름 (없으면 None)"""
+    for i in range(len(name) - 1, -1, -1):
+        code = ord(name[i]) - 0xAC00
+        if 0 <= code < 11172:
+            jung = (code % 588) // 28
+            shifted = code - jung * 28 + ((jung + 4) % 21) * 28
+            return name[:i] + chr(0xAC00 + shifted) + name[i + 1:]
+    return None
+
+
+def build_cases(client_names):
+    """(메시지, 정답 고객사 또는 None) 목록"""
+    cases = []
+    for name in client_names:
+        normalized = normalize_client_name(name)
+        # 짧은 이름은 오타 한 글자로 다른 이름이 되기 쉬우므로 제외
+        if len(normalized.replace(' ', '')) < 4:
+            continue
+        typo = with_typo(normalized)
+        if typo:
+            cases.append((f"{typo} 최근 문제 알려줘", name))
+            cases.append((f"{typo.replace(' ', '')}에서 오류가 났어요", name))
+    cases.extend((message, None) for message in NO_CLIENT_MESSAGES)
+    return cases
+
+
+def route(loader, message, threshold, llm_min_score):
+    """app.chat과 같은 순서로 감지 경로와 결과 반환"""
+    name = loader.match_client_name(message)
+    if name:
+        return 'exact', name
+    name, score = loader.fuzzy_match_client_name(message)
+    if name and score >= threshold:
+        return 'fuzzy', name
+    if score >= llm_min_score:
+        return 'llm', None
+    return 'none', None
+
+
+def main():
+    threshold = float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_THRESHOLD
+    llm_min_score = float(sys.argv[4]) if len(sys.argv) > 4 else DEFAULT_LLM_MIN_SCORE
+    _common.print_header(f"고객사 근사 매칭 (기준 {threshold}, GPT 최소 신뢰도 {llm_min_score})")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        loader = CSVDataLoader(*_common.csv_paths_or_sample(tmp, sys.argv[1:3]))
+    cases = build_cases(loader.get_client_names())
+
+    paths = Counter()
+    correct = Counter()
+    wrong = []
+    for message, expected in cases:
+        path, name = route(loader, message, threshold, llm_min_score)
+        paths[path] += 1
+        if path in ('exact', 'fuzzy'):
+            # 정규화 이름이 같은 고객사('[08.14] 상상우리', '[09.15] 상상우리')는 구분할 수 없으므로 정답 처리
+            if normalize_client_name(name) == normalize_client_name(expected):
+                correct[path] += 1
+            else:
+                wrong.append((message, name, expected))
+        elif expected is None:
+            correct[path] += 1
+
+    print(f"질문 {len(cases)}개 (오타 질문 {len(cases) - len(NO_CLIENT_MESSAGES)}개, "
+          f"고객사 없는 질문 {len(NO_CLIENT_MESSAGES)}개)")
+    for path in ('exact', 'fuzzy', 'llm', 'none'):
+        print(f"  {path:6s}: {paths[path]:5d}개 ({paths[path] / len(cases) * 100:5.1f}%), "
+              f"정답 {correct[path]}개")
+    print(f"  GPT 추출 호출 비율: 기존 {(len(cases) - paths['exact']) / len(cases) * 100:.1f}% "
+          f"-> {paths['llm'] / len(cases) * 100:.1f}%")
+    print(f"  잘못 고른 고객사: {len(wrong)}개")
+    for message, name, expected in wrong[:10]:
+        print(f"    - {message!r}: {name!r} (정답 {expected!r})")
+
+    messages = [message for message, _ in cases[:200]]
+    elapsed = _common.time_per_call(
+        lambda: [loader.fuzzy_match_client_name(message) for message in messages], repeat=5)
+    print(f"\n근사 매칭 시간: 질문당 {elapsed / len(messages):.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
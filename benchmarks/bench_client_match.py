@@ -0,0 +1,92 @@
+"""
+고객사 이름 감지 품질/속도 비교
+기존 app.chat의 이름별 루프와 ClientNameMatcher(Aho-Corasick)를
+실제 고객사 목록으로 만든 질문 세트에서 비교합니다.
+원본 CSV가 없으면 (또는 'sample'을 주면) 합성 CSV의 고객사 목록을 사용합니다.
+
+사용법:
+    python benchmarks/bench_client_match.py [원글 CSV | sample] [댓글 CSV]
+"""
+import tempfile
+import time
+
+import _common
+import _legacy
+from client_matcher import ClientNameMatcher, client_name_aliases, normalize_client_name
+from csv_loader import CSVDataLoader
+
+# 고객사가 없는 질문 (None이 정답)
+NO_CLIENT_MESSAGES = [
+    "오늘 등록된 게시글 알려줘",
+    "최근 문제 케이스 알려줘",
+    "지난주에 오류가 많았던 건 뭐야?",
+    "이번 달 장애 이슈 정리해줘",
+    "담당자 누구야?",
+]
+
+
+def build_cases(client_names):
+    """(메시지, 정답으로 인정할 별칭 또는 None) 목록"""
+    cases = []
+    for name in client_names:
+        normalized = normalize_client_name(name)
+        cases.append((f"{name} 최근 문제 알려줘", name))
+        cases.append((f"{normalized} 담당자 누구야?", normalized))
+        cases.append((f"{normalized}에서 오류가 났어요", normalized))
+        for alias in client_name_aliases(name)[2:]:
+            cases.append((f"{alias} 관련 문의입니다", alias))
+    cases.extend((message, None) for message in NO_CLIENT_MESSAGES)
+    return cases
+
+
+def is_correct(predicted, expected_alias):
+    if expected_alias is None:
+        return predicted is None
+    if predicted is None:
+        return False
+    # 같은 별칭을 가진 고객사가 여럿이면 그중 하나면 정답
+    return expected_alias.lower() in client_name_aliases(predicted) or expected_alias == predicted
+
+
+def main():
+    _common.print_header("고객사 이름 감지 비교 (기존 루프 vs Aho-Corasick)")
+    with tempfile.TemporaryDirectory() as tmp:
+        loader = CSVDataLoader(*_common.csv_paths_or_sample(tmp))
+    client_names = loader.get_client_names()
+
+    start = time.perf_counter()
+    matcher = ClientNameMatcher(client_names)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"고객사 {len(client_names)}개, 오토마톤 생성 {build_ms:.1f}ms "
+          f"(패턴 {len(matcher._automaton.patterns)}개)")
+
+    cases = build_cases(client_names)
+    legacy_correct = 0
+    matcher_correct = 0
+    regressions = []
+    for message, expected in cases:
+        legacy_ok = is_correct(_legacy.detect_client(client_names, message), expected)
+        matcher_ok = is_correct(matcher.match(message), expected)
+        legacy_correct += legacy_ok
+        matcher_correct += matcher_ok
+        if legacy_ok and not matcher_ok:
+            regressions.append(message)
+
+    print(f"\n[정확도] 질문 {len(cases)}개")
+    print(f"  기존 루프:      {legacy_correct / len(cases) * 100:5.1f}% ({legacy_correct}개)")
+    print(f"  Aho-Corasick:   {matcher_correct / len(cases) * 100:5.1f}% ({matcher_correct}개)")
+    print(f"  기존은 맞고 새 방식은 틀린 질문: {len(regressions)}개")
+    for message in regressions[:10]:
+        print(f"    - {message}")
+
+    messages = [message for message, _ in cases]
+    before = _common.time_per_call(
+        lambda: [_legacy.detect_client(client_names, m) for m in messages], repeat=3) / len(messages)
+    after = _common.time_per_call(
+        lambda: [matcher.match(m) for m in messages], repeat=3) / len(messages)
+    print()
+    _common.print_row("질문당 감지 시간", before * 1000, after * 1000, "us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+게시판 컨텍스트 토큰 예산 비교
+기존 board_context[:3000] 글자 자르기와 토큰 예산 기반 게시글 단위 채우기를
+실제 CSV의 고객사 x 날짜 필터 질의에서 비교합니다.
+tiktoken이 설치되어 있으면 토큰 추정치의 오차도 함께 보고합니다.
+원본 CSV가 없으면 (또는 'sample'을 주면) 합성 CSV(_common.write_sample_csv)로 실행합니다.
+
+사용법:
+    python benchmarks/bench_context_packer.py [원글 CSV | sample] [댓글 CSV]
+"""
+import statistics
+import tempfile
+
+import _common
+import context_packer
+from context_packer import POST_SEPARATOR, context_token_budget, count_tokens, estimate_tokens
+from csv_loader import CSVDataLoader
+
+DATE_FILTERS = [None, 'this_month', 'last_month', 'recent']
+LEGACY_CHAR_LIMIT = 3000
+
+
+def queries(loader):
+    names = loader.get_client_names()
+    clients = [None] + names[::max(len(names) // 20, 1)]
+    return [(client, date_filter) for client in clients for date_filter in DATE_FILTERS]
+
+
+def legacy_stats(text):
+    """기존 방식: 글자 수로 자른 뒤 온전히 남은 게시글 수와 잘린 게시글 여부"""
+    cut = text[:LEGACY_CHAR_LIMIT]
+    blocks = text.split(POST_SEPARATOR) if text else []
+    kept = cut.split(POST_SEPARATOR) if cut else []
+    whole = len(kept) - (1 if len(cut) < len(text) else 0)
+    return whole, len(cut) < len(text), len(blocks)
+
+
+def report_estimator(loader):
+    """tiktoken 대비 추정치 오차 (tiktoken이 있을 때만)"""
+    if context_packer.tiktoken is None:
+        print("tiktoken 미설치: 한글/영문 글자 수 기반 추정치 사용 (오차 비교 생략)")
+        return
+    errors = []
+    for client, date_filter in queries(loader):
+        for block in loader.iter_post_blocks(30, client, date_filter, comments_per_post=2):
+            actual = count_tokens(block)
+            errors.append((estimate_tokens(block) - actual) / actual * 100)
+    print(f"추정치 오차 (tiktoken 대비, 블록 {len(errors)}개): 중앙값 {statistics.median(errors):+.1f}%, "
+          f"최소 {min(errors):+.1f}%, 최대 {max(errors):+.1f}%")
+
+
+def main():
+    _common.print_header("게시판 컨텍스트: 글자 자르기 vs 토큰 예산")
+    with tempfile.TemporaryDirectory() as tmp:
+        run(*_common.csv_paths_or_sample(tmp))
+
+
+def run(posts_csv, comments_csv):
+    loader = CSVDataLoader(posts_csv, comments_csv)
+    report_estimator(loader)
+
+    budget = context_token_budget('gpt-4', 1000, 2500)
+    print(f"gpt-4 예산: {budget}토큰 (컨텍스트 창 8192 - 응답 1000 - 지침/기록 2500)\n")
+
+    rows = []
+    for client, date_filter in queries(loader):
+        full = loader.get_posts_text(30, client, date_filter)
+        if not full:
+            continue
+        legacy_whole, legacy_cut, total = legacy_stats(full)
+        packed = loader.get_posts_text(30, client, date_filter, token_budget=budget)
+        with_comments = loader.get_posts_text(30, client, date_filter, token_budget=budget,
+                                              comments_per_post=2)
+        rows.append((total, legacy_whole, legacy_cut, count_tokens(full[:LEGACY_CHAR_LIMIT]),
+                     len(packed.split(POST_SEPARATOR)), count_tokens(packed),
+                     len(with_comments.split(POST_SEPARATOR))))
+
+    print(f"[질의 {len(rows)}개 평균]")
+    print(f"  후보 게시글 수:                {statistics.mean(r[0] for r in rows):6.1f}개")
+    print(f"  기존 [:3000] 온전한 게시글:     {statistics.mean(r[1] for r in rows):6.1f}개 "
+          f"(중간에 잘린 질의 {sum(r[2] for r in rows)}개), {statistics.mean(r[3] for r in rows):6.0f}토큰")
+    print(f"  토큰 예산 게시글:              {statistics.mean(r[4] for r in rows):6.1f}개 "
+          f"(잘린 게시글 없음), {statistics.mean(r[5] for r in rows):6.0f}토큰")
+    print(f"  토큰 예산 + 댓글 2개:          {statistics.mean(r[6] for r in rows):6.1f}개")
+    assert all(r[5] <= budget for r in rows)
+
+    # 토큰 계산 비용 (예산이 작을수록 남은 예산이 바닥나면 뒤쪽 게시글은 포맷하지 않음)
+    print("\n[컨텍스트 생성 시간: 전체 포맷 후 [:3000] -> 토큰 예산 채우기]")
+    for token_budget in (600, budget):
+        before = _common.time_per_call(lambda: loader.get_posts_text(30)[:LEGACY_CHAR_LIMIT], repeat=200)
+        after = _common.time_per_call(
+            lambda: loader.get_posts_text(30, token_budget=token_budget), repeat=200)
+        print(f"  예산 {token_budget}토큰: {before:.3f}ms -> {after:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+CSV -> JSON 변환 메모리 측정
+합성 CSV(기본 원글 100만 행 + 댓글 100만 행)를 만들어 기존 방식(모든 행을 리스트로 모은 뒤 json.dump,
+indexed.json은 메모리에서 생성)과 스트리밍 변환(convert_csv_to_json.build_bundle: 한 행씩 기록,
+번들은 IndexBuilder)을 각각 새 프로세스에서 실행하고
+소요 시간, 최대 RSS, 두 방식이 모두 만드는 posts.json / comments.json이 바이트 단위로 같은지 비교합니다.
+
+사용법:
+    python benchmarks/bench_convert_json.py [원글 행 수]
+"""
+import csv
+import filecmp
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+import _common
+
+DEFAULT_ROWS = 1_000_000
+CLIENTS = 300
+OUTPUTS = ['posts.json', 'comments.json']
+
+# 새 프로세스에서 변환 후 (소요 시간, 최대 RSS KB)를 출력
+WORKER_CODE = r'''
+import resource, sys, time
+sys.path.insert(0, sys.argv[1])
+sys.path.insert(0, sys.argv[2])
+mode, posts_csv, comments_csv, out_dir = sys.argv[3:7]
+started = time.perf_counter()
+if mode == 'legacy':
+    import _legacy
+    _legacy.convert_csv_to_json(posts_csv, comments_csv, *(f"{out_dir}/{name}" for name in
+                                                           ('posts.json', 'comments.json', 'indexed.json')))
+else:
+    import contextlib, io
+    import convert_csv_to_json as converter
+    with contextlib.redirect_stdout(io.StringIO()):
+        converter.build_bundle(posts_csv, comments_csv, out_dir)
+print(time.perf_counter() - started, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+'''
+
+
+def write_synthetic_csv(posts_csv, comments_csv, rows):
+    """
+    고객사/날짜/댓글 수가 섞인 합성 원글 rows행, 댓글 rows행
+
+    실제 내보내기처럼 행은 CRLF로 끝나고, 본문에는 여러 줄 필드(LF/CRLF)와 "" 이스케이프가 들어갑니다.
+    """
+    rng = random.Random(42)
+    words = ['서버', '오류', '결제', '로그인', '요청', '확인', '배포', '수정', '<b>긴급</b>', '문의', '&nbsp;',
+             '"인용"', '\n', '\r\n', '\n\n']
+    with open(posts_csv, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'name', 'writer', 'subject', 'content', 'reg_date', 'comm_cnt', 'hit_cnt'])
+        for i in range(rows):
+            writer.writerow([
+                i, f"고객사{rng.randrange(CLIENTS)}", f"담당자{rng.randrange(50)}",
+                ' '.join(rng.choices(words, k=4)), ' '.join(rng.choices(words, k=rng.randrange(10, 60))),
+                f"20{rng.randrange(20, 26)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d} "
+                f"{rng.randrange(24):02d}:{rng.randrange(60):02d}:00" if rng.random() > 0.01 else '',
+                rng.randrange(20), rng.randrange(500),
+            ])
+    with open(comments_csv, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'post_id', 'writer', 'content', 'reg_date'])
+        for i in range(rows):
+            writer.writerow([
+                i, rng.randrange(rows), f"담당자{rng.randrange(50)}",
+                ' '.join(rng.choices(words, k=rng.randrange(3, 30))),
+                f"2025-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d} {rng.randrange(24):02d}:00:00",
+            ])
+
+
+def run(mode, posts_csv, comments_csv, out_dir):
+    os.makedirs(out_dir)
+    output = subprocess.run(
+        [sys.executable, '-c', WORKER_CODE, _common.BASE_DIR, os.path.dirname(os.path.abspath(__file__)),
+         mode, posts_csv, comments_csv, out_dir],
+        check=True, capture_output=True, text=True).stdout.split()
+    return float(output[-2]), int(output[-1]) / 1024
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    _common.print_header(f"CSV -> JSON 변환 (합성 원글 {rows:,}행 + 댓글 {rows:,}행)")
+    with tempfile.TemporaryDirectory() as tmp:
+        posts_csv = os.path.join(tmp, 'posts.csv')
+        comments_csv = os.path.join(tmp, 'comments.csv')
+        write_synthetic_csv(posts_csv, comments_csv, rows)
+        csv_mb = (os.path.getsize(posts_csv) + os.path.getsize(comments_csv)) / 1024 / 1024
+        print(f"CSV 크기: {csv_mb:.0f}MB")
+
+        legacy_s, legacy_mb = run('legacy', posts_csv, comments_csv, os.path.join(tmp, 'legacy'))
+        stream_s, stream_mb = run('stream', posts_csv, comments_csv, os.path.join(tmp, 'stream'))
+        _common.print_row("소요 시간 (기존 -> 스트리밍)", legacy_s, stream_s, "s")
+        _common.print_row("최대 RSS (기존 -> 스트리밍)", legacy_mb, stream_mb, "MB")
+
+        same = [name for name in OUTPUTS
+                if filecmp.cmp(os.path.join(tmp, 'legacy', name), os.path.join(tmp, 'stream', name), shallow=False)]
+        print(f"\n출력 파일 일치: {len(same)}/{len(OUTPUTS)} ({', '.join(same)})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+reg_date 파싱 마이크로벤치마크
+기존 strptime 형식 순차 시도(try/except) 루프와 parsers 모듈의
+고정 위치 슬라이싱(행 단위 캐시: 변환기, 일괄 epoch 변환: CSVDataLoader)을 비교합니다.
+원본 CSV가 없으면 (또는 'sample'을 주면) 합성 CSV(_common.write_sample_csv)로 실행합니다.
+
+사용법:
+    python benchmarks/bench_dates.py [원글 CSV | sample] [댓글 CSV]
+"""
+import tempfile
+import time
+
+import _common
+import _legacy
+import parsers
+
+
+def run(label, values, fn):
+    start = time.perf_counter()
+    result = fn(values)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    parsed = sum(1 for value in result if value is not None)
+    print(f"  {label:<34} {elapsed_ms:>9.2f}ms  "
+          f"({len(values) / elapsed_ms * 1000:>12,.0f}행/s, 파싱 성공 {parsed}/{len(values)})")
+    return elapsed_ms
+
+
+def main():
+    _common.print_header("reg_date 파싱 벤치마크")
+    with tempfile.TemporaryDirectory() as tmp:
+        bench(*_common.csv_paths_or_sample(tmp))
+
+
+def bench(posts_csv, comments_csv):
+    for label, path in (('원글', posts_csv), ('댓글', comments_csv)):
+        values = [row.get('reg_date', '') or '' for row in _legacy.load_rows(path)]
+        print(f"\n[{label}] {len(values)}행, 고유 값 {len(set(values))}개")
+        run("기존 strptime try/except 루프", values,
+            lambda vs: [_legacy.parse_date(v) for v in vs])
+        parsers.parse_date.cache_clear()
+        run("parsers.parse_date (행 단위, 캐시)", values,
+            lambda vs: [parsers.parse_date(v) for v in vs])
+        run("parsers.parse_timestamps (일괄)", values, parsers.parse_timestamps)
+
+    # 형식별 비교 (구분자 형식은 기존 방식도 파싱 가능)
+    samples = {
+        'YYYYMMDDHHMMSS': '20250801091220',
+        'YYYY-MM-DD HH:MM:SS': '2025-08-01 09:12:20',
+        'YYYY/MM/DD': '2025/08/01',
+    }
+    print("\n[형식별 1회 파싱 시간 (캐시 제외)]")
+    for label, sample in samples.items():
+        before = _common.time_per_call(lambda: _legacy.parse_date(sample), repeat=20000) * 1000
+        after = _common.time_per_call(lambda: parsers._parse_date_uncached(sample), repeat=20000) * 1000
+        _common.print_row(label, before, after, "us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+엣지 함수 데이터 번들 측정
+CSV로 기존 JSON(posts/comments/indexed.json)과 번들(manifest.json + 샤드)을 각각 만든 뒤,
+functions/api/chat.js를 Node.js로 실행해 질문 종류별 요청당 전송 바이트, 읽은 파일 수, JSON 파싱 시간을
+기존 방식(요청마다 JSON 파일 3개 전체를 받아 파싱)과 비교합니다.
+번들이 없을 때(posts.json / comments.json 대체 경로)의 시스템 프롬프트가 번들과 같은지도 확인합니다.
+Node.js가 필요합니다.
+원본 CSV가 없으면 (또는 'sample'을 주면) 합성 CSV(_common.write_sample_csv)로 실행합니다.
+
+사용법:
+    python benchmarks/bench_edge_bundle.py [원글 CSV | sample] [댓글 CSV]
+"""
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import _common
+import _legacy
+import convert_csv_to_json as converter
+
+MESSAGES = [
+    '안녕하세요',
+    '최근 문제 알려줘',
+    '지난주 오류 사례',
+    '지난달 장애',
+]
+CLIENT_MESSAGES = ['{client} 담당자 누구야', '{client} 지난달 이슈']
+
+
+def build_data(posts_csv, comments_csv, legacy_dir, bundle_dir):
+    with contextlib.redirect_stdout(io.StringIO()):
+        _legacy.convert_csv_to_json(posts_csv, comments_csv, *(os.path.join(legacy_dir, name) for name in
+                                                               ('posts.json', 'comments.json', 'indexed.json')))
+        converter.build_bundle(posts_csv, comments_csv, bundle_dir)
+
+
+def latest_post_date(legacy_dir):
+    """데이터의 마지막 등록일 (날짜 필터 질문의 기준 시각)"""
+    with open(os.path.join(legacy_dir, 'posts.json'), encoding='utf-8') as f:
+        dates = [post['reg_date'] for post in json.load(f) if post['reg_date'] and post['reg_date'][:4].isdigit()]
+    return max(dates)
+
+
+def main():
+    if shutil.which('node') is None:
+        print("오류: Node.js(node)를 찾을 수 없습니다.")
+        sys.exit(1)
+    _common.print_header("엣지 함수 데이터 번들 (요청당)")
+    with tempfile.TemporaryDirectory() as tmp:
+        posts_csv, comments_csv = _common.csv_paths_or_sample(tmp)
+        legacy_dir = os.path.join(tmp, 'legacy')
+        bundle_dir = os.path.join(tmp, 'bundle')
+        os.makedirs(legacy_dir)
+        build_data(posts_csv, comments_csv, legacy_dir, bundle_dir)
+
+        with open(os.path.join(bundle_dir, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+        # 게시글이 가장 많은 고객사
+        client = max(manifest['clients'], key=lambda c: c[1])[0]
+        messages = MESSAGES + [m.format(client=client) for m in CLIENT_MESSAGES]
+
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_edge_bench.mjs')
+        handler = os.path.join(_common.BASE_DIR, 'functions', 'api', 'chat.js')
+        output = subprocess.run(['node', script, legacy_dir, bundle_dir, handler, latest_post_date(legacy_dir)],
+                                input=json.dumps(messages), capture_output=True, text=True, check=True)
+        result = json.loads(output.stdout)
+
+    legacy = result['legacy']
+    print(f"기존: 파일 3개, {legacy['bytes'] / 1024:,.0f}KB, 파싱 {legacy['parseMs']:.1f}ms (모든 질문 동일)\n")
+    for row in result['results']:
+        print(f"{row['message'][:28]:<30}")
+        _common.print_row("  전송량 (기존 -> 번들)", legacy['bytes'] / 1024, row['bytes'] / 1024, "KB")
+        _common.print_row("  JSON 파싱 (기존 -> 번들)", legacy['parseMs'], row['parseMs'], "ms")
+        print(f"  읽은 파일 {row['files']:.0f}개, 요청 처리 {row['totalMs']:.1f}ms")
+        fallback = row['fallback']
+        print(f"  번들 없음 (posts/comments.json): {fallback['bytes'] / 1024:,.0f}KB, 요청 처리 {fallback['totalMs']:.1f}ms, "
+              f"프롬프트 {'번들과 같음' if fallback['samePrompt'] else '번들과 다름'}")
+
+
+if __name__ == '__main__':
+    main()
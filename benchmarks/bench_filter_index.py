@@ -0,0 +1,99 @@
+"""
+get_posts_text 필터 인덱스 / 상위 k개 선택 검증 및 벤치마크
+모든 고객사(없음 포함) x 날짜 필터 조합에서 기존 선형 탐색 + 전체 정렬과 결과가 같은지
+확인한 뒤 요청당 선택 시간을 비교합니다.
+원본 CSV가 없으면 (또는 'sample'을 주면) 모든 날짜 필터에 해당하는 게시글이 있는 합성 CSV로 확인합니다.
+
+사용법:
+    python benchmarks/bench_filter_index.py [원글 CSV | sample] [댓글 CSV]
+"""
+import sys
+import tempfile
+
+import _common
+import _legacy
+from csv_loader import CSVDataLoader
+
+DATE_FILTERS = [None, 'today', 'yesterday', 'this_week', 'last_week',
+                'this_month', 'last_month', 'recent', 'unknown']
+LIMITS = [1, 30]
+
+
+def ranked_ids(loader, client_name, date_filter):
+    """인덱스 기반 필터 + 댓글 수 정렬 결과의 게시글 id 목록"""
+    posts = loader.posts_data
+    indices = loader._filter_indices(client_name, date_filter)
+    indices.sort(key=lambda i: posts[i].comm_cnt, reverse=True)
+    return [posts[i].id for i in indices]
+
+
+def top_ids(loader, client_name, date_filter, limit):
+    """미리 계산한 순위 기반 상위 k개 선택 결과의 게시글 id 목록"""
+    return [loader.posts_data[i].id for i in loader._top_indices(limit, client_name, date_filter)]
+
+
+def client_queries(loader):
+    """실제 고객사 이름과 부분 문자열/확장 문자열 질의"""
+    queries = [None]
+    for name in loader.get_client_names():
+        queries.append(name)
+        if len(name) > 3:
+            queries.append(name[1:-1])
+        queries.append(f"{name} 관련 문의")
+    return queries
+
+
+def main():
+    _common.print_header("get_posts_text 필터 인덱스 검증 / 벤치마크")
+    with tempfile.TemporaryDirectory() as tmp:
+        run(*_common.csv_paths_or_sample(tmp))
+
+
+def run(posts_csv, comments_csv):
+    loader = CSVDataLoader(posts_csv, comments_csv)
+    legacy_posts = _legacy.load_rows(posts_csv)
+
+    # 1. 결과 동일성 검증 (날짜 파싱은 로더와 같은 함수 사용)
+    queries = client_queries(loader)
+    mismatches = 0
+    # 날짜 필터별 결과가 있는 조합 수 (고객사 없음 / 고객사 지정)
+    covered = {date_filter: [0, 0] for date_filter in DATE_FILTERS}
+    for client_name in queries:
+        for date_filter in DATE_FILTERS:
+            expected = [row['id'] for row in _legacy.filter_posts(
+                legacy_posts, client_name, date_filter, parse=loader._parse_date)]
+            if expected:
+                covered[date_filter][client_name is not None] += 1
+            actual = ranked_ids(loader, client_name, date_filter)
+            if expected != actual:
+                mismatches += 1
+                print(f"불일치: client={client_name!r} date_filter={date_filter!r} "
+                      f"(기존 {len(expected)}개, 인덱스 {len(actual)}개)")
+            for limit in LIMITS:
+                if expected[:limit] != top_ids(loader, client_name, date_filter, limit):
+                    mismatches += 1
+                    print(f"상위 {limit}개 불일치: client={client_name!r} date_filter={date_filter!r}")
+    total = len(queries) * len(DATE_FILTERS) * (1 + len(LIMITS))
+    print("날짜 필터별 결과가 있는 조합 (고객사 없음 / 고객사 지정 " f"{len(queries) - 1}개 중): " + ', '.join(
+        f"{date_filter}={without}/{with_client}" for date_filter, (without, with_client) in covered.items()))
+    print(f"검증: {total}개 조합 중 불일치 {mismatches}개")
+    if mismatches:
+        sys.exit(1)
+
+    # 2. 필터링 + 상위 30개 선택 시간 비교
+    print("\n[요청당 상위 30개 선택 시간: 선형 탐색+전체 정렬 -> 인덱스 -> 순위 병합]")
+    sample_client = loader.get_client_names()[len(loader.get_client_names()) // 2]
+    for client_name, date_filter in [(None, None), (None, 'recent'), (None, 'this_month'),
+                                     (sample_client, None), (sample_client, 'last_month')]:
+        before = _common.time_per_call(lambda: _legacy.filter_posts(
+            legacy_posts, client_name, date_filter, parse=loader._parse_date)[:30], repeat=20)
+        indexed = _common.time_per_call(
+            lambda: ranked_ids(loader, client_name, date_filter)[:30], repeat=20)
+        after = _common.time_per_call(
+            lambda: top_ids(loader, client_name, date_filter, 30), repeat=20)
+        print(f"{client_name or '전체'} / {date_filter}: "
+              f"{before:.3f}ms -> {indexed:.3f}ms -> {after:.3f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+세션별 대화 기록 저장소 동작 확인 / 메모리 측정
+동시 사용자가 많을 때 기존 전역 리스트와 세션 저장소의 메모리 사용량을 비교하고,
+메모리/SQLite 저장소의 세션 격리, 길이 제한, 유휴 세션 제거를 확인합니다.
+
+사용법:
+    python benchmarks/bench_history_store.py [세션 수] [세션당 대화 수]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import _common
+from history_store import MemoryHistoryStore, SQLiteHistoryStore
+
+ANSWER = "게시판 정보에 따르면 박선미과장님이 답변을 해주었습니다. " * 10
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def exchange(turn):
+    return [{"role": "user", "content": f"블루타이거 최근 문제 {turn}"},
+            {"role": "assistant", "content": ANSWER}]
+
+
+def check_behaviour(store, clock):
+    """세션 격리, 길이 제한, 세션별 초기화, 유휴 세션 제거 확인"""
+    for turn in range(8):
+        store.append('a', exchange(turn))
+    store.append('b', exchange(0))
+    history = store.get('a')
+    assert len(history) == store.max_messages, len(history)
+    assert history[-2]['content'] == "블루타이거 최근 문제 7" and history[0]['role'] == 'user'
+    assert len(store.get('b')) == 2
+
+    store.clear('a')
+    assert store.get('a') == [] and len(store.get('b')) == 2, "세션별 초기화 실패"
+
+    clock.now += store.idle_ttl_seconds + 1
+    assert store.get('b') == [], "유휴 세션 만료 실패"
+    store.evict_idle()
+    assert store.stats()['sessions'] == 0, store.stats()
+
+
+def concurrent_load(store, sessions, turns, threads=16):
+    """여러 스레드가 서로 다른 세션에 동시에 읽고 쓰기"""
+    def worker(offset):
+        for session in range(offset, sessions, threads):
+            session_id = f"user-{session}"
+            for turn in range(turns):
+                store.get(session_id)
+                store.append(session_id, exchange(turn))
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def legacy_memory(sessions, turns):
+    """기존 방식: 모든 사용자가 하나의 리스트에 계속 추가"""
+    tracemalloc.start()
+    conversation_history = []
+    for session in range(sessions):
+        for turn in range(turns):
+            conversation_history.extend(exchange(turn))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, len(conversation_history)
+
+
+def store_memory(sessions, turns, max_sessions):
+    tracemalloc.start()
+    store = MemoryHistoryStore(max_messages=10, max_sessions=max_sessions)
+    concurrent_load(store, sessions, turns)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, store.stats()
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    _common.print_header("세션별 대화 기록 저장소")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        clock = FakeClock()
+        check_behaviour(MemoryHistoryStore(max_messages=10, idle_ttl_seconds=60, clock=clock), clock)
+        clock = FakeClock()
+        check_behaviour(SQLiteHistoryStore(os.path.join(tmp, 'check.db'), max_messages=10,
+                                           idle_ttl_seconds=60, clock=clock), clock)
+        print("동작 확인: 세션 격리 / 길이 제한 / 세션별 초기화 / 유휴 세션 제거 정상 (memory, sqlite)")
+
+        # 다른 프로세스(워커)가 같은 DB 파일을 열어도 같은 기록을 봄
+        db_path = os.path.join(tmp, 'shared.db')
+        SQLiteHistoryStore(db_path).append('shared', exchange(0))
+        assert len(SQLiteHistoryStore(db_path).get('shared')) == 2
+        print("동작 확인: SQLite 저장소를 여러 인스턴스가 공유")
+
+        print(f"\n[사용자 {sessions}명 x 대화 {turns}회]")
+        before, messages = legacy_memory(sessions, turns)
+        print(f"  기존 전역 리스트:   {before / 1024 / 1024:7.2f}MB (메시지 {messages}개, 계속 증가)")
+        for max_sessions in (sessions, sessions // 4):
+            after, stats = store_memory(sessions, turns, max_sessions)
+            print(f"  메모리 저장소 (세션 상한 {max_sessions}): {after / 1024 / 1024:7.2f}MB "
+                  f"(세션 {stats['sessions']}개, 메시지 {stats['messages']}개)")
+
+        sqlite_sessions = min(sessions, 500)
+        store = SQLiteHistoryStore(os.path.join(tmp, 'load.db'), max_messages=10)
+        elapsed = concurrent_load(store, sqlite_sessions, turns)
+        stats = store.stats()
+        operations = sqlite_sessions * turns * 2
+        print(f"  SQLite 저장소: 사용자 {sqlite_sessions}명, 읽기/쓰기 {operations}회 {elapsed:.2f}s "
+              f"({operations / elapsed:.0f}회/s, 메시지 {stats['messages']}개 유지)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+CSV 데이터 무중단 새로고침 확인
+조회 스레드가 계속 게시판 컨텍스트를 만드는 동안 CSV 파일에 행을 추가하고,
+기존 방식(요청 안에서 동기 로드 후 전역 교체)과 DataReloader(백그라운드 로드 후 교체)의
+새로고침 요청 응답 시간, 조회 지연, 조회 오류 수를 비교합니다.
+CSV 파일은 임시 디렉터리에 복사해서 사용합니다.
+원본 CSV가 없으면 (또는 'sample'을 주면) 합성 CSV(_common.write_sample_csv)로 실행합니다.
+
+사용법:
+    python benchmarks/bench_hot_reload.py [원글 CSV | sample] [댓글 CSV]
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import _common
+from csv_loader import CSVDataLoader, _complete_length
+from data_reloader import DataReloader
+
+QUERY_THREADS = 4
+RELOADS = 3
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def append_rows(posts_csv, count=50):
+    """마지막 행을 복사해 원글 CSV에 추가 (파일 수정 시각/크기 변경)"""
+    with open(posts_csv, 'rb') as f:
+        data = f.read()
+    # 따옴표 안 줄바꿈이 있을 수 있으므로 행 경계 기준으로 마지막 행을 찾음
+    end = _complete_length(data)
+    last_row = data[_complete_length(data[:end - 1]):end]
+    with open(posts_csv, 'ab') as f:
+        f.write(last_row * count)
+
+
+class QueryLoad:
+    """get_loader()로 매번 스냅샷을 얻어 조회하는 스레드들"""
+
+    def __init__(self, get_loader):
+        self.get_loader = get_loader
+        self.latencies = []
+        self.errors = 0
+        self._stop = threading.Event()
+        self._threads = [threading.Thread(target=self._run, daemon=True) for _ in range(QUERY_THREADS)]
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.perf_counter()
+            try:
+                loader = self.get_loader()
+                client = loader.match_client_name("블루타이거 최근 문제 알려줘")
+                loader.get_posts_text(limit=30, client_name=client, token_budget=6000, comments_per_post=2)
+            except Exception:
+                self.errors += 1
+            self.latencies.append(time.perf_counter() - started)
+
+    def __enter__(self):
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join()
+
+
+def bench_legacy(posts_csv, comments_csv):
+    state = {'loader': CSVDataLoader(posts_csv, comments_csv)}
+    request_ms = []
+    with QueryLoad(lambda: state['loader']) as load:
+        for _ in range(RELOADS):
+            append_rows(posts_csv)
+            started = time.perf_counter()
+            state['loader'] = CSVDataLoader(posts_csv, comments_csv)  # 요청 처리 중 동기 로드
+            request_ms.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.2)
+    return request_ms, [], load
+
+
+def bench_reloader(posts_csv, comments_csv, poll_interval):
+    reloader = DataReloader(posts_csv, comments_csv, poll_interval=poll_interval)
+    reloader.load()
+    reloader.start_watching()
+    request_ms, reload_ms = [], []
+    with QueryLoad(lambda: reloader.loader) as load:
+        for _ in range(RELOADS):
+            append_rows(posts_csv)
+            started = time.perf_counter()
+            if poll_interval:
+                # 파일 변경 감지로 자동 새로고침
+                while not reloader.reloading and reloader.files_changed():
+                    time.sleep(0.01)
+            else:
+                reloader.reload_async()
+            request_ms.append((time.perf_counter() - started) * 1000)
+            reloader.wait()
+            reload_ms.append(reloader.last_duration_ms)
+            time.sleep(0.2)
+    reloader.stop()
+    return request_ms, reload_ms, load, reloader
+
+
+def report(label, request_ms, reload_ms, load, request_label="새로고침 요청 응답"):
+    latencies = load.latencies
+    print(f"  {label:24s}: {request_label} {max(request_ms):7.1f}ms"
+          + (f" | 백그라운드 로드 {max(reload_ms):6.0f}ms" if reload_ms else "")
+          + f" | 조회 {len(latencies)}회 p50 {percentile(latencies, 50) * 1000:5.1f}ms "
+            f"p99 {percentile(latencies, 99) * 1000:6.1f}ms | 오류 {load.errors}건")
+
+
+def main():
+    _common.print_header(f"CSV 데이터 새로고침 (조회 스레드 {QUERY_THREADS}개, 새로고침 {RELOADS}회)")
+    with tempfile.TemporaryDirectory() as tmp:
+        posts_csv_src, comments_csv_src = _common.csv_paths_or_sample(tmp)
+        posts_csv = os.path.join(tmp, 'posts.csv')
+        comments_csv = os.path.join(tmp, 'comments.csv')
+        shutil.copy(posts_csv_src, posts_csv)
+        shutil.copy(comments_csv_src, comments_csv)
+
+        request_ms, reload_ms, load = bench_legacy(posts_csv, comments_csv)
+        report("기존 (요청 안에서 로드)", request_ms, reload_ms, load)
+
+        request_ms, reload_ms, load, _ = bench_reloader(posts_csv, comments_csv, poll_interval=0)
+        report("DataReloader", request_ms, reload_ms, load)
+
+        request_ms, reload_ms, load, reloader = bench_reloader(posts_csv, comments_csv, poll_interval=0.1)
+        report("DataReloader (변경 감지)", request_ms, reload_ms, load, request_label="변경 감지까지")
+        stats = reloader.stats()
+        print(f"\n자동 새로고침 {stats['reloads'] - 1}회, 최종 원글 {stats['posts_count']}개, "
+              f"마지막 로드 {stats['last_duration_ms']}ms")
+
+
+if __name__ == '__main__':
+    main()
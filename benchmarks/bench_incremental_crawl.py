@@ -0,0 +1,130 @@
+"""
+증분 크롤링 확인 / 측정
+가짜 게시판 서버(fake_board_server.py, 목록을 여러 페이지로 나눔)를 BoardCrawler.crawl_incremental로 크롤링합니다.
+1. 처음 크롤링 (전체 목록 + 전체 상세 페이지)
+2. 바뀐 것이 없을 때 다시 크롤링 (목록 페이지만, 상세 페이지 없음)
+3. 새 게시글/덧글이 생긴 뒤 다시 크롤링 (새 글과 댓글 수가 바뀐 글의 상세 페이지만,
+   덧글은 첫 목록 페이지의 글과 세 번째 이후 목록 페이지의 오래된 글에 추가)
+매번 CrawlStateStore.export_csv로 CSV에 반영해 CSVDataLoader가 읽은 결과가 서버 데이터와 같은지,
+refresh()가 바뀐 게시글까지 추가된 행만 읽어 반영하고 그 결과가 전체 로드와 같은지 확인하고,
+3번을 빈 상태에서 처음부터 다시 크롤링하는 경우와 비교합니다.
+
+사용법:
+    python benchmarks/bench_incremental_crawl.py [게시판 수] [게시판당 게시글 수] [목록 페이지당 게시글 수] [페이지 지연(초)]
+"""
+import logging
+import os
+import sys
+import tempfile
+
+import _common
+from board_crawler import BoardCrawler
+from crawl_state import CrawlStateStore
+from bench_incremental_load import same_as_full
+from csv_loader import CSVDataLoader
+from fake_board_server import EMAIL, PASSWORD, FakeBoardServer
+
+
+def crawl_round(server, state):
+    crawler = BoardCrawler(server.base_url, EMAIL, PASSWORD, backend='http')
+    crawler.login()
+    server.reset_stats()
+    try:
+        summaries = [crawler.crawl_incremental(server.board_url(pid), board['name'], state)
+                     for pid, board in server.boards.items()]
+    finally:
+        crawler.close()
+    total = {key: sum(s[key] for s in summaries)
+             for key in ('pages', 'new', 'changed', 'details', 'failed', 'seconds')}
+    total['requests'] = server.pages
+    return total
+
+
+def mismatches(server, loader):
+    """서버 데이터와 로더 데이터가 다른 게시글/덧글 수"""
+    posts = {post.id: post for post in loader.posts_data}
+    comments = {comment.id: comment for comment in loader.comments_data}
+    diffs = abs(len(posts) - len(loader.posts_data)) + abs(len(comments) - len(loader.comments_data))
+    expected_posts = expected_comments = 0
+    for board in server.boards.values():
+        for exp in board['posts']:
+            expected_posts += 1
+            post = posts.get(str(exp['idx']))
+            if post is None or (post.name, post.subject, post.writer, post.comm_cnt, post.content) != \
+                    (board['name'], exp['title'], exp['author'], len(exp['comments']),
+                     ' '.join(exp['content'].split())[:1000]):
+                diffs += 1
+            for c in exp['comments']:
+                expected_comments += 1
+                comment = comments.get(str(c['id']))
+                if comment is None or (comment.post_id, comment.writer, comment.content) != \
+                        (str(exp['idx']), c['author'], c['text']):
+                    diffs += 1
+    return diffs + abs(len(posts) - expected_posts) + abs(len(comments) - expected_comments)
+
+
+def report(label, total, exported, loader, server, full_diffs=None):
+    diffs = mismatches(server, loader)
+    print(f"  {label:18s}: {total['seconds']:6.2f}s | 목록 {total['pages']:3d}페이지 | 상세 {total['details']:4d}개 "
+          f"(새 글 {total['new']}, 바뀐 글 {total['changed']}) | 요청 {total['requests']:4d}회")
+    print(f"  {'':18s}  CSV: 원글 추가 {exported['posts_appended']}, 갱신 {exported['posts_updated']}, "
+          f"덧글 추가 {exported['comments_appended']} | 로더 {loader.load_mode} | "
+          f"서버 데이터와 {'동일' if not diffs else f'{diffs}건 다름'}"
+          + ('' if full_diffs is None else f" | 전체 로드와 {'동일' if not full_diffs else f'다름: {full_diffs}'}"))
+
+
+def main():
+    boards = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    posts_per_board = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    page_size = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    page_delay = float(sys.argv[4]) if len(sys.argv) > 4 else 0.02
+    _common.print_header(f"증분 크롤링 (게시판 {boards}개 x 게시글 {posts_per_board}개, 목록 페이지당 {page_size}개, "
+                         f"페이지 지연 {page_delay * 1000:.0f}ms)")
+    logging.disable(logging.WARNING)
+
+    with FakeBoardServer(boards=boards, posts_per_board=posts_per_board, page_delay=page_delay,
+                         page_size=page_size) as server, tempfile.TemporaryDirectory() as workdir:
+        posts_csv = os.path.join(workdir, 'posts.csv')
+        comments_csv = os.path.join(workdir, 'comments.csv')
+        state = CrawlStateStore(os.path.join(workdir, 'crawl_state.db'))
+
+        total = crawl_round(server, state)
+        exported = state.export_csv(posts_csv, comments_csv)
+        loader = CSVDataLoader(posts_csv, comments_csv)
+        report("처음 크롤링", total, exported, loader, server)
+
+        total = crawl_round(server, state)
+        exported = state.export_csv(posts_csv, comments_csv)
+        loader = loader.refresh()
+        report("변경 없음", total, exported, loader, server, same_as_full(loader, posts_csv, comments_csv))
+
+        # 게시판마다 새 글 2개, 첫 목록 페이지의 기존 글 2개와 세 번째 이후 목록 페이지의 오래된 글 1개에 덧글 추가
+        for pid, board in server.boards.items():
+            deep = min(len(board['posts']) - 1, page_size * 2 + 5)
+            commented = [board['posts'][3]['idx'], board['posts'][8]['idx'], board['posts'][deep]['idx']]
+            server.add_post(pid)
+            server.add_post(pid)
+            for idx in commented:
+                server.add_comment(pid, idx)
+
+        incremental = crawl_round(server, state)
+        exported = state.export_csv(posts_csv, comments_csv)
+        loader = loader.refresh()
+        report("새 글/덧글 후", incremental, exported, loader, server, same_as_full(loader, posts_csv, comments_csv))
+
+        fresh_dir = os.path.join(workdir, 'fresh')
+        os.mkdir(fresh_dir)
+        fresh_state = CrawlStateStore(os.path.join(fresh_dir, 'crawl_state.db'))
+        full = crawl_round(server, fresh_state)
+        exported = fresh_state.export_csv(os.path.join(fresh_dir, 'posts.csv'),
+                                          os.path.join(fresh_dir, 'comments.csv'))
+        report("(처음부터 다시)", full, exported,
+               CSVDataLoader(os.path.join(fresh_dir, 'posts.csv'), os.path.join(fresh_dir, 'comments.csv')), server)
+        print(f"\n  크롤링 상태: {state.stats()}\n")
+
+    _common.print_row("새 글/덧글 반영", full['seconds'], incremental['seconds'], "s")
+    _common.print_row("서버 요청 수", full['requests'], incremental['requests'], "회")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+CSV 증분 로드 확인 / 측정
+CSV 파일 앞부분만 로드한 뒤 나머지 행을 추가하고, CSVDataLoader.refresh()의 결과가
+전체 파일을 처음부터 로드한 결과(레코드와 모든 인덱스)와 같은지 확인합니다.
+쓰는 중인 마지막 행은 다음 로드로 미루는지, 파일이 새로 쓰이면 전체 로드로 바뀌는지도 확인하고,
+추가된 행 수별 전체 로드 / 증분 로드 시간을 비교합니다.
+원본 CSV가 없으면 (또는 'sample'을 주면) 여러 줄 필드와 CRLF 줄바꿈이 섞인 합성 CSV로 확인합니다.
+
+사용법:
+    python benchmarks/bench_incremental_load.py [원글 CSV | sample] [댓글 CSV]
+"""
+import csv
+import os
+import shutil
+import tempfile
+import time
+
+import _common
+from csv_loader import CSVDataLoader, _complete_length
+
+INDEX_ATTRS = ['_client_names', '_client_dated', '_client_undated', '_date_ts', '_date_idx', '_undated',
+               '_rank_pos', '_ranked_all', '_client_ranked', '_day_ranked', '_day_keys', '_undated_ranked']
+APPEND_ROWS = [10, 100, 1000]
+
+
+def split_point(data, ratio):
+    """data의 ratio 지점 이전의 마지막 행 끝 위치"""
+    return _complete_length(data[:int(len(data) * ratio)])
+
+
+def same_as_full(loader, posts_csv, comments_csv):
+    """증분 로드 결과가 전체 로드 결과와 같은지 (다른 항목 목록 반환)"""
+    full = CSVDataLoader(posts_csv, comments_csv)
+    diffs = [attr for attr in INDEX_ATTRS if getattr(loader, attr) != getattr(full, attr)]
+    if [p.to_dict() for p in loader.posts_data] != [p.to_dict() for p in full.posts_data]:
+        diffs.append('posts_data')
+    if [c.to_dict() for c in loader.comments_data] != [c.to_dict() for c in full.comments_data]:
+        diffs.append('comments_data')
+    by_post = {k: [c.id for c in v] for k, v in loader._comments_by_post.items()}
+    if by_post != {k: [c.id for c in v] for k, v in full._comments_by_post.items()}:
+        diffs.append('_comments_by_post')
+    if loader.get_client_names() != full.get_client_names():
+        diffs.append('client_names')
+    return diffs
+
+
+def check_correctness(posts_src, comments_src, tmp):
+    posts_csv = os.path.join(tmp, 'posts.csv')
+    comments_csv = os.path.join(tmp, 'comments.csv')
+    with open(posts_src, 'rb') as f:
+        posts_bytes = f.read()
+    with open(comments_src, 'rb') as f:
+        comments_bytes = f.read()
+
+    # 1. 앞 70%만 로드 -> 나머지 추가 -> 증분 로드
+    posts_cut, comments_cut = split_point(posts_bytes, 0.7), split_point(comments_bytes, 0.7)
+    with open(posts_csv, 'wb') as f:
+        f.write(posts_bytes[:posts_cut])
+    with open(comments_csv, 'wb') as f:
+        f.write(comments_bytes[:comments_cut])
+    loader = CSVDataLoader(posts_csv, comments_csv)
+    initial_posts, initial_ranked = len(loader.posts_data), len(loader._ranked_all)
+
+    # 2. 마지막 행을 반만 쓴 상태: 완전한 행까지만 읽음
+    half = posts_cut + (len(posts_bytes) - posts_cut) // 2
+    with open(posts_csv, 'ab') as f:
+        f.write(posts_bytes[posts_cut:half])
+    with open(comments_csv, 'ab') as f:
+        f.write(comments_bytes[comments_cut:])
+    partial = loader.refresh()
+    complete_rows = len(CSVDataLoader(posts_csv, comments_csv).posts_data)
+    print(f"  쓰는 중인 행 제외  : {partial.load_mode}, 원글 {len(loader.posts_data)} -> "
+          f"{len(partial.posts_data)}개 (파일의 완전한 행 {complete_rows}개 이하)")
+
+    with open(posts_csv, 'ab') as f:
+        f.write(posts_bytes[half:])
+    refreshed = partial.refresh()
+    diffs = same_as_full(refreshed, posts_csv, comments_csv)
+    print(f"  나머지 추가 후     : {refreshed.load_mode}, 원글 {len(refreshed.posts_data)}개, "
+          f"댓글 {len(refreshed.comments_data)}개, 전체 로드와 {'동일' if not diffs else '다름: ' + str(diffs)}")
+    print(f"  이전 스냅샷 유지   : 원글 {initial_posts} -> {len(loader.posts_data)}개, "
+          f"순위 목록 {initial_ranked} -> {len(loader._ranked_all)}개")
+
+    # 3. 변경 없음
+    print(f"  변경 없음          : {refreshed.refresh().load_mode}")
+
+    # 4. 파일 앞부분이 바뀐 경우 (새로 내보낸 파일): 전체 로드
+    with open(posts_csv, 'r+b') as f:
+        head = f.read(200)
+        f.seek(0)
+        f.write(head.replace(b'a', b'b', 1) if b'a' in head else head[:-1] + b' ')
+    print(f"  파일 앞부분 변경   : {refreshed.refresh().load_mode}")
+
+
+def bench_timing(posts_src, comments_src, tmp):
+    posts_csv = os.path.join(tmp, 'posts_t.csv')
+    comments_csv = os.path.join(tmp, 'comments_t.csv')
+    shutil.copy(comments_src, comments_csv)
+    with open(posts_src, 'r', encoding='utf-8', newline='') as f:
+        header, *rows = list(csv.reader(f))
+
+    print("\n[원글 끝에 행 추가 후 새로고침]")
+    for count in APPEND_ROWS:
+        # 마지막 count행을 뺀 파일을 로드한 뒤 그 행들을 추가
+        with open(posts_csv, 'w', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerows([header] + rows[:-count])
+        loader = CSVDataLoader(posts_csv, comments_csv)
+        with open(posts_csv, 'a', encoding='utf-8', newline='') as f:
+            csv.writer(f).writerows(rows[-count:])
+
+        started = time.perf_counter()
+        CSVDataLoader(posts_csv, comments_csv)
+        full_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        refreshed = loader.refresh()
+        incremental_ms = (time.perf_counter() - started) * 1000
+        _common.print_row(f"{count}행 추가 ({refreshed.load_mode})", full_ms, incremental_ms, "ms")
+
+
+def main():
+    _common.print_header("CSV 증분 로드")
+    with tempfile.TemporaryDirectory() as tmp:
+        posts_src, comments_src = _common.csv_paths_or_sample(tmp)
+        check_correctness(posts_src, comments_src, tmp)
+        bench_timing(posts_src, comments_src, tmp)
+
+
+if __name__ == '__main__':
+    main()
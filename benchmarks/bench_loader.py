@@ -0,0 +1,86 @@
+"""
+CSVDataLoader 메모리/지연 시간 비교 벤치마크
+기존 dict-of-strings 방식과 로드 시 1회 파싱하는 레코드 저장소를 비교합니다.
+원본 CSV가 없으면 (또는 'sample'을 주면) 합성 CSV(_common.write_sample_csv)로 실행합니다.
+
+사용법:
+    python benchmarks/bench_loader.py [원글 CSV | sample] [댓글 CSV]
+"""
+import tempfile
+import time
+
+import _common
+import _legacy
+from csv_loader import CSVDataLoader
+
+QUERIES = [
+    ('필터 없음', None, None),
+    ('날짜 필터 (recent)', None, 'recent'),
+    ('날짜 필터 (last_month)', None, 'last_month'),
+]
+
+
+def main():
+    _common.print_header("CSVDataLoader 벤치마크 (기존 dict 행 vs 파싱된 레코드)")
+    with tempfile.TemporaryDirectory() as tmp:
+        run(*_common.csv_paths_or_sample(tmp))
+
+
+def run(posts_csv, comments_csv):
+    start = time.perf_counter()
+    (legacy_posts, legacy_comments), _, legacy_peak = _common.measure_memory(
+        lambda: (_legacy.load_rows(posts_csv), _legacy.load_rows(comments_csv)))
+    legacy_load_ms = (time.perf_counter() - start) * 1000
+    _, legacy_mem, _ = _common.measure_memory(
+        lambda: (_legacy.load_rows(posts_csv), _legacy.load_rows(comments_csv)))
+
+    start = time.perf_counter()
+    loader, _, loader_peak = _common.measure_memory(
+        lambda: CSVDataLoader(posts_csv, comments_csv))
+    loader_load_ms = (time.perf_counter() - start) * 1000
+    _, loader_mem, _ = _common.measure_memory(
+        lambda: CSVDataLoader(posts_csv, comments_csv))
+
+    print(f"원글 {len(loader.posts_data)}개, 댓글 {len(loader.comments_data)}개\n")
+    print("[로드]")
+    _common.print_row("로드 시간", legacy_load_ms, loader_load_ms, "ms")
+    _common.print_row("유지 메모리", legacy_mem / 1024 / 1024, loader_mem / 1024 / 1024, "MB")
+    _common.print_row("최대 메모리", legacy_peak / 1024 / 1024, loader_peak / 1024 / 1024, "MB")
+
+    client_names = loader.get_client_names()
+    sample_client = client_names[len(client_names) // 2] if client_names else None
+    queries = list(QUERIES)
+    if sample_client:
+        queries.append(('고객사 필터', sample_client, None))
+        queries.append(('고객사 + 날짜 필터', sample_client, 'this_month'))
+
+    print("\n[요청당 지연 시간]")
+    for label, client_name, date_filter in queries:
+        before = _common.time_per_call(
+            lambda: _legacy.get_posts_text(legacy_posts, 30, client_name, date_filter))
+        after = _common.time_per_call(
+            lambda: loader.get_posts_text(30, client_name, date_filter))
+        _common.print_row(f"get_posts_text {label}", before, after, "ms")
+
+    before = _common.time_per_call(lambda: _legacy.get_client_names(legacy_posts))
+    after = _common.time_per_call(loader.get_client_names)
+    _common.print_row("get_client_names", before, after, "ms")
+
+    if sample_client:
+        before = _common.time_per_call(
+            lambda: _legacy.get_responsible_person(legacy_posts, sample_client))
+        after = _common.time_per_call(
+            lambda: loader.get_responsible_person(sample_client))
+        _common.print_row("get_responsible_person", before, after, "ms")
+
+    # 컨텍스트에 들어가는 30개 게시글의 댓글 조회
+    post_ids = [post.id for post in loader.posts_data[:30]]
+    before = _common.time_per_call(
+        lambda: [_legacy.get_comments_for_post(legacy_comments, post_id) for post_id in post_ids],
+        repeat=5)
+    after = _common.time_per_call(lambda: loader.get_comments_for_posts(post_ids))
+    _common.print_row("댓글 조회 (게시글 30개)", before, after, "ms")
+
+
+if __name__ == '__main__':
+    main()
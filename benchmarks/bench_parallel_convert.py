@@ -0,0 +1,96 @@
+"""
+CSV 병렬 변환 확장성 측정
+합성 CSV(bench_convert_json과 같은 생성기, 기본 원글 20만 행 + 댓글 20만 행)를 프로세스 1, 2, 4, 8개로
+변환해 CSV 변환 단계(행 경계 분할 + HTML 정리/날짜 파싱)와 번들 생성 전체의 소요 시간을 비교하고,
+번들 파일이 프로세스 1개로 만든 것과 바이트 단위로 같은지 확인합니다.
+구간 크기(CHUNK_BYTES)를 작게 잡아 구간 경계가 여러 줄 따옴표 필드 안에 자주 떨어지게 하고,
+그런 경계 수(행 경계로 밀린 수)도 함께 출력합니다.
+
+사용법:
+    python benchmarks/bench_parallel_convert.py [원글 행 수]
+"""
+import contextlib
+import filecmp
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import _common
+import convert_csv_to_json as converter
+from bench_convert_json import write_synthetic_csv
+
+DEFAULT_ROWS = 200_000
+WORKERS = [1, 2, 4, 8]
+CHUNK_BYTES = 64 * 1024
+
+
+def convert_only(posts_csv, comments_csv, workers):
+    """번들 생성 없이 CSV 변환 단계만 실행한 시간 (초)"""
+    started = time.perf_counter()
+    if workers == 1:
+        for post in converter.read_posts(posts_csv):
+            converter._post_record(post)
+        for comment in converter.read_comments(comments_csv):
+            converter._comment_record(comment)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for _ in converter.convert_records_parallel(posts_csv, 'post', executor, workers, CHUNK_BYTES):
+                pass
+            for _ in converter.convert_records_parallel(comments_csv, 'comment', executor, workers, CHUNK_BYTES):
+                pass
+    return time.perf_counter() - started
+
+
+def quoted_boundaries(input_file):
+    """(구간 수, 줄바꿈 기준 경계가 따옴표 필드 안이라 다음 행 경계로 밀린 구간 수)"""
+    offsets = converter.record_offsets(input_file, CHUNK_BYTES)
+    with open(input_file, 'rb') as f:
+        data = f.read()
+    shifted = sum(1 for prev, cur in zip(offsets, offsets[1:-1])
+                  if data.find(b'\n', prev + CHUNK_BYTES) + 1 != cur)
+    return len(offsets) - 1, shifted
+
+
+def bundle_files(bundle_dir):
+    return sorted(os.path.relpath(os.path.join(root, name), bundle_dir)
+                  for root, _, names in os.walk(bundle_dir) for name in names)
+
+
+def same_bundle(a, b):
+    files = bundle_files(a)
+    return files == bundle_files(b) and all(
+        filecmp.cmp(os.path.join(a, name), os.path.join(b, name), shallow=False) for name in files)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    _common.print_header(f"CSV 병렬 변환 (합성 원글 {rows:,}행 + 댓글 {rows:,}행, CPU {os.cpu_count()}개)")
+    with tempfile.TemporaryDirectory() as tmp:
+        posts_csv = os.path.join(tmp, 'posts.csv')
+        comments_csv = os.path.join(tmp, 'comments.csv')
+        write_synthetic_csv(posts_csv, comments_csv, rows)
+        for label, path in (("원글", posts_csv), ("댓글", comments_csv)):
+            chunks, shifted = quoted_boundaries(path)
+            print(f"{label} CSV: {CHUNK_BYTES // 1024}KB 구간 {chunks}개, 따옴표 필드 안에 떨어진 경계 {shifted}개")
+
+        base = None
+        for workers in WORKERS:
+            convert_s = convert_only(posts_csv, comments_csv, workers)
+            bundle_dir = os.path.join(tmp, f'bundle_{workers}')
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                converter.build_bundle(posts_csv, comments_csv, bundle_dir, workers=workers, chunk_bytes=CHUNK_BYTES)
+            bundle_s = time.perf_counter() - started
+            if base is None:
+                base = (convert_s, bundle_s, bundle_dir)
+            same = same_bundle(base[2], bundle_dir)
+            print(f"프로세스 {workers}개: CSV 변환 {convert_s:6.2f}s (x{base[0] / convert_s:.1f}) | "
+                  f"번들 전체 {bundle_s:6.2f}s (x{base[1] / bundle_s:.1f}) | "
+                  f"1개와 {'동일' if same else '다름'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+OpenAI 호출 재시도 / 회로 차단 / 같은 요청 합치기 확인
+오류를 섞어 응답하는 로컬 가짜 OpenAI 서버를 상대로 다음을 비교합니다.
+- 429 오류 비율별 재시도 없음 / 재시도 사용 시 성공률과 지연
+- 서버 장애(연속 503) 동안 회로 차단 유무에 따른 서버 호출 수
+- 동시에 들어온 같은 질문 N개의 서버 호출 수 (동기 / 비동기), 처음 요청이 취소되어도 나머지가 응답을 받는지
+실제 OpenAI API는 호출하지 않습니다.
+
+사용법:
+    python benchmarks/bench_resilience.py [모델 응답 지연(초)]
+"""
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import _common
+from async_chatbot import AsyncChatBot
+from chatbot import ChatBot
+from fake_openai_server import FakeOpenAIServer
+from resilience import CircuitBreaker, ResilientCaller, RetryPolicy
+
+FAILURE_RATES = [0.1, 0.3]
+REQUESTS = 200
+USERS = 10
+ERROR_PREFIX = "죄송합니다."
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+def make_chatbot(server, max_attempts, failure_threshold=1000, reset_timeout=30.0, chatbot_class=ChatBot):
+    resilience = ResilientCaller(
+        RetryPolicy(max_attempts=max_attempts, base_delay=0.05, max_delay=1.0),
+        CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+    )
+    return chatbot_class('test-key', base_url=server.base_url, resilience=resilience)
+
+
+def run_requests(chatbot, count, users):
+    """서로 다른 질문 count개를 users개 스레드로 호출, (성공 수, 지연 목록) 반환"""
+    def ask(i):
+        started = time.perf_counter()
+        response = chatbot.get_response(f"블루타이거 오류 문의 {i}", record_history=False)
+        return not response.startswith(ERROR_PREFIX), time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        results = list(pool.map(ask, range(count)))
+    return sum(ok for ok, _ in results), [latency for _, latency in results]
+
+
+def bench_retry(model_delay):
+    print(f"\n[429 오류 섞인 서버, 요청 {REQUESTS}건, 동시 {USERS}명]")
+    for rate in FAILURE_RATES:
+        for label, max_attempts in (("재시도 없음", 1), ("재시도 (최대 4회)", 4)):
+            with FakeOpenAIServer(first_token_delay=model_delay, token_delay=0, failure_rate=rate,
+                                  failure_status=429, seed=1) as server:
+                chatbot = make_chatbot(server, max_attempts)
+                succeeded, latencies = run_requests(chatbot, REQUESTS, USERS)
+                stats = chatbot.resilience.stats()
+                print(f"  오류 {rate:.0%} {label:14s}: 성공 {succeeded / REQUESTS:6.1%} | "
+                      f"p50 {percentile(latencies, 50) * 1000:6.1f}ms | p99 {percentile(latencies, 99) * 1000:6.1f}ms | "
+                      f"서버 호출 {server.requests}건 (재시도 {stats['retries']}건)")
+
+
+def bench_circuit(model_delay):
+    print("\n[서버 장애(연속 503) 중 질문 50건, 이후 복구]")
+    for label, threshold in (("회로 차단 없음", 1000), ("회로 차단 (5회, 0.5s)", 5)):
+        with FakeOpenAIServer(first_token_delay=model_delay, token_delay=0) as server:
+            server.fail_next(10000, status=503)
+            chatbot = make_chatbot(server, max_attempts=3, failure_threshold=threshold, reset_timeout=0.5)
+            started = time.perf_counter()
+            run_requests(chatbot, 50, 1)
+            outage_elapsed = time.perf_counter() - started
+            outage_requests = server.requests
+
+            # 서버 복구 후 reset_timeout이 지나면 시험 호출 1건으로 다시 정상 상태
+            with server._lock:
+                server._fail_next.clear()
+            time.sleep(0.6)
+            succeeded, _ = run_requests(chatbot, 10, 1)
+            stats = chatbot.resilience.stats()
+            print(f"  {label:20s}: 장애 중 서버 호출 {outage_requests:3d}건, {outage_elapsed:5.2f}s | "
+                  f"차단 {stats['circuit_rejected']}건 | 복구 후 성공 {succeeded}/10 ({stats['circuit_state']})")
+
+
+def bench_coalescing(model_delay, concurrent=50):
+    print(f"\n[같은 질문 {concurrent}건 동시 요청]")
+    with FakeOpenAIServer(first_token_delay=model_delay, token_delay=0) as server:
+        chatbot = make_chatbot(server, max_attempts=3)
+        barrier = threading.Barrier(concurrent)
+
+        def ask(_):
+            barrier.wait()
+            return chatbot.get_response("블루타이거 최근 문제 알려줘", record_history=False)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrent) as pool:
+            responses = list(pool.map(ask, range(concurrent)))
+        elapsed = time.perf_counter() - started
+        print(f"  ChatBot      : 서버 호출 {server.requests}건 | 합쳐진 요청 {chatbot.resilience.coalesced}건 | "
+              f"같은 응답 {len(set(responses)) == 1} | {elapsed * 1000:.0f}ms")
+
+    async def run_async():
+        with FakeOpenAIServer(first_token_delay=model_delay, token_delay=0) as server:
+            chatbot = make_chatbot(server, max_attempts=3, chatbot_class=AsyncChatBot)
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(
+                chatbot.get_response_async("블루타이거 최근 문제 알려줘", record_history=False)
+                for _ in range(concurrent)))
+            elapsed = time.perf_counter() - started
+            await chatbot.aclose()
+            print(f"  AsyncChatBot : 서버 호출 {server.requests}건 | 합쳐진 요청 {chatbot.resilience.coalesced}건 | "
+                  f"같은 응답 {len(set(responses)) == 1} | {elapsed * 1000:.0f}ms")
+
+    async def run_cancel_leader():
+        # 처음 요청(합친 호출을 시작한 쪽)을 취소해도 같은 키를 기다리던 요청은 결과를 받아야 함
+        caller = ResilientCaller(RetryPolicy(max_attempts=1))
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(model_delay)
+            return 'ok'
+
+        leader = asyncio.ensure_future(caller.call_async(fn, key='same'))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(caller.call_async(fn, key='same')) for _ in range(concurrent - 1)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.gather(*followers, return_exceptions=True)
+        print(f"  처음 요청 취소: 호출 {calls}건 | 나머지 {len(followers)}건 중 성공 "
+              f"{sum(result == 'ok' for result in results)}건 | 처음 요청 취소됨 {leader.cancelled()}")
+
+    asyncio.run(run_async())
+    asyncio.run(run_cancel_leader())
+
+
+def main():
+    model_delay = float(sys.argv[1]) if len(sys.argv) > 1 else 0.05
+    _common.print_header(f"OpenAI 호출 안정화 (모델 응답 {model_delay}s)")
+    bench_retry(model_delay)
+    bench_circuit(model_delay)
+    bench_coalescing(model_delay)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+응답 캐시 동작 확인 / 적중률 측정
+반복 질문이 많은 문의 패턴(Zipf 분포)을 흉내 내어 캐시 크기별 적중률과
+LRU/TTL/무효화 동작을 확인합니다. GPT 호출은 하지 않습니다.
+
+사용법:
+    python benchmarks/bench_response_cache.py [요청 수]
+"""
+import random
+import sys
+
+import _common
+from response_cache import ResponseCache, make_cache_key, normalize_message
+
+QUESTIONS = [
+    "블루타이거 최근 문제", "담당자 누구", "엔잡특공대 담당자 누구야?",
+    "이번 달 장애 이슈 정리해줘", "오늘 등록된 게시글 알려줘", "스터디파이터 오류",
+]
+# 실제 답변 길이와 비슷한 응답 (약 1.5KB)
+FAKE_RESPONSE = "게시판 정보에 따르면 박선미과장님이 답변을 해주었습니다. " * 40
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def check_behaviour():
+    """정규화, TTL, LRU, 무효화 동작 확인"""
+    clock = FakeClock()
+    cache = ResponseCache(max_bytes=10_000, ttl_seconds=60, clock=clock)
+    key = make_cache_key("블루타이거  최근 문제?", "*블루타이거", None, "ctx")
+    assert key == make_cache_key("블루타이거 최근 문제", "*블루타이거", None, "ctx")
+    assert key != make_cache_key("블루타이거 최근 문제", "*블루타이거", None, "ctx2")
+    assert normalize_message("ＡＢＣ  담당자 누구?!") == "abc 담당자 누구"
+
+    cache.put(key, "응답")
+    assert cache.get(key) == "응답"
+    clock.now = 61
+    assert cache.get(key) is None, "TTL 만료 실패"
+
+    for i in range(20):
+        cache.put(make_cache_key(f"질문 {i}", None, None, ""), FAKE_RESPONSE[:1000])
+    stats = cache.stats()
+    assert stats['bytes'] <= cache.max_bytes and stats['evictions'] > 0, stats
+    assert cache.get(make_cache_key("질문 19", None, None, "")) is not None
+    assert cache.get(make_cache_key("질문 0", None, None, "")) is None, "LRU 제거 실패"
+
+    cache.clear()
+    assert cache.stats()['entries'] == 0 and cache.stats()['bytes'] == 0
+    print("동작 확인: 정규화 / TTL / LRU / 크기 상한 / 무효화 정상")
+
+
+def simulate(requests, max_bytes, seed=7):
+    """Zipf 분포 질문 흐름에서 적중률 측정 (요청 간격 1초, TTL 10분)"""
+    rng = random.Random(seed)
+    clients = [None] + [f"고객사{i}" for i in range(200)]
+    weights = [1 / (rank + 1) for rank in range(len(clients))]
+    clock = FakeClock()
+    cache = ResponseCache(max_bytes=max_bytes, ttl_seconds=600, clock=clock)
+    for _ in range(requests):
+        clock.now += 1
+        client = rng.choices(clients, weights)[0]
+        question = rng.choice(QUESTIONS)
+        key = make_cache_key(question, client, None, client or "")
+        if cache.get(key) is None:
+            cache.put(key, FAKE_RESPONSE)
+    return cache.stats()
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    _common.print_header("응답 캐시 동작 / 적중률")
+    check_behaviour()
+
+    print(f"\n[Zipf 분포 질문 {requests}개, TTL 600초]")
+    for max_bytes in (64 * 1024, 512 * 1024, 8 * 1024 * 1024):
+        stats = simulate(requests, max_bytes)
+        print(f"  상한 {max_bytes // 1024:5d}KB: 적중률 {stats['hit_rate'] * 100:5.1f}% "
+              f"(GPT 호출 {stats['misses']}회, 절약 {stats['hits']}회, "
+              f"항목 {stats['entries']}개 / {stats['bytes'] // 1024}KB, 제거 {stats['evictions']}회)")
+
+    key = make_cache_key("블루타이거 최근 문제", "*블루타이거", None, FAKE_RESPONSE * 2)
+    cache = ResponseCache()
+    cache.put(key, FAKE_RESPONSE)
+    print(f"\n키 생성 + 조회 시간: "
+          f"{_common.time_per_call(lambda: cache.get(make_cache_key('블루타이거 최근 문제', '*블루타이거', None, FAKE_RESPONSE * 2)), repeat=2000):.4f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""
+바이너리 스냅샷 확인 / 측정
+snapshot.py로 만든 스냅샷을 불러온 로더가 CSV를 파싱한 로더와 같은 결과를 내는지 확인하고
+(게시판 컨텍스트, 담당자, 고객사 매칭, 댓글, 스냅샷 이후 추가된 행 병합),
+새 프로세스에서 CSV 파싱 / 스냅샷 로드의 시작 시간과 메모리(RSS)를 비교합니다.
+워커 여러 개가 각자 로드한 경우의 PSS(공유 페이지를 나눠 센 메모리) 합계도 비교합니다.
+원본 CSV가 없으면 (또는 'sample'을 주면) 합성 CSV(_common.write_sample_csv)로 실행합니다.
+
+사용법:
+    python benchmarks/bench_snapshot.py [원글 CSV | sample] [댓글 CSV]
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import _common
+from csv_loader import CSVDataLoader, _complete_length
+from snapshot import load_snapshot, write_snapshot
+
+WORKERS = 4
+QUERIES = [
+    {},
+    {'date_filter': 'last_month'},
+    {'date_filter': 'recent'},
+]
+
+# 새 프로세스에서 로드 후 시간/메모리를 JSON 한 줄로 출력하고, 표준 입력이 닫힐 때까지 대기
+WORKER_CODE = r'''
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+mode, posts_csv, comments_csv, snapshot_path = sys.argv[2:6]
+
+def status_kb(field):
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+
+before = status_kb('VmRSS')
+started = time.perf_counter()
+if mode == 'csv':
+    from csv_loader import CSVDataLoader
+    loader = CSVDataLoader(posts_csv, comments_csv)
+else:
+    from snapshot import load_snapshot
+    loader = load_snapshot(snapshot_path, posts_csv, comments_csv)
+load_ms = (time.perf_counter() - started) * 1000
+loader.get_posts_text(limit=30, token_budget=6000, comments_per_post=2)
+print(json.dumps({'load_ms': load_ms, 'rss_kb': status_kb('VmRSS') - before,
+                  'posts': len(loader.posts_data)}), flush=True)
+sys.stdin.read()
+'''
+
+
+def smaps_pss_kb(pid):
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Pss:'):
+                return int(line.split()[1])
+    return 0
+
+
+def run_workers(mode, count, posts_csv, comments_csv, snapshot_path):
+    """워커 count개를 동시에 띄워 각자 로드시킨 뒤 (결과 목록, PSS 합계 KB) 반환"""
+    procs = [subprocess.Popen([sys.executable, '-c', WORKER_CODE, _common.BASE_DIR, mode,
+                               posts_csv, comments_csv, snapshot_path],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+             for _ in range(count)]
+    try:
+        results = [json.loads(proc.stdout.readline()) for proc in procs]
+        pss = sum(smaps_pss_kb(proc.pid) for proc in procs)
+    finally:
+        for proc in procs:
+            proc.stdin.close()
+            proc.wait()
+    return results, pss
+
+
+def context_outputs(loader, clients):
+    outputs = [loader.get_posts_text(limit=30, token_budget=6000, comments_per_post=2, **query)
+               for query in QUERIES]
+    for client in clients:
+        outputs.append(loader.get_posts_text(limit=30, client_name=client, token_budget=6000,
+                                             comments_per_post=2))
+        outputs.append(loader.get_posts_text(limit=10, client_name=client, date_filter='last_month'))
+        outputs.append(loader.get_responsible_person(client))
+        outputs.append(loader.match_client_name(f"{client} 최근 문제 알려줘"))
+    return outputs
+
+
+def check_equivalence(csv_loader, snap, label):
+    clients = csv_loader.get_client_names()[:40]
+    diffs = []
+    if context_outputs(csv_loader, clients) != context_outputs(snap, clients):
+        diffs.append('context')
+    if [p.to_dict() for p in csv_loader.posts_data] != [p.to_dict() for p in snap.posts_data]:
+        diffs.append('posts_data')
+    if [c.to_dict() for c in csv_loader.comments_data] != [c.to_dict() for c in snap.comments_data]:
+        diffs.append('comments_data')
+    by_post = {k: [c.id for c in v] for k, v in csv_loader._comments_by_post.items()}
+    if by_post != {k: [c.id for c in v] for k, v in snap._comments_by_post.items()}:
+        diffs.append('_comments_by_post')
+    if csv_loader.get_client_names() != snap.get_client_names():
+        diffs.append('client_names')
+    print(f"  {label:28s}: 원글 {len(snap.posts_data)}개, 댓글 {len(snap.comments_data)}개, "
+          f"CSV 로드와 {'동일' if not diffs else '다름: ' + str(diffs)}")
+
+
+def check_correctness(posts_src, comments_src, tmp):
+    posts_csv = os.path.join(tmp, 'posts.csv')
+    comments_csv = os.path.join(tmp, 'comments.csv')
+    snapshot_path = os.path.join(tmp, 'check.bin')
+    with open(posts_src, 'rb') as f:
+        posts_bytes = f.read()
+    shutil.copy(comments_src, comments_csv)
+
+    # 앞 80%로 스냅샷을 만든 뒤 나머지 행을 추가: refresh()가 추가분만 병합해야 함
+    cut = _complete_length(posts_bytes[:int(len(posts_bytes) * 0.8)])
+    with open(posts_csv, 'wb') as f:
+        f.write(posts_bytes[:cut])
+    write_snapshot(CSVDataLoader(posts_csv, comments_csv), snapshot_path)
+
+    snap = load_snapshot(snapshot_path, posts_csv, comments_csv)
+    check_equivalence(CSVDataLoader(posts_csv, comments_csv), snap, "스냅샷 로드")
+
+    with open(posts_csv, 'ab') as f:
+        f.write(posts_bytes[cut:])
+    refreshed = snap.refresh()
+    check_equivalence(CSVDataLoader(posts_csv, comments_csv), refreshed,
+                      f"이후 추가된 행 병합 ({refreshed.load_mode})")
+    print(f"  변경 없음                   : {refreshed.refresh().load_mode}")
+
+
+def bench_startup(posts_csv, comments_csv, tmp):
+    snapshot_path = os.path.join(tmp, 'data_snapshot.bin')
+    started = time.perf_counter()
+    loader = CSVDataLoader(posts_csv, comments_csv)
+    size = write_snapshot(loader, snapshot_path)
+    build_ms = (time.perf_counter() - started) * 1000
+    del loader
+    csv_mb = (os.path.getsize(posts_csv) + os.path.getsize(comments_csv)) / 1024 / 1024
+    print(f"\n[스냅샷 생성] CSV {csv_mb:.1f}MB -> 스냅샷 {size / 1024 / 1024:.1f}MB ({build_ms:.0f}ms)")
+
+    print("\n[새 프로세스에서 로드 + 첫 조회]")
+    single = {}
+    for mode in ('csv', 'snapshot'):
+        (result,), _ = run_workers(mode, 1, posts_csv, comments_csv, snapshot_path)
+        single[mode] = result
+    _common.print_row("로드 시간 (CSV -> 스냅샷)", single['csv']['load_ms'], single['snapshot']['load_ms'], "ms")
+    _common.print_row("RSS 증가 (CSV -> 스냅샷)", single['csv']['rss_kb'] / 1024,
+                      single['snapshot']['rss_kb'] / 1024, "MB")
+
+    print(f"\n[워커 {WORKERS}개가 각자 로드 (PSS 합계)]")
+    _, csv_pss = run_workers('csv', WORKERS, posts_csv, comments_csv, snapshot_path)
+    _, snap_pss = run_workers('snapshot', WORKERS, posts_csv, comments_csv, snapshot_path)
+    _common.print_row("PSS 합계 (CSV -> 스냅샷)", csv_pss / 1024, snap_pss / 1024, "MB")
+
+
+def main():
+    _common.print_header("바이너리 스냅샷")
+    with tempfile.TemporaryDirectory() as tmp:
+        posts_csv, comments_csv = _common.csv_paths_or_sample(tmp)
+        check_correctness(posts_csv, comments_csv, tmp)
+        bench_startup(posts_csv, comments_csv, tmp)
+
+
+if __name__ == '__main__':
+    main()
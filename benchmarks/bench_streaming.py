@@ -0,0 +1,81 @@
+"""
+스트리밍 응답 첫 토큰 시간(TTFB) / 전체 시간 측정
+로컬 가짜 OpenAI 서버를 띄우고 ChatBot의 일반 호출과 stream=True 호출을 비교합니다.
+서버가 재시도 횟수만큼 계속 오류로 응답할 때 stream=True 호출이 오류 문구를 응답 조각으로 내보내지 않고
+예외를 올리는지(/api/chat/stream의 event: error)도 확인합니다.
+실제 OpenAI API는 호출하지 않습니다.
+
+사용법:
+    python benchmarks/bench_streaming.py [첫 토큰 지연(초)] [토큰 간 지연(초)] [반복 횟수]
+"""
+import statistics
+import sys
+import time
+
+import _common
+from chatbot import ChatBot
+from fake_openai_server import FakeOpenAIServer
+
+
+def measure_blocking(chatbot):
+    """일반 호출: 전체 응답이 와야 첫 글자를 보여줄 수 있음"""
+    started = time.perf_counter()
+    text = chatbot.get_response("블루타이거 최근 문제", "", record_history=False)
+    elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, elapsed, text
+
+
+def measure_stream(chatbot):
+    """stream=True 호출: 첫 조각 도착 시간과 전체 시간을 따로 측정"""
+    started = time.perf_counter()
+    first = None
+    parts = []
+    for delta in chatbot.get_response("블루타이거 최근 문제", "", record_history=False, stream=True):
+        if first is None:
+            first = time.perf_counter()
+        parts.append(delta)
+    finished = time.perf_counter()
+    return (first - started) * 1000, (finished - started) * 1000, ''.join(parts)
+
+
+def measure_stream_error(chatbot, server):
+    """연결 단계 오류가 재시도 후에도 계속되면 (받은 응답 조각, 예외) 반환"""
+    server.fail_next(chatbot.resilience.policy.max_attempts, status=500)
+    parts = []
+    try:
+        for delta in chatbot.get_response("블루타이거 최근 문제", "", record_history=False, stream=True):
+            parts.append(delta)
+    except Exception as e:
+        return parts, e
+    return parts, None
+
+
+def main():
+    first_token_delay = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    token_delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    _common.print_header(f"스트리밍 TTFB (첫 토큰 {first_token_delay}s, 토큰 간 {token_delay}s)")
+
+    with FakeOpenAIServer(first_token_delay=first_token_delay, token_delay=token_delay) as server:
+        chatbot = ChatBot('test-key', base_url=server.base_url)
+
+        results = {}
+        for label, measure in (('일반 호출', measure_blocking), ('stream=True', measure_stream)):
+            samples = [measure(chatbot) for _ in range(repeat)]
+            assert all(text == server.reply for _, _, text in samples), f"{label}: 응답 불일치"
+            results[label] = samples
+            ttfb = statistics.median(sample[0] for sample in samples)
+            total = statistics.median(sample[1] for sample in samples)
+            print(f"{label:12s} 첫 글자 표시 {ttfb:7.1f}ms | 전체 {total:7.1f}ms (중앙값, {repeat}회)")
+
+        parts, error = measure_stream_error(chatbot, server)
+        print(f"API 오류 시 stream=True: 응답 조각 {len(parts)}개, "
+              f"{'예외 ' + type(error).__name__ if error else '예외 없음'}")
+
+    before = statistics.median(sample[0] for sample in results['일반 호출'])
+    after = statistics.median(sample[0] for sample in results['stream=True'])
+    print(f"\n첫 글자 표시까지: {before:.1f}ms -> {after:.1f}ms ({before / after:.1f}배 빠름)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,377 @@
+"""
+로컬 가짜 사내 게시판 서버
+board_crawler.py가 가정하는 구조(로그인 폼, 왼쪽 메뉴 #gs-left, 체크박스가 있는 목록 행, 본문/덧글 div)를
+흉내 내어 실제 게시판 없이 크롤러의 속도/메모리를 측정합니다.
+로그인하지 않은 요청은 로그인 페이지로 보내고, 페이지마다 처리 지연과 새 연결마다 연결 수립 지연을 줄 수 있습니다.
+
+사용법:
+    python benchmarks/fake_board_server.py [포트] [게시판 수] [게시판당 게시글 수] [페이지 지연(초)]
+"""
+import base64
+import html
+import random
+import secrets
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+EMAIL = 'bench@example.com'
+PASSWORD = 'bench-password'
+SESSION_COOKIE = 'JSESSIONID'
+
+AUTHORS = ['김민수', '박선미', '이지은', '최현우', '정다은', '한상훈', '윤서연', '장민호']
+TOPICS = ['로그인 오류', '정산 관련', '수강 신청 문의', '결제 실패', '동영상 재생 문제', '회원 탈퇴 요청',
+          '쿠폰 적용 오류', '수료증 발급']
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 512
+    daemon_threads = True
+
+
+def board_list_path(pid):
+    m_param = base64.b64encode(f"project{pid}-link".encode()).decode()
+    return f"/board/post_list.jsp?m={m_param}&pid={pid}"
+
+
+def make_boards(boards, posts_per_board, comments_per_post, seed=0):
+    """{pid: {'name', 'posts': [게시글, ...]}} (게시글은 최신순)"""
+    rng = random.Random(seed)
+    start = datetime(2025, 11, 25, 18, 0)
+    result = {}
+    idx = 100000
+    for b in range(boards):
+        pid = 1000 + b
+        posts = []
+        for p in range(posts_per_board):
+            idx += 1
+            written = start - timedelta(hours=p * 7 + b)
+            comments = []
+            for c in range(rng.randint(0, comments_per_post * 2)):
+                comments.append({
+                    'id': idx * 100 + c,
+                    'author': rng.choice(AUTHORS),
+                    'date': (written + timedelta(minutes=30 * (c + 1))).strftime('%Y-%m-%d %H:%M:%S'),
+                    'text': f"{rng.choice(TOPICS)} 건 확인했습니다. 조치 내용 {c + 1}번을 참고해 주세요.",
+                })
+            posts.append({
+                'idx': idx,
+                'title': f"{rng.choice(TOPICS)} {idx}",
+                'author': rng.choice(AUTHORS),
+                'date': written.strftime('%Y-%m-%d'),
+                'time': written.strftime('%H:%M'),
+                'content': f"{rng.choice(TOPICS)} 문의드립니다. " * rng.randint(3, 30),
+                'comments': comments,
+            })
+        result[pid] = {'name': f"고객사{b + 1:02d}", 'posts': posts}
+    return result
+
+
+class FakeBoardServer:
+    """
+    스레드에서 동작하는 가짜 게시판 서버
+
+    boards / posts_per_board / comments_per_post: 생성할 게시판 데이터 크기
+    page_delay: 페이지마다 응답 전 지연 (게시판 서버 처리 시간)
+    connect_delay: 새 연결마다 첫 응답 전 지연 (원격 서버와의 TCP/TLS 연결 수립 시간)
+    page_size: 목록 페이지당 게시글 수 (None이면 한 페이지에 전부, 아니면 &page=N으로 나눔)
+    """
+
+    def __init__(self, port=0, boards=4, posts_per_board=50, comments_per_post=3, page_delay=0.0,
+                 connect_delay=0.0, seed=0, page_size=None):
+        self.boards = make_boards(boards, posts_per_board, comments_per_post, seed)
+        self.page_size = page_size
+        self._last_idx = max((post['idx'] for board in self.boards.values() for post in board['posts']),
+                             default=100000)
+        self.page_delay = page_delay
+        self.connect_delay = connect_delay
+        self.pages = 0
+        self.connections = 0
+        self.logins = 0
+        self.inflight = 0
+        self.max_inflight = 0
+        self.page_times = []
+        self._sessions = set()
+        self._lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', port), self._make_handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def board_url(self, pid):
+        return self.base_url.rstrip('/') + board_list_path(pid)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset_stats(self):
+        with self._lock:
+            self.pages = 0
+            self.connections = 0
+            self.logins = 0
+            self.max_inflight = 0
+            self.page_times = []
+
+    def _count(self, attr):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def _page_started(self):
+        with self._lock:
+            self.pages += 1
+            self.page_times.append(time.monotonic())
+            self.inflight += 1
+            self.max_inflight = max(self.max_inflight, self.inflight)
+
+    def _page_finished(self):
+        with self._lock:
+            self.inflight -= 1
+
+    def max_pages_per_second(self):
+        """1초 구간에 시작된 페이지 요청 수의 최댓값"""
+        times = sorted(self.page_times)
+        best, first = 0, 0
+        for last, at in enumerate(times):
+            while at - times[first] >= 1.0:
+                first += 1
+            best = max(best, last - first + 1)
+        return best
+
+    # ---- 게시판 활동 ----
+
+    def add_post(self, pid, title=None):
+        """게시판 맨 위에 새 게시글 추가 후 반환"""
+        with self._lock:
+            self._last_idx += 1
+            idx = self._last_idx
+        now = datetime(2025, 11, 26, 9, 0) + timedelta(minutes=idx % 600)
+        post = {
+            'idx': idx,
+            'title': title or f"{TOPICS[idx % len(TOPICS)]} {idx}",
+            'author': AUTHORS[idx % len(AUTHORS)],
+            'date': now.strftime('%Y-%m-%d'),
+            'time': now.strftime('%H:%M'),
+            'content': f"{TOPICS[idx % len(TOPICS)]} 새로 문의드립니다. " * 5,
+            'comments': [],
+        }
+        self.boards[pid]['posts'].insert(0, post)
+        return post
+
+    def add_comment(self, pid, idx, text=None):
+        """게시글에 덧글 추가 (목록의 +N개의 추가 글 값이 바뀜)"""
+        post = next(p for p in self.boards[pid]['posts'] if p['idx'] == idx)
+        number = len(post['comments'])
+        comment = {
+            'id': idx * 100 + 50 + number,
+            'author': AUTHORS[number % len(AUTHORS)],
+            'date': f"{post['date']} 23:{number:02d}:00",
+            'text': text or f"추가 확인 결과 {number + 1}번째 답변입니다.",
+        }
+        post['comments'].append(comment)
+        return comment
+
+    # ---- 페이지 ----
+
+    def login_page(self, message=''):
+        return f"""<html><head><title>로그인</title></head><body>
+<form name="form1" method="post" action="/member/login_ok.jsp">
+<input type="hidden" name="returl" value="/">
+<p>{html.escape(message)}</p>
+<input type="text" name="id" value="">
+<input type="password" name="passwd" value="">
+<input type="submit" class="btn" value="로그인">
+</form></body></html>"""
+
+    def main_page(self):
+        links = ''.join(f'<li><a href="{board_list_path(pid)}">{html.escape(board["name"])}</a></li>\n'
+                        for pid, board in self.boards.items())
+        return f"""<html><head><title>PPM</title></head><body>
+<div id="gs-left"><ul>
+{links}</ul></div>
+<div id="gs-content">프로젝트를 선택하세요.</div>
+</body></html>"""
+
+    def list_page(self, pid, page=1):
+        board = self.boards[pid]
+        posts = board['posts']
+        paging = ''
+        if self.page_size:
+            pages = max(1, -(-len(posts) // self.page_size))
+            posts = posts[(page - 1) * self.page_size:page * self.page_size]
+            paging = '<div class="paging">' + ''.join(
+                f'<a href="{board_list_path(pid)}&page={n}">{n}</a>' if n != page else f'<strong>{n}</strong>'
+                for n in range(1, pages + 1)) + '</div>'
+        rows = []
+        for post in posts:
+            extra = f' <span class="cmt">+{len(post["comments"])}개의 추가 글</span>' if post['comments'] else ''
+            rows.append(f"""<tr>
+<td><input type="checkbox" name="idx" value="{post['idx']}"></td>
+<td>{post['idx']}</td>
+<td class="subject"><a class="nr10" href="post_view.jsp?pid={pid}&idx={post['idx']}">{html.escape(post['title'])}{extra}</a></td>
+<td>{post['author']}</td>
+<td>{post['date']} <span class="time01">{post['time']}</span></td>
+<td>{len(post['content'])}</td>
+</tr>""")
+        return f"""<html><head><meta charset="utf-8"><title>{html.escape(board['name'])}</title></head><body>
+<div id="gs-left"><ul><li><a href="{board_list_path(pid)}">{html.escape(board['name'])}</a></li></ul></div>
+<table class="list"><thead><tr><th></th><th>번호</th><th>제목</th><th>작성자</th><th>작성일</th><th>조회</th></tr></thead>
+<tbody>
+{''.join(rows)}
+</tbody></table>{paging}</body></html>"""
+
+    def view_page(self, pid, idx):
+        post = next((p for p in self.boards[pid]['posts'] if p['idx'] == idx), None)
+        if post is None:
+            return None
+        comments = ''.join(f"""<div class="comment_head"><table><tr>
+<td><strong>&nbsp;{c['author']}</strong></td>
+<td><div class="cont_date">{c['date']} 작성됨</div></td>
+</tr></table></div>
+<div class="conts" id="comment{c['id']}">{html.escape(c['text'])}</div>
+""" for c in post['comments'])
+        return f"""<html><head><meta charset="utf-8"><title>{html.escape(post['title'])}</title></head><body>
+<h2>{html.escape(post['title'])}</h2>
+<div class="conts markdown-body" id="post{post['idx']}">{html.escape(post['content'])}</div>
+<div class="comments">
+{comments}</div></body></html>"""
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # 헤더와 본문을 따로 보내므로 keep-alive 연결에서 지연 ACK 대기가 생기지 않도록
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def setup(self):
+                super().setup()
+                server._count('connections')
+                if server.connect_delay:
+                    time.sleep(server.connect_delay)
+
+            def _logged_in(self):
+                cookies = self.headers.get('Cookie', '')
+                for part in cookies.split(';'):
+                    name, _, value = part.strip().partition('=')
+                    if name == SESSION_COOKIE and value in server._sessions:
+                        return True
+                return False
+
+            def _end_headers(self):
+                # 클라이언트가 Connection: close로 요청하면 응답에도 알려 연결을 재사용하지 않게 함
+                if self.close_connection:
+                    self.send_header('Connection', 'close')
+                self.end_headers()
+
+            def _send_html(self, body, status=200, headers=()):
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self._end_headers()
+                self.wfile.write(payload)
+
+            def _redirect(self, location, headers=()):
+                self.send_response(302)
+                self.send_header('Location', location)
+                self.send_header('Content-Length', '0')
+                for name, value in headers:
+                    self.send_header(name, value)
+                self._end_headers()
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                query = parse_qs(url.query)
+                if url.path == '/member/login.jsp':
+                    self._send_html(server.login_page())
+                    return
+                if not self._logged_in():
+                    self._redirect('/member/login.jsp')
+                    return
+
+                server._page_started()
+                try:
+                    self._send_page(url.path, query)
+                finally:
+                    server._page_finished()
+
+            def _send_page(self, path, query):
+                if server.page_delay:
+                    time.sleep(server.page_delay)
+                try:
+                    pid = int(query.get('pid', ['0'])[0])
+                    idx = int(query.get('idx', ['0'])[0])
+                    page = int(query.get('page', ['1'])[0])
+                except ValueError:
+                    pid, idx, page = 0, 0, 1
+                if path == '/':
+                    self._send_html(server.main_page())
+                elif path == '/board/post_list.jsp' and pid in server.boards:
+                    self._send_html(server.list_page(pid, page))
+                elif path == '/board/post_view.jsp' and pid in server.boards:
+                    body = server.view_page(pid, idx)
+                    if body is None:
+                        self.send_error(404)
+                    else:
+                        self._send_html(body)
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                form = parse_qs(self.rfile.read(length).decode('utf-8'))
+                if urlsplit(self.path).path != '/member/login_ok.jsp':
+                    self.send_error(404)
+                    return
+                if form.get('id', [''])[0] != EMAIL or form.get('passwd', [''])[0] != PASSWORD:
+                    self._send_html(server.login_page('아이디 또는 비밀번호가 올바르지 않습니다.'))
+                    return
+                token = secrets.token_hex(16)
+                with server._lock:
+                    server._sessions.add(token)
+                    server.logins += 1
+                self._redirect(form.get('returl', ['/'])[0],
+                               headers=[('Set-Cookie', f"{SESSION_COOKIE}={token}; Path=/; HttpOnly")])
+
+        return Handler
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8002
+    boards = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    posts_per_board = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    page_delay = float(sys.argv[4]) if len(sys.argv) > 4 else 0.0
+    server = FakeBoardServer(port, boards=boards, posts_per_board=posts_per_board, page_delay=page_delay)
+    print(f"가짜 게시판 서버: {server.base_url} (게시판 {boards}개 x 게시글 {posts_per_board}개, "
+          f"페이지 지연 {page_delay}s, 로그인 {EMAIL} / {PASSWORD})")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
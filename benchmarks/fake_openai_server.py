@@ -0,0 +1,209 @@
+"""
+로컬 가짜 OpenAI 서버
+/v1/chat/completions를 흉내 내어 실제 API 호출 없이 스트리밍/지연 동작을 측정합니다.
+첫 토큰 지연과 토큰 간 지연을 설정할 수 있고,
+재시도/회로 차단 확인용으로 일부 요청을 429/5xx 오류로 응답하게 할 수 있습니다.
+
+사용법:
+    python benchmarks/fake_openai_server.py [포트] [첫 토큰 지연(초)] [토큰 간 지연(초)] [오류 비율]
+    OPENAI_BASE_URL=http://127.0.0.1:<포트>/v1 python app.py
+"""
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = ("게시판 정보에 따르면 박선미과장님이 해당 오류에 대해 답변을 해주었습니다. "
+                 "최근 일주일 동안 비슷한 문의가 세 건 있었고, 모두 캐시 초기화로 해결되었습니다.")
+
+
+def split_tokens(text):
+    """응답 문자열을 토큰 비슷한 조각(어절 + 공백)으로 분리"""
+    words = text.split(' ')
+    return [word + ' ' for word in words[:-1]] + [words[-1]]
+
+
+class _Server(ThreadingHTTPServer):
+    # 동시 사용자 100명 이상 부하 테스트에서 연결 대기열이 넘치지 않도록
+    request_queue_size = 512
+    daemon_threads = True
+
+
+class FakeOpenAIServer:
+    """
+    스레드에서 동작하는 가짜 OpenAI 서버
+
+    first_token_delay: 요청 수신 후 첫 토큰까지의 지연 (모델 처리 시간)
+    token_delay: 토큰 간 지연 (생성 속도)
+    failure_rate: 오류로 응답할 요청 비율 (0~1)
+    failure_status: 오류 응답 상태 코드 (429, 500, 503 등)
+    retry_after: 오류 응답에 넣을 Retry-After 헤더 (초, None이면 넣지 않음)
+    """
+
+    def __init__(self, port=0, reply=DEFAULT_REPLY, first_token_delay=0.5, token_delay=0.05,
+                 failure_rate=0.0, failure_status=429, retry_after=None, seed=None):
+        self.reply = reply
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.retry_after = retry_after
+        self.requests = 0
+        self.failures = 0
+        self._fail_next = []
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _Server(('127.0.0.1', port), self._make_handler())
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def fail_next(self, count, status=503):
+        """다음 count개 요청을 status 오류로 응답"""
+        with self._lock:
+            self._fail_next.extend([status] * count)
+
+    def _count_request(self):
+        """요청 수를 세고, 오류로 응답할 요청이면 상태 코드 반환"""
+        with self._lock:
+            self.requests += 1
+            if self._fail_next:
+                status = self._fail_next.pop(0)
+            elif self.failure_rate and self._rng.random() < self.failure_rate:
+                status = self.failure_status
+            else:
+                return None
+            self.failures += 1
+            return status
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                if not self.path.endswith('/chat/completions'):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                failure_status = server._count_request()
+                if failure_status:
+                    self._send_error(failure_status)
+                    return
+
+                tokens = split_tokens(server.reply)
+                time.sleep(server.first_token_delay)
+                if body.get('stream'):
+                    self._send_stream(body, tokens)
+                else:
+                    time.sleep(server.token_delay * (len(tokens) - 1))
+                    self._send_json(body)
+
+            def _send_error(self, status):
+                payload = json.dumps({
+                    'error': {
+                        'message': f'가짜 서버 오류 ({status})',
+                        'type': 'rate_limit_error' if status == 429 else 'server_error',
+                        'code': None,
+                    }
+                }).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                if server.retry_after is not None:
+                    self.send_header('Retry-After', str(server.retry_after))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_json(self, body):
+                payload = json.dumps({
+                    'id': 'chatcmpl-fake',
+                    'object': 'chat.completion',
+                    'created': int(time.time()),
+                    'model': body.get('model', 'gpt-4'),
+                    'choices': [{
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': server.reply},
+                        'finish_reason': 'stop',
+                    }],
+                    'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+                }, ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_stream(self, body, tokens):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+
+                def chunk(delta, finish_reason=None):
+                    data = json.dumps({
+                        'id': 'chatcmpl-fake',
+                        'object': 'chat.completion.chunk',
+                        'created': int(time.time()),
+                        'model': body.get('model', 'gpt-4'),
+                        'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+                    }, ensure_ascii=False)
+                    self.wfile.write(f"data: {data}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+
+                chunk({'role': 'assistant', 'content': ''})
+                for i, token in enumerate(tokens):
+                    if i:
+                        time.sleep(server.token_delay)
+                    chunk({'content': token})
+                chunk({}, finish_reason='stop')
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+                self.close_connection = True
+
+        return Handler
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8001
+    first_token_delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    token_delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+    failure_rate = float(sys.argv[4]) if len(sys.argv) > 4 else 0.0
+    server = FakeOpenAIServer(port, first_token_delay=first_token_delay, token_delay=token_delay,
+                              failure_rate=failure_rate)
+    print(f"가짜 OpenAI 서버: {server.base_url} (첫 토큰 {first_token_delay}s, 토큰 간 {token_delay}s, "
+          f"오류 비율 {failure_rate:.0%})")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,25 @@
 """
 사내 게시판 크롤러 모듈
 로그인 후 게시글을 수집합니다.
+
+backend='selenium': 모든 페이지를 헤드리스 Chrome으로 엽니다.
+backend='http': 한 번만 로그인(폼 POST 또는 Selenium)한 뒤 쿠키를 requests 세션으로 옮겨
+                목록/상세 페이지를 keep-alive 연결 풀로 가져옵니다. 파싱은 두 방식이 같습니다.
 """
 import time
 import os
 import re
-from urllib.parse import urljoin
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlsplit
 from datetime import datetime, timedelta
+import requests
+from requests.adapters import HTTPAdapter
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
@@ -20,14 +29,128 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# HTTP 백엔드 기본값
+HTTP_POOL_SIZE = 8
+HTTP_TIMEOUT_SECONDS = 15
+# 상세 페이지 동시 요청 수와 호스트별 초당 요청 수 (http 백엔드)
+DETAIL_WORKERS = 8
+HTTP_RATE_LIMIT = 50
+# selenium 백엔드는 드라이버 하나로 차례대로 열기 때문에 처음 몇 개만 상세 페이지를 가져옴
+SELENIUM_DETAIL_LIMIT = 5
+
+# 증분 크롤링(crawl_incremental) 기본값
+# - 목록 페이지 번호 파라미터, 최대 목록 페이지 수 (이보다 뒤 페이지의 게시글은 바뀌어도 다시 가져오지 않음)
+PAGE_PARAM = 'page'
+INCREMENTAL_MAX_PAGES = 50
+
+# selenium 백엔드에서 페이지가 준비되었다고 볼 요소 (파서가 찾는 요소)
+READY_SELECTORS = {
+    'login_page': "input[type='password'], #gs-left",
+    'main': "#gs-left",
+    'list': "input[name='idx'], a[href*='post_view']",
+    'detail': "div[id^='post']",
+}
+# 대기 종류별 최대 대기 시간 (초), 시간이 지나면 그때의 페이지로 진행
+# - login: 로그인 버튼 클릭 후 로그인 페이지를 벗어날 때까지
+WAIT_TIMEOUTS = {
+    'login_page': 10,
+    'login': 15,
+    'main': 10,
+    'list': 5,
+    'detail': 5,
+}
+HTTP_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/120.0 Safari/537.36')
+
+_META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+def _response_text(response):
+    """응답 본문 문자열 (헤더에 charset이 없으면 meta 태그, 그것도 없으면 UTF-8)"""
+    if 'charset' not in response.headers.get('Content-Type', '').lower():
+        match = _META_CHARSET.search(response.content[:2048])
+        response.encoding = match.group(1).decode('ascii') if match else 'utf-8'
+    return response.text
+
+
+class HostRateLimiter:
+    """호스트별 요청 시작 간격을 1/rate초 이상으로 유지 (여러 스레드/크롤러가 공유 가능)"""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """url의 호스트에 다음 요청을 보내도 될 때까지 대기"""
+        if not self.interval:
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _url_idx(url):
+    """게시글 링크의 idx 파라미터 (없으면 빈 문자열)"""
+    match = re.search(r'[?&]idx=(\d+)', url or '')
+    return match.group(1) if match else ''
+
+
+def _next_page_url(soup, current_url, page):
+    """목록 페이지의 페이지 링크 중 page + 1 페이지 링크 (없으면 None)"""
+    pattern = re.compile(rf'[?&]{PAGE_PARAM}={page + 1}(?:&|$)')
+    link = soup.find('a', href=lambda x: x and pattern.search(x))
+    return urljoin(current_url, link['href']) if link else None
+
+
+def _is_logged_in_url(url):
+    """로그인 후 이동한 URL로 로그인 성공 여부 판단"""
+    return "login" not in url.lower() or "post_list" in url.lower()
+
 
 class BoardCrawler:
-    def __init__(self, url, email, password):
+    """
+    사내 게시판 크롤러
+
+    backend: 'selenium' (모든 페이지를 Chrome으로) 또는 'http' (로그인 후 requests 세션으로)
+    login_method: http 백엔드의 로그인 방법 - 'form' (로그인 폼 POST) 또는 'selenium' (Chrome으로 로그인 후 쿠키만 가져옴)
+    cookies: export_cookies()로 내보낸 쿠키 (유효하면 로그인 생략, 여러 크롤러가 로그인 하나를 공유)
+    pool_size: http 백엔드의 호스트당 keep-alive 연결 수 (max_workers보다 작으면 max_workers)
+    timeout: http 백엔드의 요청 시간 제한 (초)
+    max_workers: http 백엔드에서 상세 페이지를 동시에 가져올 스레드 수
+    rate_limit: http 백엔드의 호스트별 초당 요청 수 (0이면 제한 없음, HostRateLimiter를 넘기면 공유)
+    wait_timeouts: selenium 백엔드의 대기 종류별 최대 대기 시간 (WAIT_TIMEOUTS 중 바꿀 항목만)
+    """
+
+    def __init__(self, url, email, password, backend='selenium', login_method='form', cookies=None,
+                 pool_size=HTTP_POOL_SIZE, timeout=HTTP_TIMEOUT_SECONDS, max_workers=DETAIL_WORKERS,
+                 rate_limit=HTTP_RATE_LIMIT, wait_timeouts=None):
+        if backend not in ('selenium', 'http'):
+            raise ValueError(f"지원하지 않는 backend: {backend}")
+        if login_method not in ('form', 'selenium'):
+            raise ValueError(f"지원하지 않는 login_method: {login_method}")
         self.url = url
         self.email = email
         self.password = password
+        self.backend = backend
+        self.login_method = login_method
+        self.cookies = cookies
+        self.pool_size = max(pool_size, max_workers)
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limit if isinstance(rate_limit, HostRateLimiter) else HostRateLimiter(rate_limit)
+        self.wait_timeouts = {**WAIT_TIMEOUTS, **(wait_timeouts or {})}
+        # 대기 종류별 {'count', 'seconds', 'max_seconds', 'timeouts'}
+        self.wait_stats = {}
         self.driver = None
+        self.session = None
         self.session_data = None
+        # http 백엔드의 현재 페이지 (HTML, URL)
+        self._page = None
         
     def _setup_driver(self):
         """Chrome 드라이버 설정"""
@@ -41,16 +164,209 @@ class BoardCrawler:
         service = Service(ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
         logger.info("Chrome 드라이버 설정 완료")
-        
+
+    def _setup_session(self):
+        """HTTP 세션 설정 (호스트당 pool_size개의 keep-alive 연결 재사용)"""
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['User-Agent'] = HTTP_USER_AGENT
+        logger.info(f"HTTP 세션 설정 완료 (연결 풀 {self.pool_size})")
+
+    def _fetch(self, url, data=None):
+        """HTTP 세션으로 url을 가져와 (HTML, 최종 URL) 반환 (data가 있으면 POST)"""
+        self.rate_limiter.wait(url)
+        if data is None:
+            response = self.session.get(url, timeout=self.timeout)
+        else:
+            response = self.session.post(url, data=data, timeout=self.timeout)
+        response.raise_for_status()
+        return _response_text(response), response.url
+
+    def _open(self, url, page):
+        """url로 이동해 (HTML, 최종 URL) 반환 (selenium은 page 종류의 READY_SELECTORS 요소가 나타날 때까지 대기)"""
+        if self.backend == 'http':
+            return self._fetch(url)
+        self.driver.get(url)
+        self._wait_ready(page)
+        return self.driver.page_source, self.driver.current_url
+
+    def _wait_ready(self, page):
+        """현재 페이지에 page 종류의 READY_SELECTORS 요소가 나타날 때까지 대기"""
+        return self._wait_for(page, EC.presence_of_element_located((By.CSS_SELECTOR, READY_SELECTORS[page])))
+
+    def _wait_for(self, name, condition):
+        """
+        condition이 참이 될 때까지 최대 wait_timeouts[name]초 대기 (시간 초과면 False)
+
+        걸린 시간을 wait_stats[name]에 기록합니다.
+        """
+        timeout = self.wait_timeouts[name]
+        started = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(condition)
+            ready = True
+        except TimeoutException:
+            logger.warning(f"페이지 준비 대기 시간 초과 ({name}, {timeout}s)")
+            ready = False
+        elapsed = time.perf_counter() - started
+
+        stats = self.wait_stats.setdefault(name, {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0, 'timeouts': 0})
+        stats['count'] += 1
+        stats['seconds'] += elapsed
+        stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+        stats['timeouts'] += not ready
+        logger.debug(f"페이지 준비 대기 ({name}): {elapsed * 1000:.0f}ms")
+        return ready
+
+    def _current_page(self):
+        """현재 페이지의 (HTML, URL)"""
+        if self.backend == 'http':
+            return self._page
+        return self.driver.page_source, self.driver.current_url
+
+    def _ensure_login(self):
+        """로그인 전이면 로그인 (http 백엔드는 로그인에 성공해야 현재 페이지가 생김)"""
+        if self.backend == 'http':
+            return self._page is not None or self.login()
+        return self.driver is not None or self.login()
+
     def login(self):
         """사내 게시판에 로그인"""
+        if self.backend == 'http':
+            return self._login_http()
+        return self._login_selenium()
+
+    def _login_http(self):
+        """HTTP 세션 로그인 (저장된 쿠키 -> 로그인 폼 POST 또는 Selenium 로그인 후 쿠키 복사)"""
+        try:
+            if not self.session:
+                self._setup_session()
+
+            if self.cookies:
+                self._import_cookies(self.cookies)
+                html, current_url = self._fetch(self.url)
+                if _is_logged_in_url(current_url):
+                    logger.info("저장된 쿠키로 로그인 확인")
+                    self._page = (html, current_url)
+                    return True
+                logger.info("저장된 쿠키가 만료되어 다시 로그인합니다.")
+                self.session.cookies.clear()
+
+            if self.login_method == 'selenium':
+                if not self._login_selenium():
+                    return False
+                # 쿠키만 가져오고 Chrome은 바로 종료 (이후 페이지는 HTTP 세션으로)
+                self._import_cookies(self.driver.get_cookies())
+                self.driver.quit()
+                self.driver = None
+                logger.info("Selenium 로그인 쿠키를 HTTP 세션으로 복사, 드라이버 종료")
+                self._page = self._fetch(self.url)
+                return True
+            return self._login_form()
+        except Exception as e:
+            logger.error(f"HTTP 로그인 중 오류 발생: {str(e)}")
+            return False
+
+    def _login_form(self):
+        """로그인 페이지의 폼을 찾아 아이디/비밀번호를 POST"""
+        logger.info(f"게시판 접속: {self.url}")
+        html, current_url = self._fetch(self.url)
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # 비밀번호 입력 필드 (name=passwd 우선)가 있는 폼
+        password_input = None
+        for attrs in ({'name': 'passwd'}, {'name': 'password'}, {'type': 'password'}):
+            password_input = soup.find('input', attrs)
+            if password_input:
+                break
+        form = password_input.find_parent('form') if password_input else None
+        if not form:
+            with open("debug_page.html", "w", encoding="utf-8") as f:
+                f.write(html)
+            logger.error("로그인 폼을 찾을 수 없습니다. login_method='selenium'을 사용하세요. "
+                         "디버그용 페이지 소스 저장: debug_page.html")
+            return False
+
+        # 숨은 필드 등 폼의 기본값을 그대로 보내고 아이디/비밀번호만 채움 (name=id 우선)
+        fields = {}
+        for field in form.find_all(['input', 'select', 'textarea']):
+            name = field.get('name')
+            field_type = (field.get('type') or '').lower()
+            if not name or field_type in ('submit', 'button', 'image', 'reset'):
+                continue
+            if field_type in ('checkbox', 'radio') and not field.has_attr('checked'):
+                continue
+            fields[name] = field.get('value', '')
+        email_name = next((name for name in ('id', 'email') if name in fields), None)
+        if not email_name:
+            email_input = form.find('input', {'type': 'email'}) or form.find('input', {'type': 'text'})
+            email_name = email_input.get('name') if email_input else None
+        if not email_name:
+            logger.error("이메일 입력 필드를 찾을 수 없습니다.")
+            return False
+        fields[email_name] = self.email
+        fields[password_input.get('name')] = self.password
+
+        action = urljoin(current_url, form.get('action') or current_url)
+        logger.info(f"로그인 폼 전송: {action}")
+        html, current_url = self._fetch(action, data=fields)
+        logger.info(f"로그인 후 URL: {current_url}")
+
+        if _is_logged_in_url(current_url):
+            logger.info("로그인 성공으로 판단")
+            self._page = (html, current_url)
+            return True
+        logger.warning("로그인 실패 가능성")
+        return False
+
+    def _import_cookies(self, cookies):
+        """Selenium get_cookies() 형식의 쿠키 목록을 HTTP 세션에 추가"""
+        for cookie in cookies:
+            self.session.cookies.set(cookie['name'], cookie['value'],
+                                     domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+
+    def _import_driver_cookies(self):
+        """저장된 쿠키를 드라이버에 넣고 다시 열어 로그인 상태인지 확인 (만료되었으면 로그인 페이지로 되돌림)"""
+        for cookie in self.cookies:
+            # 도메인은 현재 페이지 기준으로 정해지도록 넘기지 않음
+            self.driver.add_cookie({'name': cookie['name'], 'value': cookie['value'],
+                                    'path': cookie.get('path') or '/'})
+        self.driver.get(self.url)
+        self._wait_ready('login_page')
+        if _is_logged_in_url(self.driver.current_url):
+            logger.info("저장된 쿠키로 로그인 확인")
+            return True
+        logger.info("저장된 쿠키가 만료되어 다시 로그인합니다.")
+        self.driver.delete_all_cookies()
+        self.driver.get(self.url)
+        self._wait_ready('login_page')
+        return False
+
+    def export_cookies(self):
+        """로그인 쿠키 목록 (Selenium get_cookies() 형식, 다른 크롤러의 cookies 인자로 재사용)"""
+        if self.session is not None:
+            return [{'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path}
+                    for c in self.session.cookies]
+        if self.driver is not None:
+            return [{'name': c['name'], 'value': c['value'], 'domain': c.get('domain', ''),
+                     'path': c.get('path', '/')} for c in self.driver.get_cookies()]
+        return []
+
+    def _login_selenium(self):
+        """Chrome으로 로그인 폼 입력 후 로그인 버튼 클릭"""
         try:
             if not self.driver:
                 self._setup_driver()
                 
             logger.info(f"게시판 접속: {self.url}")
             self.driver.get(self.url)
-            time.sleep(2)
+            self._wait_ready('login_page')
+            
+            # 다른 크롤러의 로그인 쿠키가 있으면 로그인 폼 대신 사용 (selenium 백엔드)
+            if self.backend == 'selenium' and self.cookies and self._import_driver_cookies():
+                return True
             
             # 로그인 폼 찾기 및 입력
             try:
@@ -69,11 +385,10 @@ class BoardCrawler:
                     (By.CSS_SELECTOR, "input[id*='email' i]")
                 ]
                 
+                # 로그인 폼이 나타난 뒤이므로 선택자마다 기다리지 않고 바로 찾음
                 for selector_type, selector_value in selectors:
                     try:
-                        email_input = WebDriverWait(self.driver, 2).until(
-                            EC.presence_of_element_located((selector_type, selector_value))
-                        )
+                        email_input = self.driver.find_element(selector_type, selector_value)
                         logger.info(f"이메일 필드 찾음: {selector_type}={selector_value}")
                         break
                     except:
@@ -135,6 +450,9 @@ class BoardCrawler:
                 if not login_button:
                     raise Exception("로그인 버튼을 찾을 수 없습니다.")
                 
+                # 클릭 후 로그인 페이지를 벗어났는지 확인할 기준 URL
+                login_url = self.driver.current_url
+                
                 # StaleElementReferenceException 처리
                 from selenium.webdriver.common.keys import Keys
                 max_retries = 3
@@ -157,7 +475,11 @@ class BoardCrawler:
                         else:
                             raise
                 
-                time.sleep(5)  # 로그인 처리 대기 시간 증가
+                # 로그인 처리 대기: 로그인 페이지를 벗어나거나 왼쪽 메뉴가 나타날 때까지
+                self._wait_for('login', EC.any_of(
+                    EC.url_changes(login_url),
+                    EC.presence_of_element_located((By.CSS_SELECTOR, READY_SELECTORS['main'])),
+                ))
                 
                 logger.info(f"로그인 후 URL: {self.driver.current_url}")
                 
@@ -184,13 +506,13 @@ class BoardCrawler:
     def navigate_to_board(self, board_url):
         """특정 게시판으로 이동"""
         try:
-            if not self.driver:
-                if not self.login():
-                    return False
+            if not self._ensure_login():
+                return False
             
             logger.info(f"게시판으로 이동: {board_url}")
-            self.driver.get(board_url)
-            time.sleep(3)  # 페이지 로딩 대기
+            page = self._open(board_url, 'list')  # 게시글 행이 나타날 때까지 대기
+            if self.backend == 'http':
+                self._page = page
             return True
         except Exception as e:
             logger.error(f"게시판 이동 중 오류: {str(e)}")
@@ -204,21 +526,18 @@ class BoardCrawler:
             return self._board_categories_cache
         
         try:
-            if not self.driver:
-                if not self.login():
-                    logger.error("로그인 실패로 게시판 목록을 가져올 수 없습니다.")
-                    return {}
+            if not self._ensure_login():
+                logger.error("로그인 실패로 게시판 목록을 가져올 수 없습니다.")
+                return {}
             
             # 메인 페이지로 이동 (왼쪽 메뉴는 메인 페이지에 있음)
             logger.info("게시판 목록 추출을 위해 메인 페이지로 이동 중...")
-            self.driver.get(self.url)
-            time.sleep(3)  # 페이지 로딩 대기 시간 증가
+            html, current_url = self._open(self.url, 'main')  # 왼쪽 메뉴가 나타날 때까지 대기
             
             # 현재 URL 확인
-            current_url = self.driver.current_url
             logger.info(f"현재 URL: {current_url}")
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             
             # 왼쪽 메뉴 찾기: <div id="gs-left">
             left_menu = soup.find('div', id='gs-left')
@@ -240,7 +559,7 @@ class BoardCrawler:
                     # 디버그용 HTML 저장
                     debug_file = "debug_main_page.html"
                     with open(debug_file, "w", encoding="utf-8") as f:
-                        f.write(self.driver.page_source)
+                        f.write(html)
                     logger.error(f"게시판 링크를 찾을 수 없습니다. 디버그 파일 저장: {debug_file}")
                     return {}
                 
@@ -254,9 +573,9 @@ class BoardCrawler:
                         if href.startswith('http'):
                             category_url = href
                         elif href.startswith('/'):
-                            category_url = urljoin(self.driver.current_url, href)
+                            category_url = urljoin(current_url, href)
                         else:
-                            category_url = urljoin(self.driver.current_url, href)
+                            category_url = urljoin(current_url, href)
                         
                         if category_name not in categories:
                             categories[category_name] = {
@@ -290,9 +609,9 @@ class BoardCrawler:
                     if href.startswith('http'):
                         category_url = href
                     elif href.startswith('/'):
-                        category_url = urljoin(self.driver.current_url, href)
+                        category_url = urljoin(current_url, href)
                     else:
-                        category_url = urljoin(self.driver.current_url, href)
+                        category_url = urljoin(current_url, href)
                     
                     # 중복 제거 (같은 이름이 여러 번 나올 수 있음)
                     if category_name not in categories:
@@ -395,14 +714,13 @@ class BoardCrawler:
     def _get_post_detail(self, post_url):
         """게시글 상세 페이지에서 본문과 덧글 가져오기"""
         try:
-            if not self.driver:
+            if self.driver is None and self.session is None:
                 return None, []
             
             # 상세 페이지로 이동
-            self.driver.get(post_url)
-            time.sleep(2)  # 페이지 로딩 대기
+            html, _ = self._open(post_url, 'detail')  # 본문이 나타날 때까지 대기
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             
             # 본문 찾기: <div class="conts markdown-body" id="post{숫자}">
             content = ""
@@ -465,6 +783,7 @@ class BoardCrawler:
                 
                 if comment_text:
                     comments.append({
+                        'id': comment_id[len('comment'):],
                         'author': comment_author,
                         'text': comment_text[:1000],  # 덧글 길이 증가
                         'date': comment_date
@@ -524,29 +843,203 @@ class BoardCrawler:
             logger.warning(f"날짜 필터링 오류: {str(e)}")
             return True
     
-    def get_posts(self, limit=50, board_url=None, date_filter=None):
-        """게시판에서 게시글 수집"""
+    def _fetch_post_details(self, posts, detail_limit=None):
+        """
+        앞에서부터 detail_limit개(None이면 http 백엔드는 전부, selenium은 SELENIUM_DETAIL_LIMIT개) 게시글의
+        본문과 덧글을 상세 페이지에서 가져와 채움
+
+        http 백엔드는 max_workers개 스레드로 동시에 가져오고 (요청 간격은 호스트별 rate_limit로 제한),
+        selenium 백엔드는 드라이버 하나로 차례대로 가져옵니다. 결과는 목록 순서대로 채웁니다.
+        상세 페이지를 가져오지 못한 게시글 목록을 반환합니다.
+        """
+        if detail_limit is None:
+            detail_limit = len(posts) if self.backend == 'http' else SELENIUM_DETAIL_LIMIT
+        targets = [post for post in posts[:detail_limit] if post['url']]
+        if not targets:
+            return []
+
+        started = time.perf_counter()
+        workers = min(self.max_workers, len(targets)) if self.backend == 'http' else 1
+        urls = [post['url'] for post in targets]
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='board-detail') as executor:
+                details = list(executor.map(self._get_post_detail, urls))
+        else:
+            details = [self._get_post_detail(url) for url in urls]
+
+        failed = []
+        for post, (detail_content, detail_comments) in zip(targets, details):
+            if detail_content is None:
+                failed.append(post)
+            if detail_content and len(detail_content) > len(post['title']):
+                post['content'] = detail_content[:1000]
+            if detail_comments:
+                post['comments'] = detail_comments
+        logger.info(f"상세 페이지 {len(targets)}개 수집 완료 ({time.perf_counter() - started:.1f}s, 동시 {workers}개)")
+        return failed
+
+    def _parse_post_rows(self, soup, current_url, limit=50, date_filter=None):
+        """목록 페이지의 게시글 행 파싱 (상세 페이지는 가져오지 않음, 링크는 current_url 기준으로 완성)"""
+        posts = []
+        # 게시판 테이블 구조 파싱
+        # 테이블의 tr 태그에서 게시글 찾기
+        # 일반적으로 게시글은 tr 태그 안에 있고, 제목은 a 태그 안에 있음
+        table_rows = soup.find_all('tr')
+        
+        for row in table_rows:
+            # 체크박스가 있는 행은 게시글 행일 가능성이 높음
+            checkbox = row.find('input', {'type': 'checkbox', 'name': 'idx'})
+            if not checkbox:
+                continue
+            
+            # 제목 찾기 - a 태그 중 class="nr10" 또는 href에 "post_view"가 있는 것
+            title_link = row.find('a', class_='nr10')
+            if not title_link:
+                # 대체: href에 post_view가 있는 a 태그
+                title_link = row.find('a', href=lambda x: x and 'post_view' in x)
+            
+            if title_link:
+                title = title_link.get_text(strip=True)
+                
+                # 댓글 수 추출
+                comment_count = 0
+                original_title = title
+                if '+' in title and '개의 추가 글' in title:
+                    # "정산 관련 +11개의 추가 글" -> 댓글 수 추출
+                    comment_match = re.search(r'\+(\d+)개의 추가 글', title)
+                    if comment_match:
+                        comment_count = int(comment_match.group(1))
+                    title = title.split('+')[0].strip()
+                
+                # 게시글 상세 페이지 URL 추출
+                post_detail_url = None
+                if title_link.get('href'):
+                    href = title_link.get('href')
+                    if href.startswith('http'):
+                        post_detail_url = href
+                    elif href.startswith('/'):
+                        post_detail_url = urljoin(current_url, href)
+                    else:
+                        post_detail_url = urljoin(current_url, href)
+                
+                # 추가 정보 추출 (작성자, 날짜 등)
+                tds = row.find_all('td')
+                author = ""
+                date = ""
+                
+                if len(tds) > 4:
+                    # 날짜와 작성자 추출
+                    for td in tds:
+                        td_text = td.get_text(strip=True)
+                        
+                        # 날짜 형식 확인 (YYYY-MM-DD 또는 YYYY-MM-DD HH:MM)
+                        # <td>2025-11-20 <span class="time01">10:02</span></td> 형태
+                        date_match = re.search(r'(\d{4}-\d{2}-\d{2})', td_text)
+                        if date_match:
+                            date_str = date_match.group(1)
+                            # 시간 정보도 있는지 확인
+                            time_span = td.find('span', class_='time01')
+                            if time_span:
+                                time_str = time_span.get_text(strip=True)
+                                date = f"{date_str} {time_str}"
+                            else:
+                                # 시간 정보가 없으면 날짜만
+                                date = date_str
+                        
+                        # 작성자 (한글 이름, 2-4자)
+                        elif len(td_text) >= 2 and len(td_text) <= 4 and any('\uAC00' <= c <= '\uD7A3' for c in td_text):
+                            if not author:
+                                author = td_text
+                
+                # 목록에서 추가 정보 추출 시도
+                # (본문과 덧글은 목록을 다 읽은 뒤 상세 페이지에서 한꺼번에 가져옴)
+                content = title  # 기본값
+                # 제목이 있는 td의 전체 내용 확인
+                parent_td = title_link.find_parent('td')
+                if parent_td:
+                    # 같은 td 안의 모든 텍스트 요소 찾기
+                    all_text = parent_td.get_text(separator=' ', strip=True)
+                    if len(all_text) > len(title) + 10:  # 제목 외에 추가 텍스트가 있는지
+                        # 제목 외의 추가 텍스트가 있으면 내용으로 사용
+                        # 제목 부분 제거
+                        remaining_text = all_text.replace(title, '', 1).strip()
+                        # 댓글 수 텍스트 제거
+                        remaining_text = re.sub(r'\+\d+개의 추가 글', '', remaining_text).strip()
+                        if remaining_text:
+                            content = f"{title} - {remaining_text[:500]}"
+                
+                # 같은 행의 다른 td에서 추가 정보 찾기
+                if content == title and len(tds) > 3:
+                    # 제목이 있는 td의 인덱스 찾기
+                    title_td_index = -1
+                    for i, td in enumerate(tds):
+                        if title_link in td.find_all():
+                            title_td_index = i
+                            break
+                    
+                    # 인접한 td에서 추가 정보 찾기
+                    for i, td in enumerate(tds):
+                        if i != title_td_index:
+                            td_text = td.get_text(strip=True)
+                            # 긴 텍스트가 있으면 내용으로 사용 (날짜, 작성자 제외)
+                            if len(td_text) > 20 and not re.match(r'^\d{4}-\d{2}-\d{2}', td_text):
+                                if not any('\uAC00' <= c <= '\uD7A3' for c in td_text[:3]):  # 한글 이름이 아닌 경우
+                                    content = f"{title} - {td_text[:300]}"
+                                    break
+                
+                # 날짜 필터링 적용
+                include_post = True
+                if date_filter and date:
+                    include_post = self._check_date_filter(date, date_filter)
+                
+                if include_post:
+                    posts.append({
+                        'title': title,
+                        'content': content[:1000],  # 본문 길이 증가
+                        'author': author,
+                        'date': date,
+                        'comment_count': comment_count,
+                        'comments': [],  # 덧글 목록
+                        'url': post_detail_url,
+                        # 게시글 번호 (체크박스 값, 없으면 링크의 idx 파라미터)
+                        'idx': checkbox.get('value') or _url_idx(post_detail_url)
+                    })
+                
+                # limit 체크는 필터링 후 게시글 수로 확인
+                if len(posts) >= limit:
+                    break
+        
+        return posts
+
+    def get_posts(self, limit=50, board_url=None, date_filter=None, detail_limit=None):
+        """
+        게시판에서 게시글 수집
+
+        detail_limit: 본문과 덧글을 상세 페이지에서 가져올 게시글 수 (None이면 http 백엔드는 전부,
+                      selenium은 SELENIUM_DETAIL_LIMIT개, 나머지는 목록의 정보만 사용)
+        """
         try:
-            if not self.driver:
-                if not self.login():
-                    return []
+            if not self._ensure_login():
+                return []
             
             # 특정 게시판 URL이 제공된 경우 해당 게시판으로 이동
             if board_url:
                 if not self.navigate_to_board(board_url):
                     return []
             
-            # 페이지 로딩 대기
-            time.sleep(2)
+            # 페이지 로딩 대기 (navigate_to_board에서 이미 기다렸으면 바로 진행)
+            if self.backend == 'selenium':
+                self._wait_ready('list')
             
-            posts = []
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            # 상세 페이지를 여는 동안 드라이버 URL이 바뀌므로 목록 페이지 URL을 기준으로 링크 완성
+            html, current_url = self._current_page()
+            soup = BeautifulSoup(html, 'html.parser')
             
             # 디버그: 페이지 소스 저장
-            logger.info(f"현재 URL: {self.driver.current_url}")
+            logger.info(f"현재 URL: {current_url}")
             debug_filename = "debug_board_page.html"
             with open(debug_filename, "w", encoding="utf-8") as f:
-                f.write(self.driver.page_source)
+                f.write(html)
             logger.info(f"게시판 페이지 HTML 저장: {debug_filename}")
             
             # 디버그: 페이지 구조 분석
@@ -588,148 +1081,10 @@ class BoardCrawler:
             
             logger.info("=== 게시판 구조 분석 완료 ===")
             
-            # 게시판 테이블 구조 파싱
-            # 테이블의 tr 태그에서 게시글 찾기
-            # 일반적으로 게시글은 tr 태그 안에 있고, 제목은 a 태그 안에 있음
-            table_rows = soup.find_all('tr')
+            posts = self._parse_post_rows(soup, current_url, limit, date_filter)
             
-            for row in table_rows:
-                # 체크박스가 있는 행은 게시글 행일 가능성이 높음
-                checkbox = row.find('input', {'type': 'checkbox', 'name': 'idx'})
-                if not checkbox:
-                    continue
-                
-                # 제목 찾기 - a 태그 중 class="nr10" 또는 href에 "post_view"가 있는 것
-                title_link = row.find('a', class_='nr10')
-                if not title_link:
-                    # 대체: href에 post_view가 있는 a 태그
-                    title_link = row.find('a', href=lambda x: x and 'post_view' in x)
-                
-                if title_link:
-                    title = title_link.get_text(strip=True)
-                    
-                    # 댓글 수 추출
-                    comment_count = 0
-                    original_title = title
-                    if '+' in title and '개의 추가 글' in title:
-                        # "정산 관련 +11개의 추가 글" -> 댓글 수 추출
-                        comment_match = re.search(r'\+(\d+)개의 추가 글', title)
-                        if comment_match:
-                            comment_count = int(comment_match.group(1))
-                        title = title.split('+')[0].strip()
-                    
-                    # 게시글 상세 페이지 URL 추출
-                    post_detail_url = None
-                    if title_link.get('href'):
-                        href = title_link.get('href')
-                        if href.startswith('http'):
-                            post_detail_url = href
-                        elif href.startswith('/'):
-                            post_detail_url = urljoin(self.driver.current_url, href)
-                        else:
-                            post_detail_url = urljoin(self.driver.current_url, href)
-                    
-                    # 추가 정보 추출 (작성자, 날짜 등)
-                    tds = row.find_all('td')
-                    author = ""
-                    date = ""
-                    
-                    if len(tds) > 4:
-                        # 날짜와 작성자 추출
-                        for td in tds:
-                            td_text = td.get_text(strip=True)
-                            
-                            # 날짜 형식 확인 (YYYY-MM-DD 또는 YYYY-MM-DD HH:MM)
-                            # <td>2025-11-20 <span class="time01">10:02</span></td> 형태
-                            date_match = re.search(r'(\d{4}-\d{2}-\d{2})', td_text)
-                            if date_match:
-                                date_str = date_match.group(1)
-                                # 시간 정보도 있는지 확인
-                                time_span = td.find('span', class_='time01')
-                                if time_span:
-                                    time_str = time_span.get_text(strip=True)
-                                    date = f"{date_str} {time_str}"
-                                else:
-                                    # 시간 정보가 없으면 날짜만
-                                    date = date_str
-                            
-                            # 작성자 (한글 이름, 2-4자)
-                            elif len(td_text) >= 2 and len(td_text) <= 4 and any('\uAC00' <= c <= '\uD7A3' for c in td_text):
-                                if not author:
-                                    author = td_text
-                    
-                    # 게시글 상세 페이지에서 본문과 덧글 가져오기 (선택적)
-                    # 성능을 위해 처음 몇 개만 상세 정보 가져오기
-                    content = title  # 기본값
-                    comments = []
-                    
-                    # 처음 5개 게시글만 상세 정보 가져오기 (성능 최적화)
-                    if post_detail_url and len(posts) < 5:
-                        try:
-                            logger.info(f"게시글 상세 정보 가져오기 시도: {title[:30]}...")
-                            detail_content, detail_comments = self._get_post_detail(post_detail_url)
-                            if detail_content and len(detail_content) > len(title):
-                                content = detail_content
-                                logger.info(f"본문 수집 성공: {len(content)}자")
-                            if detail_comments:
-                                comments = detail_comments
-                                logger.info(f"덧글 {len(comments)}개 수집 성공")
-                        except Exception as e:
-                            logger.warning(f"게시글 상세 정보 가져오기 실패 ({title[:30]}...): {str(e)}")
-                    else:
-                        # 목록에서 추가 정보 추출 시도
-                        # 제목이 있는 td의 전체 내용 확인
-                        parent_td = title_link.find_parent('td')
-                        if parent_td:
-                            # 같은 td 안의 모든 텍스트 요소 찾기
-                            all_text = parent_td.get_text(separator=' ', strip=True)
-                            if len(all_text) > len(title) + 10:  # 제목 외에 추가 텍스트가 있는지
-                                # 제목 외의 추가 텍스트가 있으면 내용으로 사용
-                                # 제목 부분 제거
-                                remaining_text = all_text.replace(title, '', 1).strip()
-                                # 댓글 수 텍스트 제거
-                                remaining_text = re.sub(r'\+\d+개의 추가 글', '', remaining_text).strip()
-                                if remaining_text:
-                                    content = f"{title} - {remaining_text[:500]}"
-                        
-                        # 같은 행의 다른 td에서 추가 정보 찾기
-                        if content == title and len(tds) > 3:
-                            # 제목이 있는 td의 인덱스 찾기
-                            title_td_index = -1
-                            for i, td in enumerate(tds):
-                                if title_link in td.find_all():
-                                    title_td_index = i
-                                    break
-                            
-                            # 인접한 td에서 추가 정보 찾기
-                            for i, td in enumerate(tds):
-                                if i != title_td_index:
-                                    td_text = td.get_text(strip=True)
-                                    # 긴 텍스트가 있으면 내용으로 사용 (날짜, 작성자 제외)
-                                    if len(td_text) > 20 and not re.match(r'^\d{4}-\d{2}-\d{2}', td_text):
-                                        if not any('\uAC00' <= c <= '\uD7A3' for c in td_text[:3]):  # 한글 이름이 아닌 경우
-                                            content = f"{title} - {td_text[:300]}"
-                                            break
-                    
-                    # 날짜 필터링 적용
-                    include_post = True
-                    if date_filter and date:
-                        include_post = self._check_date_filter(date, date_filter)
-                    
-                    if include_post:
-                        posts.append({
-                            'title': title,
-                            'content': content[:1000],  # 본문 길이 증가
-                            'author': author,
-                            'date': date,
-                            'comment_count': comment_count,
-                            'comments': comments,  # 덧글 목록
-                            'url': post_detail_url
-                        })
-                    
-                    # limit 체크는 필터링 후 게시글 수로 확인
-                    if len(posts) >= limit:
-                        break
+            # 게시글 상세 페이지에서 본문과 덧글 가져오기
+            self._fetch_post_details(posts, detail_limit)
             
             # 위 방법으로 찾지 못한 경우, 대체 방법 시도
             if len(posts) == 0:
@@ -838,10 +1193,75 @@ class BoardCrawler:
         logger.info(f"게시판 정보 수집 성공: {len(result)}자")
         return result
     
+    def crawl_incremental(self, board_url, board_name, state, max_pages=INCREMENTAL_MAX_PAGES):
+        """
+        지난 크롤링 이후 바뀐 게시글만 수집해 state(crawl_state.CrawlStateStore)에 저장
+
+        목록을 첫 페이지부터 끝까지 (최대 max_pages페이지) 읽으며 처음 보는 게시글과
+        제목/댓글 수(+N개의 추가 글)가 바뀐 게시글만 상세 페이지를 가져옵니다.
+        오래된 글에 새 댓글이 달려도 목록에서 댓글 수가 바뀌므로 몇 번째 페이지에 있든 다시 가져옵니다
+        (목록 페이지는 상세 페이지보다 훨씬 적으므로 전체 목록을 읽는 비용은 크지 않음).
+        상세 페이지를 가져오지 못한 게시글은 저장하지 않아 다음 크롤링에서 다시 시도합니다.
+        CSV에 반영하려면 state.export_csv()를 호출합니다.
+
+        Returns:
+            {'board', 'pages', 'listed', 'new', 'changed', 'unchanged', 'details', 'failed', 'seconds'}
+        """
+        started = time.perf_counter()
+        summary = {'board': board_name, 'pages': 0, 'listed': 0, 'new': 0, 'changed': 0, 'unchanged': 0,
+                   'details': 0, 'failed': 0, 'seconds': 0.0}
+        if not self._ensure_login():
+            summary['error'] = '로그인 실패'
+            return summary
+
+        targets = []
+        url = board_url
+        while url and summary['pages'] < max_pages:
+            html, current_url = self._open(url, 'list')
+            soup = BeautifulSoup(html, 'html.parser')
+            rows = self._parse_post_rows(soup, current_url, limit=float('inf'))
+            summary['pages'] += 1
+            summary['listed'] += len(rows)
+
+            for post, status in zip(rows, state.check(rows)):
+                summary[status] += 1
+                if status != 'unchanged':
+                    targets.append(post)
+            if not rows:
+                break
+            url = _next_page_url(soup, current_url, summary['pages'])
+
+        failed = self._fetch_post_details(targets, detail_limit=len(targets))
+        # 게시글 dict는 해시할 수 없으므로 객체 id로 비교 (targets x failed 반복 없이)
+        failed_ids = {id(post) for post in failed}
+        state.save_posts(board_name, [post for post in targets if id(post) not in failed_ids])
+        summary['details'] = len(targets)
+        summary['failed'] = len(failed)
+        summary['seconds'] = round(time.perf_counter() - started, 2)
+        logger.info(f"[{board_name}] 증분 크롤링: 목록 {summary['pages']}페이지, 새 글 {summary['new']}개, "
+                    f"바뀐 글 {summary['changed']}개, 상세 {summary['details']}개 ({summary['seconds']}s)")
+        return summary
+
+    def wait_report(self):
+        """대기 종류별 횟수, 총/최대 대기 시간(ms), 시간 초과 횟수"""
+        return {
+            name: {
+                'count': stats['count'],
+                'total_ms': round(stats['seconds'] * 1000, 1),
+                'max_ms': round(stats['max_seconds'] * 1000, 1),
+                'timeouts': stats['timeouts'],
+            }
+            for name, stats in self.wait_stats.items()
+        }
+
     def close(self):
-        """드라이버 종료"""
+        """드라이버 / HTTP 세션 종료"""
         if self.driver:
             self.driver.quit()
             self.driver = None
             logger.info("드라이버 종료")
+        if self.session:
+            self.session.close()
+            self.session = None
+            logger.info("HTTP 세션 종료")
 
@@ -2,24 +2,53 @@
 OpenAI API를 사용한 챗봇 모듈
 사내 게시판 정보를 컨텍스트로 활용합니다.
 """
+import hashlib
+import json
 import os
+import time
 from openai import OpenAI
+from context_packer import context_token_budget, fit_context
+from history_store import MemoryHistoryStore
+from resilience import ResilientCaller
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 세션 ID 없이 호출한 경우 사용하는 세션 (단일 사용자 스크립트 등)
+DEFAULT_SESSION_ID = 'default'
+
 
 class ChatBot:
-    def __init__(self, api_key):
-        self.client = OpenAI(api_key=api_key)
-        self.conversation_history = []
+    def __init__(self, api_key, response_cache=None, base_url=None, history_store=None,
+                 model="gpt-4", max_tokens=1000, context_budget=None, reserved_tokens=2500, resilience=None):
+        # API 호출 재시도/회로 차단/같은 요청 합치기 (resilience.ResilientCaller, 없으면 기본 설정)
+        self.resilience = resilience or ResilientCaller()
+        # base_url: OpenAI 호환 서버 주소 (로컬 테스트용 가짜 서버 등, 없으면 기본 API)
+        self.client = self._create_client(api_key, base_url)
+        # 세션별 대화 기록 (history_store.HistoryStore, 없으면 프로세스 메모리 저장소)
+        self.history_store = history_store or MemoryHistoryStore()
+        self.model = model
+        self.max_tokens = max_tokens
+        # 게시판 컨텍스트 토큰 예산 (없으면 모델 컨텍스트 창 기준으로 계산)
+        self.context_token_budget = context_budget or context_token_budget(model, max_tokens, reserved_tokens)
+        # 같은 질문에 대한 응답 캐시 (response_cache.ResponseCache, 없으면 사용 안 함)
+        self.response_cache = response_cache
         
-    def get_response(self, user_message, board_context="", is_problem_query=False, responsible_person_info=None):
-        """사용자 메시지에 대한 응답 생성"""
-        try:
-            # 시스템 프롬프트 설정
-            system_prompt = """당신은 사내 업무를 도와주는 AI 어시스턴트입니다. 
+    def _create_client(self, api_key, base_url):
+        # 재시도는 self.resilience가 담당 (클라이언트 자체 재시도와 겹치지 않도록 끔)
+        return OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+    
+    def _request_key(self, messages):
+        """같은 요청인지 판단하는 키 (모델 + 전체 메시지)"""
+        payload = json.dumps([self.model, self.max_tokens, messages], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def _build_messages(self, user_message, board_context, is_problem_query, responsible_person_info,
+                        history_session):
+        """시스템 프롬프트 + 최근 대화 기록 + 사용자 메시지"""
+        # 시스템 프롬프트 설정
+        system_prompt = """당신은 사내 업무를 도와주는 AI 어시스턴트입니다. 
 사내 게시판의 정보를 참고하여 정확하고 도움이 되는 답변을 제공하세요.
 게시판 정보가 제공된 경우, 그 정보를 바탕으로 답변하되, 
 정보가 없는 경우 일반적인 업무 지식으로 답변하세요.
@@ -29,61 +58,157 @@ class ChatBot:
 1. 게시글의 작성자 정보가 있는 경우, 답변에 반드시 작성자 이름을 포함하세요. 
    예: "박선미과장님이 이렇게 답변을 해주었다"와 같이 작성자 이름을 명시하세요.
 2. 덧글 정보가 있는 경우, 덧글 작성자와 내용을 함께 언급하세요."""
-            
-            # 문제 관련 질문인 경우 추가 지침
-            if is_problem_query:
-                system_prompt += """
+        
+        # 문제 관련 질문인 경우 추가 지침
+        if is_problem_query:
+            system_prompt += """
 3. 문제나 어려운 케이스에 대한 질문일 때는, 비슷한 기간 내의 게시글 중에서 
    덧글 수가 많은 게시글을 우선적으로 참고하여 답변하세요. 
    덧글이 많이 달린 게시글일수록 논란이 되었던 문제이거나 복잡한 케이스일 가능성이 높습니다.
    하지만 기간 필터링이나 다른 조건보다 우선하지 말고, 단지 참고 우선순위만 높이세요."""
-            
-            # 담당자 정보가 있는 경우 추가
-            if responsible_person_info:
-                person_name = responsible_person_info.get('name', '')
-                last_activity = responsible_person_info.get('last_activity', '')
-                system_prompt += f"""
+        
+        # 담당자 정보가 있는 경우 추가
+        if responsible_person_info:
+            person_name = responsible_person_info.get('name', '')
+            last_activity = responsible_person_info.get('last_activity', '')
+            system_prompt += f"""
 4. 담당자 문의에 대한 답변:
    - 최근 담당자: {person_name}
    - 최근 활동일: {last_activity}
    위 정보를 바탕으로 해당 카테고리/업체에 대한 담당자를 안내하세요."""
+        
+        # 컨텍스트가 있으면 추가 (토큰 예산을 넘으면 게시글 단위로 줄임)
+        if board_context:
+            board_context = fit_context(board_context, self.context_token_budget)
+            system_prompt += f"\n\n[사내 게시판 정보]\n{board_context}\n\n위 정보를 참고하여 답변하세요."
+        
+        messages = [
+            {"role": "system", "content": system_prompt}
+        ]
+        
+        # 대화 기록 추가
+        if history_session is not None:
+            messages.extend(self.history_store.get(history_session))  # 세션별 최근 메시지만 보관
+        
+        # 사용자 메시지 추가
+        messages.append({"role": "user", "content": user_message})
+        return messages
+    
+    def _cached_response(self, user_message, cache_key, history_session):
+        if cache_key is None or self.response_cache is None:
+            return None
+        cached = self.response_cache.get(cache_key)
+        if cached is not None:
+            logger.info("응답 캐시 적중")
+            if history_session is not None:
+                self._record_exchange(history_session, user_message, cached)
+        return cached
+    
+    def _finish_response(self, user_message, assistant_message, cache_key, history_session):
+        # 대화 기록 업데이트
+        if history_session is not None:
+            self._record_exchange(history_session, user_message, assistant_message)
+        
+        if cache_key is not None and self.response_cache is not None and assistant_message:
+            self.response_cache.put(cache_key, assistant_message)
+    
+    def get_response(self, user_message, board_context="", is_problem_query=False, responsible_person_info=None,
+                     record_history=True, cache_key=None, stream=False, session_id=DEFAULT_SESSION_ID):
+        """
+        사용자 메시지에 대한 응답 생성
+
+        대화 기록은 session_id별로 참고하고 남기며,
+        record_history=False이면 대화 기록을 참고하지도, 남기지도 않습니다 (내부 추출용 호출).
+        cache_key가 주어지면 응답 캐시를 먼저 확인하고, 정상 응답만 캐시에 저장합니다.
+        stream=True이면 응답 조각(str)을 생성되는 대로 내보내는 제너레이터를 반환합니다.
+        스트리밍 중 오류는 응답 조각으로 내보내지 않고 제너레이터에서 예외로 올라갑니다 (라우트가 error 이벤트로 전달).
+        """
+        history_session = session_id if record_history else None
+        if stream:
+            return self._stream_response(user_message, board_context, is_problem_query,
+                                         responsible_person_info, history_session, cache_key)
+        
+        cached = self._cached_response(user_message, cache_key, history_session)
+        if cached is not None:
+            return cached
+        
+        try:
+            messages = self._build_messages(user_message, board_context, is_problem_query,
+                                            responsible_person_info, history_session)
             
-            # 컨텍스트가 있으면 추가
-            if board_context:
-                system_prompt += f"\n\n[사내 게시판 정보]\n{board_context[:3000]}\n\n위 정보를 참고하여 답변하세요."
-            
-            messages = [
-                {"role": "system", "content": system_prompt}
-            ]
-            
-            # 대화 기록 추가
-            messages.extend(self.conversation_history[-10:])  # 최근 10개만 유지
-            
-            # 사용자 메시지 추가
-            messages.append({"role": "user", "content": user_message})
-            
-            # OpenAI API 호출
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=messages,
-                temperature=0.7,
-                max_tokens=1000
+            # OpenAI API 호출 (일시적 오류는 재시도, 같은 요청이 진행 중이면 그 결과를 함께 사용)
+            response = self.resilience.call(
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=self.max_tokens
+                ),
+                key=self._request_key(messages)
             )
             
             assistant_message = response.choices[0].message.content
-            
-            # 대화 기록 업데이트
-            self.conversation_history.append({"role": "user", "content": user_message})
-            self.conversation_history.append({"role": "assistant", "content": assistant_message})
-            
+            self._finish_response(user_message, assistant_message, cache_key, history_session)
             return assistant_message
             
         except Exception as e:
             logger.error(f"응답 생성 중 오류: {str(e)}")
             return f"죄송합니다. 오류가 발생했습니다: {str(e)}"
     
-    def clear_history(self):
-        """대화 기록 초기화"""
-        self.conversation_history = []
+    def _stream_response(self, user_message, board_context, is_problem_query, responsible_person_info,
+                         history_session, cache_key):
+        """스트리밍 응답 생성 (첫 토큰 시간과 전체 시간을 따로 기록)"""
+        cached = self._cached_response(user_message, cache_key, history_session)
+        if cached is not None:
+            yield cached
+            return
+        
+        started = time.perf_counter()
+        first_token_at = None
+        parts = []
+        try:
+            messages = self._build_messages(user_message, board_context, is_problem_query,
+                                            responsible_person_info, history_session)
+            
+            # OpenAI API 스트리밍 호출 (첫 조각을 보내기 전의 연결 단계만 재시도, 요청 합치기 없음)
+            response = self.resilience.call(
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=self.max_tokens,
+                    stream=True
+                )
+            )
+            
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                parts.append(delta)
+                yield delta
+            
+        except Exception as e:
+            logger.error(f"스트리밍 응답 생성 중 오류: {str(e)}")
+            raise
+        
+        total_ms = (time.perf_counter() - started) * 1000
+        ttfb_ms = (first_token_at - started) * 1000 if first_token_at else total_ms
+        logger.info(f"스트리밍 응답 완료: 첫 토큰 {ttfb_ms:.0f}ms, 전체 {total_ms:.0f}ms")
+        self._finish_response(user_message, ''.join(parts), cache_key, history_session)
+    
+    def _record_exchange(self, session_id, user_message, assistant_message):
+        self.history_store.append(session_id, [
+            {"role": "user", "content": user_message},
+            {"role": "assistant", "content": assistant_message},
+        ])
+    
+    def clear_history(self, session_id=DEFAULT_SESSION_ID):
+        """세션의 대화 기록 초기화"""
+        self.history_store.clear(session_id)
         logger.info("대화 기록 초기화")
 
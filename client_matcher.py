@@ -0,0 +1,249 @@
+"""
+고객사 이름 감지 모듈
+사용자 메시지에서 고객사 이름을 Aho-Corasick 오토마톤으로 한 번에 찾고,
+정확히 일치하지 않으면 한글 자모 n-gram 유사도로 근사 매칭합니다.
+"""
+import re
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# 이름 앞의 장식 문자 ('*', '#', '>', '//', '-', '..')
+_DECORATION_RE = re.compile(r'^[\s*#>/\-.]+')
+# 일정/분류 태그 ('[12.01]', '[학원 12.01]', '[파트너]')
+_BRACKET_RE = re.compile(r'\[[^\]]*\]')
+# 괄호 부기 ('(8개월단기)', '(구 국제영어대학원대학교)')
+_PAREN_RE = re.compile(r'\([^)]*\)')
+# 예전 이름 별칭: '(구 로얄아이비)', '(구인천재능대학교)'
+_FORMER_NAME_RE = re.compile(r'\(구\s*([^)]+)\)')
+# 예전/현재 이름 병기: '(구)메디코어 (현)파인드메드', '구)유니윌 현)아이티윌'
+_FORMER_CURRENT_RE = re.compile(r'^\(?구\)\s*(.+?)\s*\(?현\)\s*(.+)$')
+# 법인 형태 표기
+_CORPORATE_RE = re.compile(r'주식회사|사단법인|\((?:주|재|사)\)')
+_SPACE_RE = re.compile(r'\s+')
+
+# 별칭 최소 길이 (한 글자 별칭은 오탐이 많음)
+MIN_ALIAS_LENGTH = 2
+# 메시지 단어가 고객사 이름의 일부인지 확인할 때의 최소 단어 길이 (기존 동작과 동일)
+MIN_WORD_LENGTH = 3
+# 근사 매칭에 사용하는 자모 n-gram 크기
+FUZZY_NGRAM = 3
+
+# 한글 음절 분해용 자모 표 (초성 19, 중성 21, 종성 28)
+_CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_JUNGSEONG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+_JONGSEONG = ' ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ'
+# 근사 매칭 전에 단어 끝에서 떼어 내는 조사/어미
+_PARTICLE_RE = re.compile(r'(?:에서|에게|한테|으로|이랑|관련|쪽|측|의|은|는|이|가|을|를|에|와|과|도|로|랑)$')
+
+
+def _collapse(text: str) -> str:
+    return _SPACE_RE.sub(' ', text).strip(' .')
+
+
+def normalize_client_name(name: str) -> str:
+    """장식 문자, 태그, 괄호 부기를 제거한 고객사 이름"""
+    text = _BRACKET_RE.sub(' ', name)
+    text = _DECORATION_RE.sub('', text)
+    text = _PAREN_RE.sub(' ', text)
+    return _collapse(text)
+
+
+def client_name_aliases(name: str) -> List[str]:
+    """고객사 이름의 검색용 별칭 (원래 이름, 정규화 이름, 예전/현재 이름, 법인 표기 제거)"""
+    base = _DECORATION_RE.sub('', _collapse(_BRACKET_RE.sub(' ', name)))
+    candidates = [name, normalize_client_name(name)]
+
+    former_current = _FORMER_CURRENT_RE.match(base)
+    if former_current:
+        candidates.extend(former_current.groups())
+    candidates.extend(_FORMER_NAME_RE.findall(base))
+
+    aliases: List[str] = []
+    for candidate in candidates:
+        for variant in (candidate, _CORPORATE_RE.sub(' ', candidate)):
+            variant = _collapse(variant).lower()
+            for alias in (variant, variant.replace(' ', '')):
+                if len(alias) >= MIN_ALIAS_LENGTH and alias not in aliases:
+                    aliases.append(alias)
+    return aliases
+
+
+def decompose_hangul(text: str) -> str:
+    """한글 음절을 초성/중성/종성 자모로 분해 (그 외 문자는 그대로)"""
+    chars = []
+    for char in text:
+        code = ord(char) - 0xAC00
+        if 0 <= code < 11172:
+            chars.append(_CHOSEONG[code // 588])
+            chars.append(_JUNGSEONG[(code % 588) // 28])
+            if code % 28:
+                chars.append(_JONGSEONG[code % 28])
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+
+def jamo_ngrams(text: str, n: int = FUZZY_NGRAM) -> Set[str]:
+    """공백을 제거하고 자모로 분해한 문자열의 n-gram 집합"""
+    jamo = decompose_hangul(text.replace(' ', '').lower())
+    if len(jamo) <= n:
+        return {jamo} if jamo else set()
+    return {jamo[i:i + n] for i in range(len(jamo) - n + 1)}
+
+
+class AhoCorasick:
+    """여러 패턴을 텍스트 1회 순회로 찾는 Aho-Corasick 오토마톤"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._build_failure_links()
+
+    def _add(self, pattern: str):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(시작 위치, 패턴 번호)를 순서대로 반환"""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern_id in output[node]:
+                yield end - len(self.patterns[pattern_id]) + 1, pattern_id
+
+
+class ClientNameMatcher:
+    """
+    고객사 이름 감지기
+
+    데이터 로드 시 1회 생성하며, 메시지 1회 순회로 가장 잘 맞는 고객사를 찾습니다.
+    """
+
+    def __init__(self, client_names: Iterable[str]):
+        self.client_names = sorted({name for name in client_names if name})
+
+        # 별칭 -> 고객사 번호 (같은 별칭은 정렬 순서상 앞 고객사 우선)
+        alias_owner: Dict[str, int] = {}
+        # 기존 동작('메시지 단어가 고객사 이름의 일부')을 위한 부분 문자열 -> 고객사 번호
+        self._substrings: Dict[str, int] = {}
+        for index, name in enumerate(self.client_names):
+            for alias in client_name_aliases(name):
+                alias_owner.setdefault(alias, index)
+                for start in range(len(alias)):
+                    for end in range(start + MIN_WORD_LENGTH, len(alias) + 1):
+                        self._substrings.setdefault(alias[start:end], index)
+
+        self._automaton = AhoCorasick(alias_owner)
+        self._alias_owner = [alias_owner[alias] for alias in self._automaton.patterns]
+
+        # 근사 매칭용 자모 n-gram 역색인 (n-gram -> 별칭 번호)
+        self._alias_grams: List[Set[str]] = []
+        self._gram_index: Dict[str, List[int]] = {}
+        for alias_id, alias in enumerate(self._automaton.patterns):
+            grams = jamo_ngrams(alias)
+            self._alias_grams.append(grams)
+            for gram in grams:
+                self._gram_index.setdefault(gram, []).append(alias_id)
+
+    def match(self, message: str) -> Optional[str]:
+        """
+        메시지에서 고객사 이름 찾기
+
+        1. 메시지에 포함된 별칭 중 가장 긴 것 (같으면 앞에 나온 것)
+        2. 없으면 기존 동작처럼 3글자 이상 단어가 고객사 이름의 일부인 경우
+
+        Returns:
+            고객사 이름 (원래 표기), 없으면 None
+        """
+        if not message or not self.client_names:
+            return None
+
+        text = message.lower()
+        best: Optional[Tuple[int, int, int]] = None
+        for start, pattern_id in self._automaton.iter_matches(text):
+            key = (-len(self._automaton.patterns[pattern_id]), start,
+                   self._alias_owner[pattern_id])
+            if best is None or key < best:
+                best = key
+        if best is not None:
+            return self.client_names[best[2]]
+
+        owners = [self._substrings[word] for word in text.split()
+                  if len(word) >= MIN_WORD_LENGTH and word in self._substrings]
+        if owners:
+            return self.client_names[min(owners)]
+        return None
+
+    def _fuzzy_spans(self, message: str) -> List[str]:
+        """근사 매칭 대상: 단어, 조사를 뗀 단어, 연속한 두 단어"""
+        words = [word.strip('.,!?~"\'()[]') for word in message.lower().split()]
+        words = [word for word in words if word]
+        spans = []
+        for i, word in enumerate(words):
+            spans.append(word)
+            stripped = _PARTICLE_RE.sub('', word)
+            if stripped != word:
+                spans.append(stripped)
+            if i + 1 < len(words):
+                spans.append(word + _PARTICLE_RE.sub('', words[i + 1]))
+        return [span for span in spans if len(span) >= MIN_ALIAS_LENGTH]
+
+    def fuzzy_match(self, message: str) -> Tuple[Optional[str], float]:
+        """
+        자모 n-gram Jaccard 유사도로 가장 비슷한 고객사 찾기
+
+        오타('블루타이가')나 띄어쓰기 차이를 허용합니다.
+
+        Returns:
+            (고객사 이름, 신뢰도 0~1). 후보가 없으면 (None, 0.0)
+        """
+        if not message or not self.client_names:
+            return None, 0.0
+
+        best_score = 0.0
+        best_key: Optional[Tuple[int, int]] = None
+        for span in self._fuzzy_spans(message):
+            grams = jamo_ngrams(span)
+            overlap: Dict[int, int] = {}
+            for gram in grams:
+                for alias_id in self._gram_index.get(gram, ()):
+                    overlap[alias_id] = overlap.get(alias_id, 0) + 1
+            for alias_id, shared in overlap.items():
+                score = shared / (len(grams) + len(self._alias_grams[alias_id]) - shared)
+                key = (self._alias_owner[alias_id], alias_id)
+                if score > best_score or (score == best_score and best_key and key < best_key):
+                    best_score, best_key = score, key
+
+        if best_key is None:
+            return None, 0.0
+        return self.client_names[best_key[0]], best_score
@@ -12,11 +12,69 @@ OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다. .env 파일을 확인하세요.")
 
+# OpenAI 호환 API 주소 (로컬 가짜 서버 테스트 등, 비어 있으면 기본 API 사용)
+OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None
+
 BOARD_URL = os.getenv('BOARD_URL', 'https://ppm.malgn.co.kr/')
 # CSV 기반으로 변경되어 더 이상 필요 없지만 하위 호환성을 위해 유지
 BOARD_EMAIL = os.getenv('BOARD_EMAIL', '')
 BOARD_PASSWORD = os.getenv('BOARD_PASSWORD', '')
 
+# 비동기(ASGI) 경로의 OpenAI 호출 설정
+OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '32'))
+OPENAI_QUEUE_TIMEOUT_SECONDS = float(os.getenv('OPENAI_QUEUE_TIMEOUT_SECONDS', '10'))
+OPENAI_TIMEOUT_SECONDS = float(os.getenv('OPENAI_TIMEOUT_SECONDS', '60'))
+OPENAI_CONNECT_TIMEOUT_SECONDS = float(os.getenv('OPENAI_CONNECT_TIMEOUT_SECONDS', '5'))
+OPENAI_MAX_CONNECTIONS = int(os.getenv('OPENAI_MAX_CONNECTIONS', '100'))
+
+# OpenAI 호출 재시도 / 회로 차단 설정 (동기, 비동기 경로 공통)
+# - 429, 5xx, 시간 초과, 연결 오류만 재시도 (최초 호출 포함 OPENAI_MAX_ATTEMPTS회)
+# - 일시적 오류가 CIRCUIT_FAILURE_THRESHOLD번 연속되면 CIRCUIT_RESET_SECONDS 동안 호출 차단
+OPENAI_MAX_ATTEMPTS = int(os.getenv('OPENAI_MAX_ATTEMPTS', '3'))
+OPENAI_RETRY_BASE_DELAY = float(os.getenv('OPENAI_RETRY_BASE_DELAY', '0.5'))
+OPENAI_RETRY_MAX_DELAY = float(os.getenv('OPENAI_RETRY_MAX_DELAY', '8'))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', '5'))
+CIRCUIT_RESET_SECONDS = float(os.getenv('CIRCUIT_RESET_SECONDS', '30'))
+
+# 응답 생성 모델 설정
+CHAT_MODEL = os.getenv('CHAT_MODEL', 'gpt-4')
+CHAT_MAX_TOKENS = int(os.getenv('CHAT_MAX_TOKENS', '1000'))
+# 게시판 컨텍스트 토큰 예산
+# - CONTEXT_TOKEN_BUDGET을 지정하지 않으면 모델 컨텍스트 창 - 응답 토큰 - CONTEXT_RESERVED_TOKENS
+# - CONTEXT_RESERVED_TOKENS: 시스템 지침, 대화 기록, 사용자 메시지 몫
+CONTEXT_TOKEN_BUDGET = int(os.getenv('CONTEXT_TOKEN_BUDGET', '0')) or None
+CONTEXT_RESERVED_TOKENS = int(os.getenv('CONTEXT_RESERVED_TOKENS', '2500'))
+# 게시글마다 컨텍스트에 함께 넣을 댓글 수
+CONTEXT_COMMENTS_PER_POST = int(os.getenv('CONTEXT_COMMENTS_PER_POST', '2'))
+
+# 고객사 근사 매칭 신뢰도 기준
+# - CLIENT_FUZZY_THRESHOLD 이상: 근사 매칭 결과를 그대로 사용 (GPT 호출 없음)
+# - CLIENT_LLM_FALLBACK_MIN_SCORE 이상 ~ 기준 미만: 애매한 경우에만 GPT로 추출
+# - 그 미만: 고객사 언급이 없는 것으로 판단
+CLIENT_FUZZY_THRESHOLD = float(os.getenv('CLIENT_FUZZY_THRESHOLD', '0.6'))
+CLIENT_LLM_FALLBACK_MIN_SCORE = float(os.getenv('CLIENT_LLM_FALLBACK_MIN_SCORE', '0.35'))
+
+# 응답 캐시 설정 (같은 질문의 GPT 재호출 방지)
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(8 * 1024 * 1024)))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', '600'))
+
+# 세션별 대화 기록 저장소 설정
+# - memory: 프로세스 메모리 (단일 프로세스)
+# - sqlite: HISTORY_DB_PATH 파일 공유 (gunicorn 등 다중 워커 프로세스)
+HISTORY_BACKEND = os.getenv('HISTORY_BACKEND', 'memory')
+HISTORY_DB_PATH = os.getenv('HISTORY_DB_PATH', os.path.join(os.path.dirname(__file__), 'chat_history.db'))
+HISTORY_MAX_MESSAGES = int(os.getenv('HISTORY_MAX_MESSAGES', '10'))
+HISTORY_IDLE_TTL_SECONDS = float(os.getenv('HISTORY_IDLE_TTL_SECONDS', '3600'))
+HISTORY_MAX_SESSIONS = int(os.getenv('HISTORY_MAX_SESSIONS', '10000'))
+
+# CSV 데이터 새로고침 설정
+# - DATA_RELOAD_POLL_SECONDS: CSV 파일 변경 확인 주기 (0이면 자동 새로고침 안 함)
+# - DATA_RELOAD_WAIT_SECONDS: /api/refresh-board에 wait를 준 경우 최대 대기 시간
+DATA_RELOAD_POLL_SECONDS = float(os.getenv('DATA_RELOAD_POLL_SECONDS', '30'))
+DATA_RELOAD_WAIT_SECONDS = float(os.getenv('DATA_RELOAD_WAIT_SECONDS', '120'))
+# 서버 시작 시 CSV 대신 불러올 바이너리 스냅샷 (python snapshot.py로 생성, 비우면 사용 안 함)
+DATA_SNAPSHOT_PATH = os.getenv('DATA_SNAPSHOT_PATH', os.path.join(os.path.dirname(__file__), 'data_snapshot.bin'))
+
 # 고객사별 게시판 PID 매핑
 CLIENT_BOARD_PIDS = {
     "블루타이거": 1459,
@@ -26,6 +84,16 @@ CLIENT_BOARD_PIDS = {
     # 추가 고객사는 여기에 추가 가능
 }
 
+# 게시판 병렬 크롤링 설정 (python crawl_scheduler.py)
+# - CRAWL_MAX_BOARDS: 동시에 크롤링할 게시판 수, CRAWL_BOARD_WORKERS: 게시판별 동시 상세 페이지 요청 수
+# - CRAWL_RATE_LIMIT: 전체 크롤러가 공유하는 초당 요청 수 (0이면 제한 없음)
+# - CRAWL_STATE_DB_PATH: 게시글별 마지막으로 본 댓글 수/본문 해시와 크롤링 기록을 저장하는 SQLite 파일
+CRAWL_BACKEND = os.getenv('CRAWL_BACKEND', 'http')
+CRAWL_MAX_BOARDS = int(os.getenv('CRAWL_MAX_BOARDS', '4'))
+CRAWL_BOARD_WORKERS = int(os.getenv('CRAWL_BOARD_WORKERS', '2'))
+CRAWL_RATE_LIMIT = float(os.getenv('CRAWL_RATE_LIMIT', '20'))
+CRAWL_STATE_DB_PATH = os.getenv('CRAWL_STATE_DB_PATH', os.path.join(os.path.dirname(__file__), 'crawl_state.db'))
+
 # PID를 기반으로 게시판 URL 생성 함수
 def get_board_url_by_pid(pid):
     """PID를 기반으로 게시판 URL 생성"""
@@ -0,0 +1,131 @@
+"""
+게시판 컨텍스트 토큰 예산 관리 모듈
+모델 컨텍스트 창에 맞춰 게시글 블록을 순위대로 통째로 채워 넣습니다.
+tiktoken이 설치되어 있으면 실제 토크나이저를, 없으면 한국어 기준 추정치를 사용합니다.
+"""
+from typing import Iterable, List, NamedTuple, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+except ImportError:  # 선택 의존성
+    tiktoken = None
+
+# 모델별 컨텍스트 창 (토큰)
+MODEL_CONTEXT_WINDOWS = {
+    'gpt-4': 8192,
+    'gpt-4-32k': 32768,
+    'gpt-4-turbo': 128000,
+    'gpt-4o': 128000,
+    'gpt-4o-mini': 128000,
+    'gpt-3.5-turbo': 16385,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# 게시글 블록 구분자 (CSVDataLoader.get_posts_text와 동일)
+POST_SEPARATOR = "\n---\n"
+
+# 남은 예산이 이보다 작으면 더 작은 게시글을 찾지 않고 중단
+MIN_BLOCK_TOKENS = 32
+
+# cl100k 토크나이저 기준 평균 토큰 수 (한국어 게시판 데이터로 보정, 약간 과대 추정)
+# 한글 음절 1개 ~ 1.3토큰, 영문/숫자/기호 1글자 ~ 0.35토큰, 공백/줄바꿈 ~ 0.2토큰
+_WIDE_CHAR_TOKENS = 1.3
+_ASCII_CHAR_TOKENS = 0.35
+_SPACE_TOKENS = 0.2
+
+_encoding = None
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        _encoding = tiktoken.get_encoding('cl100k_base')
+    return _encoding
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 토큰 수 추정
+
+    UTF-8 바이트 수와 글자 수의 차이로 한글 등 3바이트 문자 수를 구하므로
+    글자별 파이썬 반복 없이 계산합니다.
+    """
+    chars = len(text)
+    wide = (len(text.encode('utf-8')) - chars) // 2
+    spaces = text.count(' ') + text.count('\n')
+    narrow = max(chars - wide - spaces, 0)
+    return int(wide * _WIDE_CHAR_TOKENS + narrow * _ASCII_CHAR_TOKENS + spaces * _SPACE_TOKENS) + 1
+
+
+def count_tokens(text: str) -> int:
+    """토큰 수 (tiktoken이 있으면 정확한 값, 없으면 추정치)"""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return estimate_tokens(text)
+
+
+def context_token_budget(model: str, response_tokens: int, reserved_tokens: int) -> int:
+    """
+    게시판 컨텍스트에 쓸 수 있는 토큰 수
+
+    모델 컨텍스트 창에서 응답(max_tokens)과 시스템 지침/대화 기록/사용자 메시지 몫을 뺀 값
+    """
+    window = MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+    return max(window - response_tokens - reserved_tokens, MIN_BLOCK_TOKENS)
+
+
+class PackedContext(NamedTuple):
+    text: str
+    blocks: int
+    tokens: int
+    skipped: int
+
+
+def pack_blocks(blocks: Iterable[str], token_budget: int,
+                separator: str = POST_SEPARATOR) -> PackedContext:
+    """
+    순위순 블록을 예산 안에서 통째로 채우기
+
+    들어가지 않는 블록은 건너뛰고 다음 블록을 시도하며, 남은 예산이
+    MIN_BLOCK_TOKENS보다 작아지면 나머지 블록은 만들지도 않고 중단합니다.
+    """
+    separator_tokens = count_tokens(separator)
+    parts: List[str] = []
+    used = 0
+    skipped = 0
+    for block in blocks:
+        cost = count_tokens(block) + (separator_tokens if parts else 0)
+        if used + cost <= token_budget:
+            parts.append(block)
+            used += cost
+        else:
+            skipped += 1
+        if token_budget - used < MIN_BLOCK_TOKENS:
+            break
+    return PackedContext(separator.join(parts), len(parts), used, skipped)
+
+
+def fit_context(text: str, token_budget: Optional[int], separator: str = POST_SEPARATOR) -> str:
+    """
+    이미 만들어진 컨텍스트 문자열을 예산에 맞추기
+
+    예산 안이면 그대로, 넘으면 블록 단위로 다시 채웁니다.
+    블록 하나도 들어가지 않으면 첫 블록을 예산 비율만큼 자릅니다.
+    """
+    if not text or token_budget is None:
+        return text
+    tokens = count_tokens(text)
+    if tokens <= token_budget:
+        return text
+
+    packed = pack_blocks(text.split(separator), token_budget, separator)
+    if packed.text:
+        return packed.text
+    first = text.split(separator, 1)[0]
+    return first[:max(len(first) * token_budget // max(count_tokens(first), 1), 0)]
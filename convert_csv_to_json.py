@@ -2,12 +2,20 @@
 CSV 데이터를 JSON으로 변환하는 스크립트
 Cloudflare Pages Functions에서 사용할 수 있도록 변환합니다.
 """
+import argparse
+import collections
 import csv
+import io
 import json
 import os
 import sys
-from datetime import datetime
 import re
+import sqlite3
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import parsers
+from parsers import clean_html
 
 # CSV 필드 크기 제한 증가 (Windows 호환)
 try:
@@ -15,135 +23,509 @@ try:
 except OverflowError:
     csv.field_size_limit(2147483647)  # Windows에서 사용 가능한 최대값
 
-def clean_html(text):
-    """HTML 태그 제거 및 텍스트 정리"""
-    if not text:
-        return ""
-    # HTML 태그 제거
-    text = re.sub(r'<[^>]+>', '', text)
-    # HTML 엔티티 제거
-    text = text.replace('&nbsp;', ' ').replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-    # 공백 정리
-    text = ' '.join(text.split())
-    return text.strip()
+# 게시글/댓글 필드 순서 (read_posts / read_comments 결과와 같음)
+POST_FIELDS = ['id', 'name', 'writer', 'subject', 'content', 'reg_date', 'comm_cnt', 'hit_cnt']
+COMMENT_FIELDS = ['id', 'post_id', 'writer', 'content', 'reg_date']
+
+# 엣지 함수용 번들 설정
+BUNDLE_VERSION = 1
+BUNDLE_COMMENT_FIELDS = ['writer', 'content', 'reg_date']
+BUNDLE_TOP_POSTS = 30  # 필터 없는 질문에 사용하는 전체 상위 게시글 수
+COMMENT_SHARD_BYTES = 16 * 1024  # 댓글 샤드 하나의 대략적인 크기
+
+# 병렬 변환 설정 (--workers)
+CHUNK_BYTES = 4 * 1024 * 1024  # 프로세스 하나가 한 번에 변환하는 CSV 구간 크기
+SCAN_BLOCK_BYTES = 1024 * 1024  # 행 경계를 찾을 때 읽는 블록 크기
 
 def parse_date(date_str):
-    """날짜 문자열 파싱"""
-    if not date_str:
-        return None
-    
-    date_formats = [
-        '%Y-%m-%d %H:%M:%S',
-        '%Y-%m-%d',
-        '%Y/%m/%d %H:%M:%S',
-        '%Y/%m/%d'
-    ]
-    
-    for fmt in date_formats:
-        try:
-            return datetime.strptime(date_str.strip(), fmt).isoformat()
-        except:
-            continue
-    
-    return date_str
+    """날짜 문자열 파싱 (ISO 형식으로 변환, 실패 시 원본 유지)"""
+    parsed = parsers.parse_date(date_str) if date_str else None
+    if parsed is None:
+        return date_str or None
+    return parsed.isoformat()
 
-def convert_posts_csv(input_file, output_file):
-    """원글 CSV를 JSON으로 변환"""
-    posts = []
-    
-    print(f"원글 CSV 파일 읽는 중: {input_file}")
+def make_post(row):
+    """원글 CSV 행에서 필요한 필드만 추출하고 정리"""
+    return {
+        'id': row.get('id', ''),
+        'name': row.get('name', ''),
+        'writer': row.get('writer', ''),
+        'subject': clean_html(row.get('subject', '[제목 없음]')),
+        'content': clean_html(row.get('content', ''))[:500],  # 내용은 500자로 제한
+        'reg_date': parse_date(row.get('reg_date', '')),
+        'comm_cnt': int(row.get('comm_cnt', 0) or 0),
+        'hit_cnt': int(row.get('hit_cnt', 0) or 0),
+    }
+
+def make_comment(row):
+    """댓글 CSV 행에서 필요한 필드만 추출하고 정리"""
+    return {
+        'id': row.get('id', ''),
+        'post_id': row.get('post_id', ''),
+        'writer': row.get('writer', ''),
+        'content': clean_html(row.get('content', ''))[:300],  # 댓글은 300자로 제한
+        'reg_date': parse_date(row.get('reg_date', '')),
+    }
+
+def read_posts(input_file):
+    """원글 CSV를 한 행씩 읽어 게시글 dict를 차례로 반환 (전체를 메모리에 올리지 않음)"""
     with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            # 필요한 필드만 추출하고 정리
-            post = {
-                'id': row.get('id', ''),
-                'name': row.get('name', ''),
-                'writer': row.get('writer', ''),
-                'subject': clean_html(row.get('subject', '[제목 없음]')),
-                'content': clean_html(row.get('content', ''))[:500],  # 내용은 500자로 제한
-                'reg_date': parse_date(row.get('reg_date', '')),
-                'comm_cnt': int(row.get('comm_cnt', 0) or 0),
-                'hit_cnt': int(row.get('hit_cnt', 0) or 0),
-            }
-            posts.append(post)
-    
-    print(f"총 {len(posts)}개의 게시글 변환 완료")
-    
-    # JSON 파일로 저장
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(posts, f, ensure_ascii=False, indent=2)
-    
+        for row in csv.DictReader(f):
+            yield make_post(row)
+
+def read_comments(input_file):
+    """댓글 CSV를 한 행씩 읽어 댓글 dict를 차례로 반환"""
+    with open(input_file, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield make_comment(row)
+
+def record_offsets(input_file, chunk_bytes):
+    """
+    CSV 파일을 chunk_bytes 안팎의 구간으로 나누는 행 경계 위치 목록 [헤더 끝, ..., 파일 끝]
+
+    따옴표 수의 홀짝으로 줄바꿈이 따옴표 안(여러 줄 필드)인지 판단하므로,
+    파일을 블록 단위로 한 번 훑기만 하고 CSV 파싱은 하지 않습니다.
+    """
+    offsets = []
+    target = 0  # 이 위치 이후 첫 행 경계가 다음 구간의 시작 (처음은 헤더 끝)
+    quoted = False  # 블록 시작 위치가 따옴표 안인지
+    pos = 0
+    with open(input_file, 'rb') as f:
+        while True:
+            block = f.read(SCAN_BLOCK_BYTES)
+            if not block:
+                break
+            cur, q = 0, quoted
+            while target < pos + len(block):
+                start = max(target - pos, cur)
+                q ^= block.count(b'"', cur, start) & 1
+                nl = block.find(b'\n', start)
+                if nl < 0:
+                    cur = start
+                    break
+                q ^= block.count(b'"', start, nl) & 1
+                cur = nl + 1
+                if q:
+                    # 따옴표 안 줄바꿈: 다음 줄바꿈부터 다시 확인
+                    target = pos + cur
+                else:
+                    offsets.append(pos + cur)
+                    target = pos + cur + chunk_bytes
+            quoted = q ^ (block.count(b'"', cur) & 1)
+            pos += len(block)
+    if not offsets or offsets[-1] != pos:
+        # 마지막 행이 줄바꿈 없이 끝난 경우
+        offsets.append(pos)
+    return offsets
+
+def _read_header(input_file):
+    with open(input_file, 'r', encoding='utf-8') as f:
+        return next(csv.reader(f), None)
+
+def _convert_chunk(task):
+    """
+    프로세스 풀 작업: CSV 파일의 [start, end) 구간을 변환해 IndexBuilder 레코드 목록 반환
+
+    구간을 open()과 같은 줄바꿈 처리로 읽으므로 결과는 파일 전체를 한 번에 읽은 것과 같습니다.
+    """
+    input_file, start, end, fieldnames, kind = task
+    with open(input_file, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    text = io.TextIOWrapper(io.BytesIO(data), encoding='utf-8')
+    if kind == 'post':
+        return [_post_record(make_post(row)) for row in csv.DictReader(text, fieldnames=fieldnames)]
+    return [_comment_record(make_comment(row)) for row in csv.DictReader(text, fieldnames=fieldnames)]
+
+def convert_records_parallel(input_file, kind, executor, workers, chunk_bytes=CHUNK_BYTES):
+    """
+    CSV를 행 경계에 맞춘 구간으로 나눠 프로세스 풀에서 변환하고 레코드를 원래 순서대로 반환
+
+    kind: 'post' 또는 'comment'
+    동시에 진행하는 구간은 workers * 2개까지이므로 메모리 사용량은 파일 크기와 무관합니다.
+    """
+    fieldnames = _read_header(input_file)
+    if fieldnames is None:
+        return
+    offsets = record_offsets(input_file, chunk_bytes)
+    tasks = [(input_file, start, end, fieldnames, kind) for start, end in zip(offsets, offsets[1:])]
+    pending = collections.deque()
+    for task in tasks:
+        pending.append(executor.submit(_convert_chunk, task))
+        if len(pending) >= workers * 2:
+            yield from pending.popleft().result()
+    while pending:
+        yield from pending.popleft().result()
+
+def _json_text(value, level):
+    """json.dump(indent=2)로 저장했을 때 level 깊이에 놓이는 값의 텍스트"""
+    text = json.dumps(value, ensure_ascii=False, indent=2)
+    return text.replace('\n', '\n' + '  ' * level) if level else text
+
+def _compact(value):
+    """공백 없는 JSON 텍스트"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+def write_json_array(f, texts, level=0):
+    """
+    이미 만든 JSON 텍스트를 배열로 이어 쓰기 (json.dump(indent=2)와 같은 출력)
+
+    texts: level + 1 깊이로 만든 원소 텍스트 (_json_text)
+    반환값: 원소 수
+    """
+    pad = '  ' * (level + 1)
+    count = 0
+    for text in texts:
+        f.write(('[\n' if count == 0 else ',\n') + pad + text)
+        count += 1
+    f.write('\n' + '  ' * level + ']' if count else '[]')
+    return count
+
+def convert_posts_csv(input_file, output_file, index=None, executor=None, workers=1, chunk_bytes=CHUNK_BYTES):
+    """
+    원글 CSV를 JSON으로 변환
+
+    게시글은 IndexBuilder(임시 SQLite)에 쌓은 뒤 원래 순서대로 기록합니다. 같은 id의 행이 다시 나오면
+    (크롤러가 추가한 갱신 행) 나중 행이 처음 나온 위치의 게시글을 대신합니다 (CSVDataLoader와 같음).
+    index: 변환하면서 게시글을 함께 넣을 IndexBuilder (없으면 임시로 만듦)
+    executor: 행 변환을 나눠 맡길 프로세스 풀 (convert_records_parallel, 결과는 executor 없이 변환한 것과 같음)
+    chunk_bytes: executor가 있을 때 프로세스 하나가 맡는 CSV 구간 크기
+    반환값: 게시글 수
+    """
+    print(f"원글 CSV 파일 읽는 중: {input_file}")
+    builder = index if index is not None else IndexBuilder()
+    try:
+        if executor:
+            for i, record in enumerate(convert_records_parallel(input_file, 'post', executor, workers, chunk_bytes)):
+                builder.add_post_record(i, record)
+        else:
+            for i, post in enumerate(read_posts(input_file)):
+                builder.add_post(i, post)
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            count = write_json_array(f, (_json_text(dict(zip(POST_FIELDS, json.loads(row))), 1)
+                                         for row in builder.post_rows()))
+    finally:
+        if index is None:
+            builder.close()
+
+    print(f"총 {count}개의 게시글 변환 완료")
     print(f"JSON 파일 저장 완료: {output_file}")
-    return posts
+    return count
 
-def convert_comments_csv(input_file, output_file):
-    """댓글 CSV를 JSON으로 변환"""
-    comments = []
-    
+def convert_comments_csv(input_file, output_file, index=None, executor=None, workers=1, chunk_bytes=CHUNK_BYTES):
+    """
+    댓글 CSV를 JSON으로 변환 (한 행씩 읽어 바로 기록)
+
+    index: 변환하면서 댓글을 함께 넣을 IndexBuilder
+    executor: 행 변환을 나눠 맡길 프로세스 풀
+    chunk_bytes: executor가 있을 때 프로세스 하나가 맡는 CSV 구간 크기
+    반환값: 댓글 수
+    """
     print(f"댓글 CSV 파일 읽는 중: {input_file}")
-    with open(input_file, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            comment = {
-                'id': row.get('id', ''),
-                'post_id': row.get('post_id', ''),
-                'writer': row.get('writer', ''),
-                'content': clean_html(row.get('content', ''))[:300],  # 댓글은 300자로 제한
-                'reg_date': parse_date(row.get('reg_date', '')),
-            }
-            comments.append(comment)
-    
-    print(f"총 {len(comments)}개의 댓글 변환 완료")
-    
-    # JSON 파일로 저장
+
+    def texts():
+        if executor:
+            for i, record in enumerate(convert_records_parallel(input_file, 'comment', executor, workers, chunk_bytes)):
+                if index is not None:
+                    index.add_comment_record(i, record)
+                yield _json_text(dict(zip(COMMENT_FIELDS, json.loads(record[-1]))), 1)
+            return
+        for i, comment in enumerate(read_comments(input_file)):
+            if index is not None:
+                index.add_comment(i, comment)
+            yield _json_text(comment, 1)
+
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(comments, f, ensure_ascii=False, indent=2)
-    
+        count = write_json_array(f, texts())
+
+    print(f"총 {count}개의 댓글 변환 완료")
     print(f"JSON 파일 저장 완료: {output_file}")
-    return comments
-
-def create_indexed_data(posts, comments):
-    """검색을 위한 인덱스 데이터 생성"""
-    # 고객사별로 그룹화
-    clients = {}
-    for post in posts:
-        client_name = post.get('name', '')
-        if client_name not in clients:
-            clients[client_name] = []
-        clients[client_name].append(post)
-    
-    # 게시글 ID별 댓글 매핑
-    comments_by_post = {}
-    for comment in comments:
-        post_id = comment.get('post_id', '')
-        if post_id not in comments_by_post:
-            comments_by_post[post_id] = []
-        comments_by_post[post_id].append(comment)
-    
-    return {
-        'clients': clients,
-        'comments_by_post': comments_by_post,
-        'client_names': sorted(list(clients.keys()))
-    }
+    return count
+
+def month_key(reg_date):
+    """ISO 날짜 문자열의 월 버킷 키 (YYYY-MM, 알 수 없으면 빈 문자열)"""
+    if reg_date and re.match(r'^\d{4}-\d{2}', reg_date):
+        return reg_date[:7]
+    return ''
+
+def _post_record(post):
+    """IndexBuilder posts 테이블 행 (idx 제외, 빈 id는 NULL이라 중복으로 보지 않음)"""
+    return (post.get('id') or None, post.get('name', ''), month_key(post.get('reg_date')), post.get('reg_date'),
+            post.get('comm_cnt', 0), _compact([post.get(field) for field in POST_FIELDS]))
+
+def _comment_record(comment):
+    """IndexBuilder comments 테이블 행 (idx 제외)"""
+    return (comment.get('post_id', ''), comment.get('reg_date') or '',
+            _compact([comment.get(field) for field in COMMENT_FIELDS]))
+
+class IndexBuilder:
+    """
+    인덱스/번들을 메모리에 모으지 않고 만드는 빌더
+
+    변환 중 게시글/댓글을 한 번씩 받아 임시 SQLite 파일에 쌓고, 정렬과 그룹화는 SQLite에 맡겨
+    (메모리에 다 들어가지 않으면 임시 파일로 정렬) 결과를 순서대로 읽으면서
+    엣지 함수용 번들(manifest.json + 샤드)을 바로 기록합니다 (write_bundle).
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, work_dir=None):
+        self._tmp = tempfile.TemporaryDirectory(dir=work_dir)
+        self._conn = sqlite3.connect(os.path.join(self._tmp.name, 'index.db'))
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute("PRAGMA temp_store=FILE")
+        # row: 필드 순서대로 값만 담은 JSON 배열 (POST_FIELDS / COMMENT_FIELDS)
+        self._conn.execute(
+            "CREATE TABLE posts (idx INTEGER PRIMARY KEY, id TEXT UNIQUE, name TEXT, month TEXT, reg_date TEXT, "
+            "comm_cnt INTEGER, row TEXT)")
+        self._conn.execute(
+            "CREATE TABLE comments (idx INTEGER PRIMARY KEY, post_id TEXT, reg_date TEXT, row TEXT)")
+        self._posts = []
+        self._comments = []
+        self._prepared = False
+
+    def add_post(self, i, post):
+        """i번째 게시글 추가"""
+        self.add_post_record(i, _post_record(post))
+
+    def add_comment(self, i, comment):
+        """i번째 댓글 추가"""
+        self.add_comment_record(i, _comment_record(comment))
+
+    def add_post_record(self, i, record):
+        """i번째 게시글을 _post_record 결과로 추가 (다른 프로세스에서 만든 레코드용)"""
+        self._posts.append((i,) + record)
+        if len(self._posts) >= self.BATCH_SIZE:
+            self._flush()
+
+    def add_comment_record(self, i, record):
+        """i번째 댓글을 _comment_record 결과로 추가"""
+        self._comments.append((i,) + record)
+        if len(self._comments) >= self.BATCH_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._posts:
+            # 같은 id의 게시글이 다시 나오면 처음 나온 위치(idx)의 값을 바꿈
+            self._conn.executemany(
+                "INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+                "name = excluded.name, month = excluded.month, reg_date = excluded.reg_date, "
+                "comm_cnt = excluded.comm_cnt, row = excluded.row", self._posts)
+            self._posts = []
+        if self._comments:
+            self._conn.executemany("INSERT INTO comments VALUES (?, ?, ?, ?)", self._comments)
+            self._comments = []
+
+    def post_rows(self):
+        """게시글 값 배열 JSON (POST_FIELDS 순서)을 원래 순서대로 반환"""
+        self._flush()
+        for (row,) in self._conn.execute("SELECT row FROM posts ORDER BY idx"):
+            yield row
+
+    def _prepare(self):
+        """순위 테이블과 고객사 테이블 생성 (한 번만)"""
+        self._flush()
+        if self._prepared:
+            return
+        db = self._conn
+        # 댓글 수 내림차순 순위 (동률은 원래 순서), rowid가 순위
+        db.execute("CREATE TABLE ranked (rank INTEGER PRIMARY KEY, idx INTEGER, name TEXT, month TEXT)")
+        db.execute("INSERT INTO ranked (idx, name, month) "
+                   "SELECT idx, name, month FROM posts ORDER BY comm_cnt DESC, idx")
+        # 고객사별 첫 순위 (고객사 수 집계용)
+        db.execute("CREATE TABLE client_first (name TEXT PRIMARY KEY, first INTEGER)")
+        db.execute("INSERT INTO client_first SELECT name, MIN(rank) FROM ranked GROUP BY name")
+        self._prepared = True
+
+    def _counts(self):
+        """(게시글 수, 댓글 수, 고객사 수)"""
+        return tuple(self._conn.execute("SELECT COUNT(*) FROM %s" % table).fetchone()[0]
+                     for table in ('posts', 'comments', 'client_first'))
+
+    def write_bundle(self, out_dir, comment_shard_bytes=COMMENT_SHARD_BYTES):
+        """
+        엣지 함수용 번들을 out_dir에 기록, (게시글 수, 댓글 수, 고객사 수) 반환
+
+        manifest.json: 필드 목록, 고객사 목록(이름순)과 게시글 수, 전체 상위 게시글 위치,
+                       월 목록, 댓글 샤드별 게시글 ID 범위
+        posts/<고객사 번호>.json: 고객사 게시글 값 배열 목록 (순위 순서)
+        months/<YYYY-MM 또는 undated>.json: 그 월 게시글의 [고객사 번호, 샤드 안 위치, 등록일, 댓글 수, idx]
+                                            목록 (순위 순서, 게시글 내용 없이 위치만)
+        comments/<샤드 번호>.json: {게시글 ID: 댓글 값 배열 목록 (등록일 순)}, 게시글 ID 순으로 나눔
+        모든 파일은 공백 없이 기록하며, 게시글과 댓글은 각각 한 파일에만 들어갑니다.
+        """
+        self._prepare()
+        for sub in ('posts', 'months', 'comments'):
+            shard_dir = os.path.join(out_dir, sub)
+            os.makedirs(shard_dir, exist_ok=True)
+            # 이전 변환에서 남은 샤드 제거
+            for name in os.listdir(shard_dir):
+                if name.endswith('.json'):
+                    os.remove(os.path.join(shard_dir, name))
+
+        clients = self._write_client_shards(os.path.join(out_dir, 'posts'))
+        months = self._write_month_indexes(os.path.join(out_dir, 'months'))
+        comment_shards = self._write_comment_shards(os.path.join(out_dir, 'comments'), comment_shard_bytes)
+        top = self._conn.execute("SELECT b.client, b.pos FROM ranked r JOIN bundle_pos b ON b.idx = r.idx "
+                                 "ORDER BY r.rank LIMIT ?", (BUNDLE_TOP_POSTS,))
+
+        manifest = {
+            'version': BUNDLE_VERSION,
+            'post_fields': [field for field in POST_FIELDS if field != 'name'] + ['idx'],
+            'comment_fields': BUNDLE_COMMENT_FIELDS,
+            # [이름, 게시글 수], 번호가 posts/ 샤드 번호
+            'clients': clients,
+            # 전체 순위 상위 게시글의 [고객사 번호, 고객사 샤드 안 위치]
+            'top': [list(ref) for ref in top],
+            # months/ 인덱스가 있는 월 (날짜를 알 수 없으면 '')
+            'months': months,
+            # 댓글 샤드별 [첫 게시글 ID, 마지막 게시글 ID]
+            'comment_shards': comment_shards,
+        }
+        # 샤드를 모두 쓴 뒤 매니페스트를 교체
+        manifest_path = os.path.join(out_dir, 'manifest.json')
+        with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+            f.write(_compact(manifest))
+        os.replace(manifest_path + '.tmp', manifest_path)
+        return self._counts()
+
+    def _write_client_shards(self, shard_dir):
+        """고객사별 게시글 샤드 기록, 게시글별 (고객사 번호, 위치)는 bundle_pos 테이블에 저장"""
+        db = self._conn
+        db.execute("CREATE TABLE IF NOT EXISTS bundle_pos (idx INTEGER PRIMARY KEY, client INTEGER, pos INTEGER)")
+        db.execute("DELETE FROM bundle_pos")
+        clients = []
+        positions = []
+        f = None
+        # 고객사 이름순, 고객사 안에서는 순위 순서
+        rows = db.execute("SELECT r.name, r.idx, p.row FROM ranked r JOIN posts p ON p.idx = r.idx "
+                          "ORDER BY r.name, r.rank")
+        for name, idx, row in rows:
+            if not clients or clients[-1][0] != name:
+                if f is not None:
+                    f.write(']')
+                    f.close()
+                clients.append([name, 0])
+                f = open(os.path.join(shard_dir, f"{len(clients) - 1}.json"), 'w', encoding='utf-8')
+                f.write('[')
+            client = clients[-1]
+            positions.append((idx, len(clients) - 1, client[1]))
+            # 고객사 이름은 빼고 원래 위치(idx)를 붙임 (동률 정렬용)
+            values = json.loads(row)
+            del values[POST_FIELDS.index('name')]
+            f.write((',' if client[1] else '') + _compact(values + [idx]))
+            client[1] += 1
+            if len(positions) >= self.BATCH_SIZE:
+                db.executemany("INSERT INTO bundle_pos VALUES (?, ?, ?)", positions)
+                positions = []
+        if f is not None:
+            f.write(']')
+            f.close()
+        db.executemany("INSERT INTO bundle_pos VALUES (?, ?, ?)", positions)
+        return clients
+
+    def _write_month_indexes(self, shard_dir):
+        """월별 게시글 위치 인덱스 기록, 월 목록 반환"""
+        months = []
+        f = None
+        rows = self._conn.execute(
+            "SELECT r.month, b.client, b.pos, p.reg_date, p.comm_cnt, r.idx FROM ranked r "
+            "JOIN bundle_pos b ON b.idx = r.idx JOIN posts p ON p.idx = r.idx ORDER BY r.month, r.rank")
+        for month, client, pos, reg_date, comm_cnt, idx in rows:
+            if not months or months[-1] != month:
+                if f is not None:
+                    f.write(']')
+                    f.close()
+                months.append(month)
+                f = open(os.path.join(shard_dir, f"{month or 'undated'}.json"), 'w', encoding='utf-8')
+                text = '['
+            else:
+                text = ','
+            f.write(text + _compact([client, pos, reg_date, comm_cnt, idx]))
+        if f is not None:
+            f.write(']')
+            f.close()
+        return months
+
+    def _write_comment_shards(self, shard_dir, shard_bytes):
+        """
+        댓글 샤드 기록, 샤드별 [첫 게시글 ID, 마지막 게시글 ID] 목록 반환
+
+        게시글 ID 순 (숫자 ID는 길이 -> 문자열 순이 숫자 순)으로 shard_bytes를 넘을 때마다 나누며,
+        한 게시글의 댓글은 한 샤드에만 들어갑니다.
+        """
+        comment_shards = []
+        f, size, post_id = None, 0, None
+        rows = self._conn.execute(
+            "SELECT post_id, row FROM comments ORDER BY length(post_id), post_id, reg_date, idx")
+        for pid, row in rows:
+            if pid != post_id:
+                if f is not None and size >= shard_bytes:
+                    f.write(']}')
+                    f.close()
+                    f = None
+                if f is None:
+                    comment_shards.append([pid, pid])
+                    f = open(os.path.join(shard_dir, f"{len(comment_shards) - 1}.json"), 'w', encoding='utf-8')
+                    text, size = '{' + _compact(pid) + ':[', 0
+                else:
+                    text = '],' + _compact(pid) + ':['
+                comment_shards[-1][1] = pid
+                post_id = pid
+            else:
+                text = ','
+            values = json.loads(row)
+            text += _compact([values[COMMENT_FIELDS.index(field)] for field in BUNDLE_COMMENT_FIELDS])
+            f.write(text)
+            size += len(text.encode('utf-8'))
+        if f is not None:
+            f.write(']}')
+            f.close()
+        return comment_shards
+
+    def close(self):
+        self._conn.close()
+        self._tmp.cleanup()
+
+def build_bundle(posts_csv, comments_csv, out_dir, workers=1, chunk_bytes=CHUNK_BYTES):
+    """
+    CSV를 한 번씩 읽어 엣지 함수용 데이터를 out_dir에 생성, (게시글 수, 댓글 수, 고객사 수) 반환
+
+    번들(manifest.json + 샤드)과 함께, 번들이 없을 때 엣지 함수가 대신 읽는 posts.json / comments.json도 기록합니다.
+    workers가 2 이상이면 CSV 구간별 변환(HTML 정리, 날짜 파싱)을 프로세스 workers개로 나눠 처리합니다.
+    결과는 원래 순서대로 합치므로 출력 파일은 workers=1과 같습니다. chunk_bytes: 프로세스 하나가 맡는 CSV 구간 크기
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    index = IndexBuilder()
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        convert_posts_csv(posts_csv, os.path.join(out_dir, 'posts.json'), index, executor, workers, chunk_bytes)
+        convert_comments_csv(comments_csv, os.path.join(out_dir, 'comments.json'), index, executor, workers,
+                             chunk_bytes)
+        print("\n번들 생성 중...")
+        return index.write_bundle(out_dir)
+    finally:
+        if executor:
+            executor.shutdown()
+        index.close()
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="CSV 데이터를 엣지 함수용 JSON 번들로 변환 (public/data)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="CSV 변환에 사용할 프로세스 수 (기본 1, 2 이상이면 구간별 병렬 변환)")
+    args = parser.parse_args()
+
     base_dir = os.path.dirname(__file__)
-    functions_dir = os.path.join(base_dir, 'functions', 'data')
-    
-    # functions/data 디렉토리 생성
-    os.makedirs(functions_dir, exist_ok=True)
+    # 엣지 함수가 /data/ 아래로 읽는 배포 파일 (public/data 디렉토리)
+    data_dir = os.path.join(base_dir, 'public', 'data')
     
     # CSV 파일 경로
     posts_csv = os.path.join(base_dir, '20251125_PPM학습용데이터_원글.csv')
     comments_csv = os.path.join(base_dir, '20251125_PPM학습용데이터_댓글.csv')
     
-    # JSON 파일 경로
-    posts_json = os.path.join(functions_dir, 'posts.json')
-    comments_json = os.path.join(functions_dir, 'comments.json')
-    indexed_json = os.path.join(functions_dir, 'indexed.json')
-    
     # CSV 파일 존재 확인
     if not os.path.exists(posts_csv):
         print(f"오류: 원글 CSV 파일을 찾을 수 없습니다: {posts_csv}")
@@ -158,25 +540,18 @@ def main():
     print("CSV to JSON 변환 시작")
     print("=" * 50)
     
-    posts = convert_posts_csv(posts_csv, posts_json)
-    comments = convert_comments_csv(comments_csv, comments_json)
-    
-    # 인덱스 데이터 생성
-    print("\n인덱스 데이터 생성 중...")
-    indexed_data = create_indexed_data(posts, comments)
+    # CSV를 한 번씩만 읽어 posts.json / comments.json을 쓰면서 임시 SQLite에 쌓은 뒤 매니페스트와 샤드 파일로 기록
+    posts_count, comments_count, clients_count = build_bundle(posts_csv, comments_csv, data_dir,
+                                                              workers=max(1, args.workers))
     
-    with open(indexed_json, 'w', encoding='utf-8') as f:
-        json.dump(indexed_data, f, ensure_ascii=False, indent=2)
-    
-    print(f"인덱스 JSON 파일 저장 완료: {indexed_json}")
+    print(f"번들 저장 완료: {os.path.join(data_dir, 'manifest.json')}")
     
     print("\n" + "=" * 50)
     print("변환 완료!")
-    print(f"- 게시글: {len(posts)}개")
-    print(f"- 댓글: {len(comments)}개")
-    print(f"- 고객사: {len(indexed_data['client_names'])}개")
+    print(f"- 게시글: {posts_count}개")
+    print(f"- 댓글: {comments_count}개")
+    print(f"- 고객사: {clients_count}개")
     print("=" * 50)
 
 if __name__ == '__main__':
     main()
-
@@ -0,0 +1,188 @@
+"""
+여러 고객사 게시판 병렬 크롤링 모듈
+로그인은 한 번만 하고 그 쿠키를 공유하는 크롤러(HTTP 세션 또는 Selenium 드라이버) 풀로
+여러 게시판을 동시에 증분 크롤링(BoardCrawler.crawl_incremental)합니다.
+최근에 새 글/댓글이 있었던 게시판부터 시작하고, 끝나면 게시판별 소요 시간/페이지/오류를 요약합니다.
+
+사용법:
+    python crawl_scheduler.py [원글 CSV] [댓글 CSV]
+    (게시판 주소/계정과 동시 실행 수는 config.py의 BOARD_*, CRAWL_* 설정)
+"""
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+import logging
+
+from board_crawler import HTTP_RATE_LIMIT, BoardCrawler, HostRateLimiter
+from crawl_state import CrawlStateStore
+
+logger = logging.getLogger(__name__)
+
+# 동시에 크롤링할 게시판 수 (크롤러 풀 크기)
+MAX_BOARDS = 4
+# 게시판 하나에서 동시에 가져올 상세 페이지 수 (http 백엔드)
+BOARD_WORKERS = 2
+
+
+class BoardCrawlScheduler:
+    """
+    게시판 병렬 크롤링 스케줄러
+
+    max_boards: 동시에 크롤링할 게시판 수 (전체 한도, 크롤러는 최대 이 수만큼 만들어 재사용)
+    board_workers: 게시판별 한도 - 게시판 하나에서 동시에 가져올 상세 페이지 수
+                   (동시 요청은 최대 max_boards x board_workers개)
+    rate_limit: 모든 크롤러가 공유하는 호스트별 초당 요청 수 (0이면 제한 없음)
+    crawler_options: BoardCrawler에 그대로 넘길 인자 (login_method, timeout, wait_timeouts 등)
+    """
+
+    def __init__(self, url: str, email: str, password: str, state: CrawlStateStore, backend: str = 'http',
+                 max_boards: int = MAX_BOARDS, board_workers: int = BOARD_WORKERS,
+                 rate_limit: float = HTTP_RATE_LIMIT, **crawler_options):
+        self.url = url
+        self.email = email
+        self.password = password
+        self.state = state
+        self.backend = backend
+        self.max_boards = max(1, max_boards)
+        self.board_workers = max(1, board_workers)
+        self.rate_limiter = HostRateLimiter(rate_limit)
+        self.crawler_options = crawler_options
+        # 첫 크롤러의 로그인 쿠키 (이후 크롤러는 로그인하지 않고 이 쿠키를 사용)
+        self.cookies = None
+        self._idle: 'queue.Queue[BoardCrawler]' = queue.Queue()
+        self._crawlers: List[BoardCrawler] = []
+        self._lock = threading.Lock()
+
+    def _new_crawler(self) -> BoardCrawler:
+        crawler = BoardCrawler(self.url, self.email, self.password, backend=self.backend, cookies=self.cookies,
+                               max_workers=self.board_workers, rate_limit=self.rate_limiter,
+                               **self.crawler_options)
+        with self._lock:
+            self._crawlers.append(crawler)
+        return crawler
+
+    def login(self) -> bool:
+        """첫 크롤러로 로그인하고 쿠키를 이후 크롤러들과 공유"""
+        if self.cookies is not None:
+            return True
+        crawler = self._new_crawler()
+        if not crawler.login():
+            return False
+        self.cookies = crawler.export_cookies()
+        self._idle.put(crawler)
+        logger.info(f"로그인 완료, 크롤러 {self.max_boards}개까지 쿠키 {len(self.cookies)}개를 공유합니다.")
+        return True
+
+    def _acquire(self) -> BoardCrawler:
+        """쉬고 있는 크롤러 (없으면 새로 만듦, 스레드마다 하나씩 쓰므로 max_boards개를 넘지 않음)"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._new_crawler()
+
+    def prioritize(self, boards: Dict[str, str]) -> List[Tuple[str, str]]:
+        """
+        (게시판 이름, URL) 목록을 크롤링할 순서로 정렬
+
+        크롤링 기록이 없는 게시판 -> 최근에 새 글/바뀐 글을 찾은 게시판 -> 활동이 없던 게시판 순
+        """
+        activity = self.state.board_activity()
+        return sorted(boards.items(), key=lambda item: -activity.get(item[0], float('inf')))
+
+    def _crawl_board(self, name: str, url: str) -> Dict:
+        started = time.perf_counter()
+        crawler = self._acquire()
+        try:
+            summary = crawler.crawl_incremental(url, name, self.state)
+            self._idle.put(crawler)
+        except Exception as e:
+            logger.error(f"[{name}] 크롤링 오류: {str(e)}")
+            summary = {'board': name, 'pages': 0, 'listed': 0, 'new': 0, 'changed': 0, 'unchanged': 0,
+                       'details': 0, 'failed': 0, 'seconds': round(time.perf_counter() - started, 2),
+                       'error': str(e)}
+            # 오류가 난 크롤러는 상태를 알 수 없으므로 닫고 다음 게시판은 새 크롤러로
+            crawler.close()
+            with self._lock:
+                self._crawlers.remove(crawler)
+        self.state.record_run(summary)
+        return summary
+
+    def run(self, boards: Dict[str, str]) -> Dict:
+        """
+        boards({게시판 이름: 목록 URL})를 동시에 증분 크롤링하고 결과 요약 반환
+
+        Returns:
+            {'boards': [게시판별 crawl_incremental 결과 (크롤링 순서)], 'seconds', 'pages', 'details', 'errors'}
+        """
+        started = time.perf_counter()
+        order = self.prioritize(boards)
+        if not self.login():
+            summaries = [{'board': name, 'pages': 0, 'listed': 0, 'new': 0, 'changed': 0, 'unchanged': 0,
+                          'details': 0, 'failed': 0, 'seconds': 0.0, 'error': '로그인 실패'} for name, _ in order]
+        else:
+            workers = min(self.max_boards, len(order)) or 1
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='board-crawl') as executor:
+                summaries = list(executor.map(lambda item: self._crawl_board(*item), order))
+
+        report = {
+            'boards': summaries,
+            'seconds': round(time.perf_counter() - started, 2),
+            'pages': sum(s['pages'] for s in summaries),
+            'details': sum(s['details'] for s in summaries),
+            'errors': sum(1 for s in summaries if s.get('error')),
+        }
+        logger.info(f"게시판 {len(summaries)}개 크롤링 완료: {report['seconds']}s, 목록 {report['pages']}페이지, "
+                    f"상세 {report['details']}개, 오류 {report['errors']}개")
+        return report
+
+    def close(self):
+        """풀의 크롤러(드라이버 / HTTP 세션) 모두 종료"""
+        with self._lock:
+            crawlers, self._crawlers = self._crawlers, []
+        for crawler in crawlers:
+            crawler.close()
+        self._idle = queue.Queue()
+
+
+def format_report(report: Dict) -> str:
+    """run() 결과를 게시판별 표로"""
+    lines = [f"{'게시판':16s} {'시간':>7s} {'페이지':>5s} {'새 글':>5s} {'바뀐 글':>5s} {'상세':>5s} {'실패':>4s}  오류"]
+    for s in report['boards']:
+        lines.append(f"{s['board']:16s} {s['seconds']:6.2f}s {s['pages']:6d} {s['new']:6d} {s['changed']:6d} "
+                     f"{s['details']:6d} {s['failed']:5d}  {s.get('error') or ''}")
+    lines.append(f"합계: {report['seconds']:.2f}s, 목록 {report['pages']}페이지, 상세 {report['details']}개, "
+                 f"오류 {report['errors']}개")
+    return '\n'.join(lines)
+
+
+def main():
+    import config
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    posts_csv = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, '20251125_PPM학습용데이터_원글.csv')
+    comments_csv = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, '20251125_PPM학습용데이터_댓글.csv')
+    if not config.BOARD_EMAIL or not config.BOARD_PASSWORD:
+        print("오류: BOARD_EMAIL / BOARD_PASSWORD 환경 변수를 설정하세요.")
+        return
+
+    state = CrawlStateStore(config.CRAWL_STATE_DB_PATH)
+    scheduler = BoardCrawlScheduler(config.BOARD_URL, config.BOARD_EMAIL, config.BOARD_PASSWORD, state,
+                                    backend=config.CRAWL_BACKEND, max_boards=config.CRAWL_MAX_BOARDS,
+                                    board_workers=config.CRAWL_BOARD_WORKERS, rate_limit=config.CRAWL_RATE_LIMIT)
+    try:
+        report = scheduler.run(config.CLIENT_BOARD_URLS)
+    finally:
+        scheduler.close()
+    print(format_report(report))
+
+    exported = state.export_csv(posts_csv, comments_csv)
+    print(f"CSV 반영: 원글 추가 {exported['posts_appended']}개, 갱신 {exported['posts_updated']}개, "
+          f"댓글 추가 {exported['comments_appended']}개")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+"""
+게시판 크롤링 상태 저장소 모듈
+게시글(번호 idx, 없으면 URL)별로 마지막으로 본 댓글 수와 본문 해시를 SQLite에 저장해
+다시 크롤링할 때 새 게시글과 댓글 수가 바뀐 게시글의 상세 페이지만 가져오게 합니다.
+수집한 게시글/댓글은 CSVDataLoader가 읽는 원글/댓글 CSV 형식으로 내보냅니다.
+"""
+import csv
+import hashlib
+import html
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+# CSVDataLoader가 읽는 CSV 컬럼
+POST_CSV_FIELDS = ['id', 'name', 'writer', 'subject', 'content', 'reg_date', 'comm_cnt', 'hit_cnt']
+COMMENT_CSV_FIELDS = ['id', 'post_id', 'writer', 'content', 'reg_date']
+
+
+def post_key(post: Dict) -> str:
+    """게시글 식별자 (게시글 번호, 없으면 URL)"""
+    return post.get('idx') or post.get('url') or ''
+
+
+def content_hash(post: Dict) -> str:
+    """본문과 덧글 내용의 해시 (상세 페이지 내용이 바뀌었는지 확인용)"""
+    h = hashlib.sha1(post.get('content', '').encode('utf-8'))
+    for comment in post.get('comments', []):
+        h.update(b'\0')
+        h.update('\x1f'.join([comment.get('author', ''), comment.get('date', ''),
+                              comment.get('text', '')]).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _csv_date(value: str) -> str:
+    """'2025-11-20 10:02' 형식의 날짜를 CSV 내보내기 형식(20251120100200)으로"""
+    digits = re.sub(r'\D', '', value or '')
+    return digits.ljust(14, '0')[:14] if digits else ''
+
+
+def _csv_text(text: str) -> str:
+    """크롤러가 얻은 일반 텍스트를 CSV 본문 형식(HTML)으로 (clean_html로 읽으면 원래 텍스트)"""
+    return html.escape(text or '', quote=False)
+
+
+def _sort_key(value: str):
+    return (0, int(value), '') if value.isdigit() else (1, 0, value)
+
+
+class CrawlStateStore:
+    """
+    SQLite 크롤링 상태 저장소
+
+    crawled_posts: 게시글별 마지막으로 본 제목/댓글 수/본문 해시와 CSV에 쓸 내용
+    crawled_comments: 덧글 (한 번 저장한 덧글은 바뀌지 않는 것으로 봄)
+    crawl_runs: 게시판별 크롤링 기록 (소요 시간, 페이지 수, 새 글/바뀐 글 수, 오류)
+    exported = 0인 행은 다음 export_csv에서 CSV에 씁니다.
+    스레드별 연결을 사용하므로 여러 크롤러 스레드가 함께 써도 됩니다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._export_lock = threading.Lock()
+
+        conn = self._conn()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS crawled_posts (
+                    post_key TEXT PRIMARY KEY,
+                    board TEXT NOT NULL,
+                    url TEXT,
+                    title TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    comment_count INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    first_seen REAL NOT NULL,
+                    last_crawled REAL NOT NULL,
+                    exported INTEGER NOT NULL DEFAULT 0
+                )""")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS crawled_comments (
+                    id TEXT PRIMARY KEY,
+                    post_key TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    exported INTEGER NOT NULL DEFAULT 0
+                )""")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS crawl_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    board TEXT NOT NULL,
+                    finished REAL NOT NULL,
+                    seconds REAL NOT NULL,
+                    pages INTEGER NOT NULL,
+                    new INTEGER NOT NULL,
+                    changed INTEGER NOT NULL,
+                    details INTEGER NOT NULL,
+                    failed INTEGER NOT NULL,
+                    error TEXT
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_runs_board ON crawl_runs (board, finished)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_crawled_posts_exported ON crawled_posts (exported)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_crawled_comments_exported ON crawled_comments (exported)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def check(self, posts: List[Dict]) -> List[str]:
+        """
+        목록에서 읽은 게시글마다 상태 반환
+
+        new: 처음 보는 게시글, changed: 제목이나 댓글 수가 바뀐 게시글, unchanged: 그대로인 게시글
+        """
+        keys = [post_key(post) for post in posts]
+        known = {}
+        conn = self._conn()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = conn.execute(
+                f"SELECT post_key, title, comment_count FROM crawled_posts "
+                f"WHERE post_key IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+            known.update((key, (title, count)) for key, title, count in rows)
+
+        statuses = []
+        for key, post in zip(keys, posts):
+            seen = known.get(key)
+            if seen is None:
+                statuses.append('new')
+            elif seen != (post.get('title', ''), post.get('comment_count', 0)):
+                statuses.append('changed')
+            else:
+                statuses.append('unchanged')
+        return statuses
+
+    def save_posts(self, board: str, posts: List[Dict]) -> Dict[str, int]:
+        """
+        상세 페이지까지 가져온 게시글 저장 (본문 해시가 같으면 CSV에 다시 쓰지 않음)
+
+        Returns:
+            {'new', 'updated', 'same'}: 새로 저장 / 내용이 바뀌어 갱신 / 바뀐 내용 없음
+        """
+        counts = {'new': 0, 'updated': 0, 'same': 0}
+        now = time.time()
+        conn = self._conn()
+        with conn:
+            for post in posts:
+                key = post_key(post)
+                if not key:
+                    continue
+                digest = content_hash(post)
+                row = conn.execute("SELECT title, comment_count, content_hash FROM crawled_posts "
+                                   "WHERE post_key = ?", (key,)).fetchone()
+                values = (board, post.get('url'), post.get('title', ''), post.get('author', ''),
+                          post.get('date', ''), post.get('comment_count', 0), digest, post.get('content', ''))
+                if row is None:
+                    conn.execute("INSERT INTO crawled_posts (board, url, title, author, date, comment_count, "
+                                 "content_hash, content, post_key, first_seen, last_crawled) "
+                                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", values + (key, now, now))
+                    counts['new'] += 1
+                elif row != (values[2], values[5], digest):
+                    conn.execute("UPDATE crawled_posts SET board = ?, url = ?, title = ?, author = ?, date = ?, "
+                                 "comment_count = ?, content_hash = ?, content = ?, last_crawled = ?, "
+                                 "exported = 0 WHERE post_key = ?", values + (now, key))
+                    counts['updated'] += 1
+                else:
+                    conn.execute("UPDATE crawled_posts SET last_crawled = ? WHERE post_key = ?", (now, key))
+                    counts['same'] += 1
+
+                conn.executemany(
+                    "INSERT OR IGNORE INTO crawled_comments (id, post_key, author, date, text) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(comment['id'], key,
+                      comment.get('author', ''), comment.get('date', ''), comment.get('text', ''))
+                     for comment in post.get('comments', []) if comment.get('id')])
+        return counts
+
+    def record_run(self, summary: Dict):
+        """BoardCrawler.crawl_incremental 결과(게시판 하나) 기록"""
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT INTO crawl_runs (board, finished, seconds, pages, new, changed, details, failed, error) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         (summary['board'], time.time(), summary.get('seconds', 0), summary.get('pages', 0),
+                          summary.get('new', 0), summary.get('changed', 0), summary.get('details', 0),
+                          summary.get('failed', 0), summary.get('error')))
+
+    def board_activity(self) -> Dict[str, float]:
+        """
+        게시판별 마지막으로 새 글/바뀐 글을 찾은 시각 (epoch)
+
+        게시판의 첫 크롤링(모든 글이 새 글)은 활동으로 보지 않습니다.
+        크롤링 기록이 있지만 활동을 찾은 적이 없는 게시판은 0, 기록이 없는 게시판은 포함하지 않습니다.
+        """
+        rows = self._conn().execute(
+            "SELECT board, MAX(CASE WHEN new + changed > 0 AND id > first_id THEN finished ELSE 0 END) "
+            "FROM crawl_runs JOIN (SELECT board AS first_board, MIN(id) AS first_id FROM crawl_runs GROUP BY board) "
+            "ON board = first_board GROUP BY board").fetchall()
+        return {board: last_active for board, last_active in rows}
+
+    def export_csv(self, posts_csv: str, comments_csv: str) -> Dict[str, int]:
+        """
+        아직 내보내지 않은 게시글/덧글을 CSVDataLoader 형식의 CSV에 반영
+
+        모든 행을 파일 끝에 추가하므로 CSVDataLoader.refresh()는 추가된 행만 읽습니다.
+        이미 CSV에 있는 게시글이 바뀐 경우(댓글 수 등)에도 기존 행은 그대로 두고 같은 id의 갱신 행을 추가합니다
+        (로더와 convert_csv_to_json은 같은 id의 마지막 행을 사용, 조회수는 기존 행의 값 유지).
+        대신 게시글이 바뀔 때마다 지난 행이 파일에 남습니다.
+
+        Returns:
+            {'posts_appended', 'posts_updated', 'comments_appended'}
+        """
+        with self._export_lock:
+            conn = self._conn()
+            post_rows = conn.execute(
+                "SELECT post_key, board, author, title, content, date, comment_count FROM crawled_posts "
+                "WHERE exported = 0").fetchall()
+            comment_rows = conn.execute(
+                "SELECT c.id, p.post_key, c.author, c.text, c.date FROM crawled_comments c "
+                "JOIN crawled_posts p ON p.post_key = c.post_key WHERE c.exported = 0").fetchall()
+
+            posts = {key: [key, board, author, title, _csv_text(content), _csv_date(date), str(count), '0']
+                     for key, board, author, title, content, date, count in post_rows}
+            comments = {cid: [cid, key, author, _csv_text(text), _csv_date(date)]
+                        for cid, key, author, text, date in comment_rows}
+
+            updated = _write_rows(posts_csv, POST_CSV_FIELDS, posts, update=True, keep=('hit_cnt',))
+            _write_rows(comments_csv, COMMENT_CSV_FIELDS, comments, update=False)
+
+            with conn:
+                conn.executemany("UPDATE crawled_posts SET exported = 1 WHERE post_key = ?",
+                                 [(key,) for key in posts])
+                conn.executemany("UPDATE crawled_comments SET exported = 1 WHERE id = ?",
+                                 [(cid,) for cid in comments])
+        result = {'posts_appended': len(posts) - updated, 'posts_updated': updated,
+                  'comments_appended': len(comments)}
+        if posts or comments:
+            logger.info(f"크롤링 결과 CSV 반영: {result}")
+        return result
+
+    def stats(self) -> Dict:
+        conn = self._conn()
+        posts, pending_posts = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(exported = 0), 0) FROM crawled_posts").fetchone()
+        comments, pending_comments = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(exported = 0), 0) FROM crawled_comments").fetchone()
+        return {'posts': posts, 'comments': comments,
+                'pending_posts': pending_posts, 'pending_comments': pending_comments}
+
+
+def _csv_values(path: str, columns: Iterable[str] = ()) -> Dict[str, Dict[str, str]]:
+    """CSV 파일의 id -> columns 컬럼 값 (같은 id가 여러 번 있으면 마지막 행)"""
+    if not os.path.exists(path) or not os.path.getsize(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return {row.get('id', ''): {name: row.get(name) or '' for name in columns} for row in csv.DictReader(f)}
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def _write_rows(path: str, fieldnames: List[str], rows: Dict[str, List[str]], update: bool,
+               keep: Iterable[str] = ()) -> int:
+    """
+    id -> 행 목록을 CSV 파일 끝에 id 순서로 추가하고 갱신한 기존 id 수 반환
+
+    파일에 이미 있는 id는 update=True이면 갱신 행으로 다시 추가하고 (keep 컬럼은 기존 값 유지,
+    CSVDataLoader는 같은 id의 마지막 행을 처음 나온 위치에 사용), 아니면 건너뜁니다.
+    기존 행은 고치지 않으므로 파일을 다시 쓰지 않습니다.
+    """
+    if not rows:
+        return 0
+    existing = _csv_values(path, keep)
+    kept = [(fieldnames.index(name), name) for name in keep]
+    write_ids = []
+    updated = 0
+    for i in sorted(rows, key=_sort_key):
+        if i not in existing:
+            write_ids.append(i)
+        elif update:
+            for col, name in kept:
+                rows[i][col] = existing[i][name]
+            write_ids.append(i)
+            updated += 1
+    if not write_ids:
+        return 0
+
+    is_new_file = not os.path.exists(path) or not os.path.getsize(path)
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        if not is_new_file and not _ends_with_newline(path):
+            f.write('\n')
+        writer = csv.writer(f, lineterminator='\n')
+        if is_new_file:
+            writer.writerow(fieldnames)
+        writer.writerows(rows[i] for i in write_ids)
+    return updated
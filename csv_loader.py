@@ -2,206 +2,766 @@
 CSV 데이터 로더 모듈
 게시판 데이터를 CSV 파일에서 로드합니다.
 """
+import bisect
+import copy
 import csv
+import hashlib
+import heapq
+import io
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from itertools import islice
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
 import logging
 
+from client_matcher import ClientNameMatcher
+from context_packer import POST_SEPARATOR, pack_blocks
+from parsers import clean_html, parse_date, parse_timestamps
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _to_int(value) -> int:
+    """숫자 문자열을 int로 변환 (비어 있거나 잘못된 값은 0)"""
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+# 증분 로드 시 파일이 다시 쓰였는지 확인하는 구간 크기 (파일 앞부분 / 마지막으로 읽은 위치 직전)
+HEAD_CHECKSUM_BYTES = 64 * 1024
+TAIL_CHECKSUM_BYTES = 4 * 1024
+
+
+class CSVFileState:
+    """
+    CSV 파일을 어디까지 읽었는지 (증분 로드용)
+
+    offset: 마지막으로 읽은 완전한 행의 끝 위치 (바이트)
+    head_checksum / tail_checksum: 파일 앞부분과 offset 직전 구간의 체크섬 (다시 쓰였는지 확인)
+    """
+    __slots__ = ('fieldnames', 'offset', 'rows', 'last_id', 'head_checksum', 'tail_checksum')
+
+    def __init__(self, fieldnames: List[str], offset: int, rows: int, last_id: str,
+                 head_checksum: str, tail_checksum: str):
+        self.fieldnames = fieldnames
+        self.offset = offset
+        self.rows = rows
+        self.last_id = last_id
+        self.head_checksum = head_checksum
+        self.tail_checksum = tail_checksum
+
+
+def _region_checksums(f, offset: int) -> Tuple[str, str]:
+    """파일 앞부분과 offset 직전 구간의 체크섬"""
+    f.seek(0)
+    head = hashlib.sha1(f.read(min(offset, HEAD_CHECKSUM_BYTES))).hexdigest()
+    tail_start = max(offset - TAIL_CHECKSUM_BYTES, 0)
+    f.seek(tail_start)
+    tail = hashlib.sha1(f.read(offset - tail_start)).hexdigest()
+    return head, tail
+
+
+def _complete_length(chunk: bytes) -> int:
+    """chunk 중 완전한 행으로 끝나는 앞부분 길이 (따옴표 안의 줄바꿈은 행 끝이 아님)"""
+    quotes = 0
+    pos = 0
+    end = 0
+    for line in chunk.split(b'\n')[:-1]:
+        quotes += line.count(b'"')
+        pos += len(line) + 1
+        if quotes % 2 == 0:
+            end = pos
+    return end
+
+
+def _parse_rows(data: bytes, fieldnames: Optional[List[str]] = None) -> Tuple[List[Dict[str, str]], List[str]]:
+    """CSV 바이트를 행 dict 목록으로 (open()으로 읽을 때와 같은 줄바꿈 처리)"""
+    reader = csv.DictReader(io.TextIOWrapper(io.BytesIO(data), encoding='utf-8'), fieldnames=fieldnames)
+    rows = list(reader)
+    return rows, list(reader.fieldnames or [])
+
+
+def read_csv_rows(path: str) -> Tuple[List[Dict[str, str]], CSVFileState]:
+    """CSV 파일 전체를 읽고, 다음 증분 로드를 위한 상태와 함께 반환"""
+    with open(path, 'rb') as f:
+        data = f.read()
+        rows, fieldnames = _parse_rows(data)
+        head, tail = _region_checksums(f, len(data))
+    last_id = rows[-1].get('id', '') or '' if rows else ''
+    return rows, CSVFileState(fieldnames, len(data), len(rows), last_id, head, tail)
+
+
+def read_appended_rows(path: str, state: CSVFileState) -> Optional[Tuple[List[Dict[str, str]], CSVFileState]]:
+    """
+    state 이후에 추가된 행만 읽기
+
+    아직 쓰는 중인 마지막 행은 다음 로드로 미룹니다.
+
+    Returns:
+        (추가된 행, 새 상태). 파일이 없어졌거나 다시 쓰였으면 None (전체 로드 필요)
+    """
+    try:
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < state.offset or _region_checksums(f, state.offset) != (state.head_checksum,
+                                                                             state.tail_checksum):
+                return None
+            f.seek(state.offset)
+            chunk = f.read(size - state.offset)
+            length = _complete_length(chunk)
+            if not length:
+                return [], state
+            rows, _ = _parse_rows(chunk[:length], state.fieldnames)
+            offset = state.offset + length
+            head, tail = _region_checksums(f, offset)
+    except OSError:
+        return None
+    last_id = rows[-1].get('id', '') or '' if rows else state.last_id
+    return rows, CSVFileState(state.fieldnames, offset, state.rows + len(rows), last_id, head, tail)
+
+
+def _merge_sorted(old: List[int], new: Iterable[int], key) -> List[int]:
+    """정렬된 old에 new를 병합한 새 목록 (old는 바꾸지 않음)"""
+    new = sorted(new, key=key)
+    if not new:
+        return old
+    return list(heapq.merge(old, new, key=key))
+
+
+def _merge_dated(ts_list: List[int], idx_list: List[int], posts: List['PostRecord'],
+                 indices: Iterable[int]) -> Tuple[List[int], List[int]]:
+    """(등록일, 인덱스) 정렬 배열에 새 게시글을 병합한 새 배열"""
+    pairs = sorted((posts[i].reg_ts, i) for i in indices if posts[i].reg_ts is not None)
+    if not pairs:
+        return ts_list, idx_list
+    merged = list(heapq.merge(zip(ts_list, idx_list), pairs))
+    return [ts for ts, _ in merged], [i for _, i in merged]
+
+
+def _split_post_updates(posts: List['PostRecord'], positions: Dict[str, int],
+                        base: int) -> Tuple[List['PostRecord'], Dict[int, 'PostRecord']]:
+    """
+    읽은 게시글을 새 게시글과 기존 게시글 갱신으로 분리
+
+    크롤러(crawl_state.export_csv)는 바뀐 게시글을 같은 id의 행으로 파일 끝에 다시 추가하므로,
+    같은 id가 다시 나오면 나중 행이 앞 행을 대신하고 위치(원래 순서)는 처음 나온 곳을 유지합니다.
+    positions: 게시글 ID -> 인덱스 (새 게시글 위치가 추가됨), base: 기존 게시글 수
+
+    Returns:
+        (새 게시글 목록, {기존 게시글 인덱스: 갱신된 게시글})
+    """
+    new_posts: List[PostRecord] = []
+    updates: Dict[int, PostRecord] = {}
+    for post in posts:
+        i = positions.get(post.id) if post.id else None
+        if i is None:
+            if post.id:
+                positions[post.id] = base + len(new_posts)
+            new_posts.append(post)
+        elif i >= base:
+            new_posts[i - base] = post
+        else:
+            updates[i] = post
+    return new_posts, updates
+
+
+class PostRecord:
+    """
+    원글 한 건
+
+    reg_date 파싱, comm_cnt/hit_cnt 변환, content 정리는 로드 시 1회만 수행합니다.
+    """
+    __slots__ = ('id', 'name', 'writer', 'subject', 'content',
+                 'reg_date', 'reg_ts', 'comm_cnt', 'hit_cnt')
+
+    def __init__(self, id: str, name: str, writer: str, subject: str, content: str,
+                 reg_date: str, reg_ts: Optional[int], comm_cnt: int, hit_cnt: int):
+        self.id = id
+        self.name = name
+        self.writer = writer
+        self.subject = subject
+        self.content = content
+        self.reg_date = reg_date
+        self.reg_ts = reg_ts
+        self.comm_cnt = comm_cnt
+        self.hit_cnt = hit_cnt
+
+    def to_dict(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class CommentRecord:
+    """댓글 한 건 (로드 시 1회 파싱된 값 보관)"""
+    __slots__ = ('id', 'post_id', 'writer', 'content', 'reg_date', 'reg_ts')
+
+    def __init__(self, id: str, post_id: str, writer: str, content: str,
+                 reg_date: str, reg_ts: Optional[int]):
+        self.id = id
+        self.post_id = post_id
+        self.writer = writer
+        self.content = content
+        self.reg_date = reg_date
+        self.reg_ts = reg_ts
+
+    def to_dict(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
 class CSVDataLoader:
     def __init__(self, posts_csv_path: str, comments_csv_path: str):
         """
         CSV 데이터 로더 초기화
-        
+
         Args:
             posts_csv_path: 원글 CSV 파일 경로
             comments_csv_path: 댓글 CSV 파일 경로
         """
         self.posts_csv_path = posts_csv_path
         self.comments_csv_path = comments_csv_path
-        self.posts_data = []
-        self.comments_data = []
+        self.posts_data: List[PostRecord] = []
+        self.comments_data: List[CommentRecord] = []
+        self._client_names: List[str] = []
+        # 고객사 이름 -> (정렬된 등록일 epoch, 게시글 인덱스) / 날짜 없는 게시글 인덱스
+        self._client_dated: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._client_undated: Dict[str, List[int]] = {}
+        # 고객사 필터 값 -> 부분 문자열 규칙으로 매칭되는 고객사 이름 목록
+        self._client_matches: Dict[str, List[str]] = {}
+        # 전체 게시글의 등록일 정렬 배열
+        self._date_ts: List[int] = []
+        self._date_idx: List[int] = []
+        self._undated: List[int] = []
+        # 댓글 수 순위 (댓글 수 내림차순, 동률은 원래 순서)
+        self._rank_pos: List[int] = []
+        self._ranked_all: List[int] = []
+        self._client_ranked: Dict[str, List[int]] = {}
+        self._day_ranked: Dict[int, List[int]] = {}
+        self._day_keys: List[int] = []
+        self._undated_ranked: List[int] = []
+        # 게시글 ID -> 댓글 목록 (등록일 순)
+        self._comments_by_post: Dict[str, List[CommentRecord]] = {}
+        # 메시지에서 고객사 이름을 찾는 오토마톤
+        self.client_matcher = ClientNameMatcher([])
+        # 파일별 읽은 위치 (증분 로드용, 읽지 못한 파일은 없음)
+        self._file_states: Dict[str, CSVFileState] = {}
+        # 마지막 로드 방식 (full / incremental / unchanged)과 추가된 행 수
+        self.load_mode = 'full'
+        self.appended_rows = 0
         self._load_data()
-    
+        self._build_indexes()
+
     def _load_data(self):
         """CSV 파일에서 데이터 로드"""
         try:
             # 원글 데이터 로드
             if os.path.exists(self.posts_csv_path):
-                with open(self.posts_csv_path, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    self.posts_data = list(reader)
+                rows, self._file_states['posts'] = read_csv_rows(self.posts_csv_path)
+                self.posts_data, _ = _split_post_updates(self._make_posts(rows), {}, 0)
                 logger.info(f"원글 데이터 {len(self.posts_data)}개 로드 완료")
             else:
                 logger.warning(f"원글 CSV 파일을 찾을 수 없습니다: {self.posts_csv_path}")
-            
+
             # 댓글 데이터 로드
             if os.path.exists(self.comments_csv_path):
-                with open(self.comments_csv_path, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    self.comments_data = list(reader)
+                rows, self._file_states['comments'] = read_csv_rows(self.comments_csv_path)
+                self.comments_data = self._make_comments(rows)
                 logger.info(f"댓글 데이터 {len(self.comments_data)}개 로드 완료")
             else:
                 logger.warning(f"댓글 CSV 파일을 찾을 수 없습니다: {self.comments_csv_path}")
-                
+
         except Exception as e:
             logger.error(f"CSV 데이터 로드 중 오류: {str(e)}")
-    
+
+    def _make_posts(self, rows: List[Dict[str, str]]) -> List['PostRecord']:
+        # 등록일 컬럼은 한 번에 파싱 (같은 문자열은 1회만)
+        reg_ts = parse_timestamps(row.get('reg_date', '') or '' for row in rows)
+        return [self._make_post(row, ts) for row, ts in zip(rows, reg_ts)]
+
+    def _make_comments(self, rows: List[Dict[str, str]]) -> List['CommentRecord']:
+        reg_ts = parse_timestamps(row.get('reg_date', '') or '' for row in rows)
+        return [self._make_comment(row, ts) for row, ts in zip(rows, reg_ts)]
+
+    def refresh(self) -> 'CSVDataLoader':
+        """
+        CSV 파일에 추가된 행만 읽어 병합한 새 로더 반환 (이 로더는 바꾸지 않음)
+
+        추가된 원글 중 이미 있는 게시글 ID의 행은 그 게시글의 갱신으로 반영합니다.
+        파일이 다시 쓰였거나(크기 감소, 체크섬 불일치) 처음 로드 때 읽지 못한 파일이 있으면
+        전체를 다시 로드합니다.
+        """
+        appended = {}
+        for key, path in (('posts', self.posts_csv_path), ('comments', self.comments_csv_path)):
+            state = self._file_states.get(key)
+            result = read_appended_rows(path, state) if state else None
+            if result is None:
+                logger.info(f"CSV 파일이 새로 쓰여 전체를 다시 로드합니다: {path}")
+                return CSVDataLoader(self.posts_csv_path, self.comments_csv_path)
+            appended[key] = result
+
+        (post_rows, posts_state), (comment_rows, comments_state) = appended['posts'], appended['comments']
+        loader = copy.copy(self)
+        loader._file_states = {'posts': posts_state, 'comments': comments_state}
+        loader.appended_rows = len(post_rows) + len(comment_rows)
+        if not loader.appended_rows:
+            loader.load_mode = 'unchanged'
+            return loader
+
+        loader.load_mode = 'incremental'
+        posts = self._make_posts(post_rows)
+        if posts:
+            positions = {post.id: i for i, post in enumerate(self.posts_data) if post.id}
+            posts, updates = _split_post_updates(posts, positions, len(self.posts_data))
+            if updates:
+                loader._update_records(updates)
+        loader._append_records(posts, self._make_comments(comment_rows))
+        logger.info(f"추가된 행 로드: 원글 {len(post_rows)}개 (마지막 ID {posts_state.last_id}), "
+                    f"댓글 {len(comment_rows)}개 (마지막 ID {comments_state.last_id})")
+        return loader
+
+    def _update_records(self, updates: Dict[int, 'PostRecord']):
+        """
+        기존 게시글을 갱신된 레코드로 바꾸고 인덱스에 반영 (_build_indexes와 같은 결과)
+
+        고객사와 등록일이 그대로면 댓글 수가 바뀐 게시글만 순위 목록에서 옮기고,
+        바뀌었으면 인덱스를 모두 다시 만듭니다. 이전 로더와 공유하는 목록은 바꾸지 않습니다.
+        """
+        old_posts = self.posts_data
+        posts = self.posts_data = list(old_posts)
+        moved = []
+        rebuild = False
+        for i, post in updates.items():
+            old = old_posts[i]
+            posts[i] = post
+            if (post.name, post.reg_ts) != (old.name, old.reg_ts):
+                rebuild = True
+            elif post.comm_cnt != old.comm_cnt:
+                moved.append(i)
+        if rebuild:
+            self._build_indexes()
+            return
+        if not moved:
+            return
+
+        moved_set = set(moved)
+
+        def rank_key(i):
+            return (-posts[i].comm_cnt, i)
+
+        def rerank(ranked, indices):
+            return _merge_sorted([i for i in ranked if i not in moved_set], indices, rank_key)
+
+        by_client: Dict[str, List[int]] = {}
+        by_day: Dict[int, List[int]] = {}
+        undated = []
+        for i in moved:
+            post = posts[i]
+            by_client.setdefault(post.name, []).append(i)
+            if post.reg_ts is None:
+                undated.append(i)
+            else:
+                by_day.setdefault(datetime.fromtimestamp(post.reg_ts).toordinal(), []).append(i)
+
+        self._ranked_all = rerank(self._ranked_all, moved)
+        self._rank_pos = [0] * len(posts)
+        for pos, i in enumerate(self._ranked_all):
+            self._rank_pos[i] = pos
+        self._client_ranked = dict(self._client_ranked)
+        for name, indices in by_client.items():
+            self._client_ranked[name] = rerank(self._client_ranked[name], indices)
+        if by_day:
+            self._day_ranked = dict(self._day_ranked)
+            for day, indices in by_day.items():
+                self._day_ranked[day] = rerank(self._day_ranked[day], indices)
+        if undated:
+            self._undated_ranked = rerank(self._undated_ranked, undated)
+
+    def _append_records(self, posts: List['PostRecord'], comments: List['CommentRecord']):
+        """
+        추가된 레코드를 기존 인덱스에 병합 (_build_indexes와 같은 결과)
+
+        이전 로더와 공유하는 목록/dict는 바꾸지 않고 바뀌는 것만 새로 만듭니다.
+        (스냅샷에서 불러온 로더는 목록이 읽기 전용 배열이므로 list로 바꿔서 병합)
+        """
+        start = len(self.posts_data)
+        all_posts = self.posts_data = list(self.posts_data) + posts
+        self.comments_data = list(self.comments_data) + comments
+        new_indices = range(start, len(all_posts))
+
+        def rank_key(i):
+            return (-all_posts[i].comm_cnt, i)
+
+        by_client: Dict[str, List[int]] = {}
+        by_day: Dict[int, List[int]] = {}
+        for i in new_indices:
+            post = all_posts[i]
+            by_client.setdefault(post.name, []).append(i)
+            if post.reg_ts is not None:
+                by_day.setdefault(datetime.fromtimestamp(post.reg_ts).toordinal(), []).append(i)
+
+        new_names = [name for name in by_client if name not in self._client_dated]
+        self._client_dated = dict(self._client_dated)
+        self._client_undated = dict(self._client_undated)
+        self._client_ranked = dict(self._client_ranked)
+        for name, indices in by_client.items():
+            ts_list, idx_list = self._client_dated.get(name, ([], []))
+            self._client_dated[name] = _merge_dated(ts_list, idx_list, all_posts, indices)
+            self._client_undated[name] = (list(self._client_undated.get(name, []))
+                                          + [i for i in indices if all_posts[i].reg_ts is None])
+            self._client_ranked[name] = _merge_sorted(self._client_ranked.get(name, []), indices, rank_key)
+        if new_names:
+            self._client_names = sorted(name for name in self._client_dated if name)
+            self.client_matcher = ClientNameMatcher(self._client_names)
+            self._client_matches = {name: [other for other in self._client_dated
+                                           if name in other or other in name]
+                                    for name in self._client_dated}
+
+        self._date_ts, self._date_idx = _merge_dated(self._date_ts, self._date_idx, all_posts, new_indices)
+        undated = [i for i in new_indices if all_posts[i].reg_ts is None]
+        self._undated = list(self._undated) + undated
+        self._undated_ranked = _merge_sorted(self._undated_ranked, undated, rank_key)
+
+        self._ranked_all = _merge_sorted(self._ranked_all, new_indices, rank_key)
+        self._rank_pos = [0] * len(all_posts)
+        for pos, i in enumerate(self._ranked_all):
+            self._rank_pos[i] = pos
+
+        if by_day:
+            self._day_ranked = dict(self._day_ranked)
+            for day, indices in by_day.items():
+                self._day_ranked[day] = _merge_sorted(self._day_ranked.get(day, []), indices, rank_key)
+            self._day_keys = sorted(self._day_ranked)
+
+        if comments:
+            self._comments_by_post = dict(self._comments_by_post)
+            by_post: Dict[str, List[CommentRecord]] = {}
+            for comment in comments:
+                by_post.setdefault(comment.post_id, []).append(comment)
+            for post_id, items in by_post.items():
+                merged = self._comments_by_post.get(post_id, []) + items
+                merged.sort(key=lambda c: (c.reg_ts is None, c.reg_ts or 0))
+                self._comments_by_post[post_id] = merged
+
+    def _build_indexes(self):
+        """고객사/등록일 인덱스 생성 (로드 시 1회)"""
+        by_client: Dict[str, List[int]] = {}
+        for i, post in enumerate(self.posts_data):
+            by_client.setdefault(post.name, []).append(i)
+
+        self._client_names = sorted(name for name in by_client if name)
+        self.client_matcher = ClientNameMatcher(self._client_names)
+        self._client_dated = {}
+        self._client_undated = {}
+        for name, indices in by_client.items():
+            dated = sorted((self.posts_data[i].reg_ts, i) for i in indices
+                           if self.posts_data[i].reg_ts is not None)
+            self._client_dated[name] = ([ts for ts, _ in dated], [i for _, i in dated])
+            self._client_undated[name] = [i for i in indices if self.posts_data[i].reg_ts is None]
+
+        # 기존 필터는 양방향 부분 문자열 비교이므로 고객사 간 매칭을 미리 계산
+        self._client_matches = {}
+        for name in by_client:
+            self._client_matches[name] = [other for other in by_client
+                                          if name in other or other in name]
+
+        dated = sorted((post.reg_ts, i) for i, post in enumerate(self.posts_data)
+                       if post.reg_ts is not None)
+        self._date_ts = [ts for ts, _ in dated]
+        self._date_idx = [i for _, i in dated]
+        self._undated = [i for i, post in enumerate(self.posts_data) if post.reg_ts is None]
+
+        # 고객사/일자 버킷별 댓글 수 순위를 미리 계산 (상위 k개를 정렬 없이 바로 선택)
+        posts = self.posts_data
+        self._ranked_all = sorted(range(len(posts)), key=lambda i: (-posts[i].comm_cnt, i))
+        self._rank_pos = [0] * len(posts)
+        for pos, i in enumerate(self._ranked_all):
+            self._rank_pos[i] = pos
+
+        self._client_ranked = {name: [] for name in by_client}
+        self._day_ranked = {}
+        self._undated_ranked = []
+        for i in self._ranked_all:
+            post = posts[i]
+            self._client_ranked[post.name].append(i)
+            if post.reg_ts is None:
+                self._undated_ranked.append(i)
+            else:
+                day = datetime.fromtimestamp(post.reg_ts).toordinal()
+                self._day_ranked.setdefault(day, []).append(i)
+        self._day_keys = sorted(self._day_ranked)
+
+        # 게시글 ID별 댓글 매핑 (엣지 함수 번들의 댓글 샤드와 같은 등록일 순)
+        self._comments_by_post = {}
+        for comment in self.comments_data:
+            self._comments_by_post.setdefault(comment.post_id, []).append(comment)
+        for comments in self._comments_by_post.values():
+            # 날짜가 없는 댓글은 뒤로, 같은 시각은 원래 순서 유지
+            comments.sort(key=lambda c: (c.reg_ts is None, c.reg_ts or 0))
+
+    def _matching_client_names(self, client_name: str) -> List[str]:
+        """고객사 필터 값과 양방향 부분 문자열로 매칭되는 고객사 이름 목록"""
+        matches = self._client_matches.get(client_name)
+        if matches is None:
+            # 임의 입력값 캐시가 무한히 커지지 않도록 제한
+            if len(self._client_matches) > len(self._client_dated) + 1024:
+                self._client_matches = {name: self._client_matches[name]
+                                        for name in self._client_dated}
+            matches = [name for name in self._client_dated
+                       if client_name in name or name in client_name]
+            self._client_matches[client_name] = matches
+        return matches
+
+    def _make_post(self, row: Dict[str, str], reg_ts: Optional[int]) -> PostRecord:
+        """CSV 행을 PostRecord로 변환"""
+        return PostRecord(
+            id=row.get('id', '') or '',
+            name=row.get('name', '') or '',
+            writer=row.get('writer', '') or '',
+            subject=row.get('subject', '[제목 없음]'),
+            content=clean_html(row.get('content', '')),
+            reg_date=row.get('reg_date', '') or '',
+            reg_ts=reg_ts,
+            comm_cnt=_to_int(row.get('comm_cnt')),
+            hit_cnt=_to_int(row.get('hit_cnt')),
+        )
+
+    def _make_comment(self, row: Dict[str, str], reg_ts: Optional[int]) -> CommentRecord:
+        """CSV 행을 CommentRecord로 변환"""
+        return CommentRecord(
+            id=row.get('id', '') or '',
+            post_id=row.get('post_id', '') or '',
+            writer=row.get('writer', '') or '',
+            content=clean_html(row.get('content', '')),
+            reg_date=row.get('reg_date', '') or '',
+            reg_ts=reg_ts,
+        )
+
     def _parse_date(self, date_str: str) -> Optional[datetime]:
         """날짜 문자열을 datetime 객체로 변환"""
-        if not date_str:
+        return parse_date(date_str)
+
+    def _date_bounds(self, date_filter: Optional[str],
+                     now: Optional[datetime] = None) -> Optional[Tuple[float, float]]:
+        """
+        날짜 필터를 [시작, 끝) epoch 초 범위로 변환
+
+        Returns:
+            (start, end) 범위. 필터가 없거나 알 수 없는 값이면 None
+        """
+        if not date_filter:
             return None
-        
-        # 다양한 날짜 형식 시도
-        date_formats = [
-            '%Y-%m-%d %H:%M:%S',
-            '%Y-%m-%d',
-            '%Y/%m/%d %H:%M:%S',
-            '%Y/%m/%d'
-        ]
-        
-        for fmt in date_formats:
-            try:
-                return datetime.strptime(date_str.strip(), fmt)
-            except:
-                continue
-        
-        return None
-    
-    def _filter_by_date(self, date_str: str, date_filter: str) -> bool:
-        """날짜 필터에 맞는지 확인"""
-        if not date_filter or not date_str:
-            return True
-        
-        post_date = self._parse_date(date_str)
-        if not post_date:
-            return True
-        
-        now = datetime.now()
-        
+
+        now = now or datetime.now()
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        month_start = today.replace(day=1)
+
         if date_filter == 'today':
-            return post_date.date() == now.date()
+            start, end = today, today + timedelta(days=1)
         elif date_filter == 'yesterday':
-            return post_date.date() == (now - timedelta(days=1)).date()
+            start, end = today - timedelta(days=1), today
         elif date_filter == 'this_week':
-            week_start = now - timedelta(days=now.weekday())
-            return post_date >= week_start
+            return (now - timedelta(days=now.weekday())).timestamp(), float('inf')
         elif date_filter == 'last_week':
-            week_start = now - timedelta(days=now.weekday() + 7)
-            week_end = now - timedelta(days=now.weekday())
-            return week_start <= post_date < week_end
+            start = now - timedelta(days=now.weekday() + 7)
+            end = now - timedelta(days=now.weekday())
         elif date_filter == 'this_month':
-            return post_date.year == now.year and post_date.month == now.month
+            start = month_start
+            end = (month_start + timedelta(days=32)).replace(day=1)
         elif date_filter == 'last_month':
-            last_month = now - timedelta(days=now.day)
-            return post_date.year == last_month.year and post_date.month == last_month.month
+            start = (month_start - timedelta(days=1)).replace(day=1)
+            end = month_start
         elif date_filter == 'recent':
-            week_ago = now - timedelta(days=7)
-            return post_date >= week_ago
-        
-        return True
-    
-    def get_posts_text(self, limit: int = 30, client_name: Optional[str] = None, 
-                      date_filter: Optional[str] = None) -> str:
+            return (now - timedelta(days=7)).timestamp(), float('inf')
+        else:
+            return None
+
+        return start.timestamp(), end.timestamp()
+
+    def _filter_indices(self, client_name: Optional[str] = None,
+                        date_filter: Optional[str] = None) -> List[int]:
+        """
+        고객사/날짜 필터에 맞는 게시글 인덱스 (원래 순서)
+
+        인덱스에서 bisect로 범위를 찾으므로 O(log n + k)입니다.
+        """
+        bounds = self._date_bounds(date_filter)
+        if not client_name and not bounds:
+            return list(range(len(self.posts_data)))
+
+        if client_name:
+            groups = [(self._client_dated[name], self._client_undated[name])
+                      for name in self._matching_client_names(client_name)]
+        else:
+            groups = [((self._date_ts, self._date_idx), self._undated)]
+
+        indices: List[int] = []
+        for (ts_list, idx_list), undated in groups:
+            if bounds:
+                lo = bisect.bisect_left(ts_list, bounds[0])
+                hi = bisect.bisect_left(ts_list, bounds[1])
+                indices.extend(idx_list[lo:hi])
+            else:
+                indices.extend(idx_list)
+            indices.extend(undated)
+
+        indices.sort()
+        return indices
+
+    def _ranked_in_range(self, bounds: Tuple[float, float]) -> List[Iterable[int]]:
+        """날짜 범위에 걸친 일자 버킷의 순위 목록 (경계 일자는 시각으로 추가 필터)"""
+        start, end = bounds
+        first = datetime.fromtimestamp(start).toordinal()
+        lo = bisect.bisect_left(self._day_keys, first)
+        if end == float('inf'):
+            hi = len(self._day_keys)
+        else:
+            hi = bisect.bisect_right(self._day_keys, datetime.fromtimestamp(end).toordinal())
+
+        posts = self.posts_data
+        buckets: List[Iterable[int]] = []
+        for day in self._day_keys[lo:hi]:
+            ranked = self._day_ranked[day]
+            day_start = datetime.fromordinal(day).timestamp()
+            day_end = datetime.fromordinal(day + 1).timestamp()
+            if start <= day_start and day_end <= end:
+                buckets.append(ranked)
+            else:
+                buckets.append(i for i in ranked if start <= posts[i].reg_ts < end)
+        return buckets
+
+    def _top_indices(self, limit: int, client_name: Optional[str] = None,
+                     date_filter: Optional[str] = None) -> List[int]:
+        """
+        필터에 맞는 게시글 중 댓글 수 상위 limit개의 인덱스
+
+        미리 계산한 순위 목록을 병합하므로 전체 정렬이 필요 없습니다.
+        """
+        bounds = self._date_bounds(date_filter)
+        rank_key = self._rank_pos.__getitem__
+
+        if client_name and bounds:
+            candidates = self._filter_indices(client_name, date_filter)
+            return heapq.nsmallest(limit, candidates, key=rank_key)
+
+        if client_name:
+            names = self._matching_client_names(client_name)
+            if len(names) == 1:
+                return self._client_ranked[names[0]][:limit]
+            ranked_lists = [self._client_ranked[name] for name in names]
+        elif bounds:
+            ranked_lists = self._ranked_in_range(bounds) + [self._undated_ranked]
+        else:
+            return self._ranked_all[:limit]
+
+        return list(islice(heapq.merge(*ranked_lists, key=rank_key), limit))
+
+    def _format_post(self, post: PostRecord, comments_per_post: int = 0) -> str:
+        """게시글 1개를 컨텍스트 블록으로 변환 (content는 로드 시 이미 정리됨)"""
+        block = (
+            f"[고객사: {post.name}] 작성자: {post.writer} | 제목: {post.subject}\n"
+            f"내용: {post.content[:200]}...\n"
+            f"등록일: {post.reg_date} | 댓글 수: {post.comm_cnt}\n"
+        )
+        if comments_per_post:
+            # 등록일 순 앞쪽 댓글 (대개 문의에 대한 답변)
+            for comment in self._comments_by_post.get(post.id, [])[:comments_per_post]:
+                block += f"  └ 댓글 {comment.writer}: {comment.content[:150]}\n"
+        return block
+
+    def iter_post_blocks(self, limit: int = 30, client_name: Optional[str] = None,
+                         date_filter: Optional[str] = None,
+                         comments_per_post: int = 0) -> Iterator[str]:
+        """필터링 후 댓글 수 순위대로 게시글 블록을 하나씩 생성 (필요한 만큼만 포맷)"""
+        # 필터링 후 댓글 수 상위 limit개 선택 (문제 케이스 우선, 동률은 원래 순서)
+        for i in self._top_indices(limit, client_name, date_filter):
+            yield self._format_post(self.posts_data[i], comments_per_post)
+
+    def get_posts_text(self, limit: int = 30, client_name: Optional[str] = None,
+                      date_filter: Optional[str] = None, token_budget: Optional[int] = None,
+                      comments_per_post: int = 0) -> str:
         """
         게시글 데이터를 텍스트로 변환
-        
+
         Args:
             limit: 최대 게시글 수
             client_name: 고객사 이름 필터
             date_filter: 날짜 필터 (today, yesterday, this_week, last_week, this_month, last_month, recent)
-        
+            token_budget: 컨텍스트 토큰 예산 (지정하면 순위대로 게시글을 통째로 채우고 나머지는 생략)
+            comments_per_post: 게시글마다 함께 넣을 댓글 수
+
         Returns:
             게시글 정보를 담은 텍스트
         """
         if not self.posts_data:
             return ""
-        
-        filtered_posts = []
-        
-        for post in self.posts_data:
-            # 고객사 필터
-            if client_name:
-                post_client = post.get('name', '')
-                if client_name not in post_client and post_client not in client_name:
-                    continue
-            
-            # 날짜 필터
-            reg_date = post.get('reg_date', '')
-            if not self._filter_by_date(reg_date, date_filter):
-                continue
-            
-            filtered_posts.append(post)
-        
-        # 댓글 수 기준으로 정렬 (문제 케이스 우선)
-        filtered_posts.sort(key=lambda x: int(x.get('comm_cnt', 0) or 0), reverse=True)
-        
-        # 제한된 수만큼만 선택
-        selected_posts = filtered_posts[:limit]
-        
-        # 텍스트로 변환
-        result_lines = []
-        for post in selected_posts:
-            name = post.get('name', '')
-            writer = post.get('writer', '')
-            subject = post.get('subject', '[제목 없음]')
-            content = post.get('content', '')
-            reg_date = post.get('reg_date', '')
-            comm_cnt = post.get('comm_cnt', '0')
-            
-            # HTML 태그 제거 (간단한 처리)
-            import re
-            content = re.sub(r'<[^>]+>', '', content)
-            content = content.replace('&nbsp;', ' ').strip()
-            
-            result_lines.append(
-                f"[고객사: {name}] 작성자: {writer} | 제목: {subject}\n"
-                f"내용: {content[:200]}...\n"
-                f"등록일: {reg_date} | 댓글 수: {comm_cnt}\n"
-            )
-        
-        return "\n---\n".join(result_lines)
-    
-    def get_comments_for_post(self, post_id: str) -> List[Dict]:
-        """특정 게시글의 댓글 가져오기"""
-        return [comment for comment in self.comments_data 
-                if comment.get('post_id') == post_id]
-    
+
+        blocks = self.iter_post_blocks(limit, client_name, date_filter, comments_per_post)
+        if token_budget is None:
+            return POST_SEPARATOR.join(blocks)
+
+        packed = pack_blocks(blocks, token_budget, POST_SEPARATOR)
+        logger.info(f"게시판 컨텍스트: 게시글 {packed.blocks}개, 약 {packed.tokens}토큰 "
+                    f"(예산 {token_budget}, 제외 {packed.skipped}개)")
+        return packed.text
+
+    def get_comments_for_post(self, post_id: str) -> List[CommentRecord]:
+        """특정 게시글의 댓글 가져오기 (등록일 순)"""
+        return list(self._comments_by_post.get(post_id, []))
+
+    def get_comments_for_posts(self, post_ids: Iterable[str]) -> Dict[str, List[CommentRecord]]:
+        """
+        여러 게시글의 댓글을 한 번에 가져오기
+
+        Args:
+            post_ids: 게시글 ID 목록
+
+        Returns:
+            게시글 ID -> 댓글 목록 (등록일 순, 댓글이 없으면 빈 목록)
+        """
+        return {post_id: list(self._comments_by_post.get(post_id, []))
+                for post_id in post_ids}
+
     def get_client_names(self) -> List[str]:
         """고객사 이름 목록 가져오기"""
-        if not self.posts_data:
-            return []
-        
-        client_names = set()
-        for post in self.posts_data:
-            name = post.get('name', '')
-            if name:
-                client_names.add(name)
-        
-        return sorted(list(client_names))
-    
+        return list(self._client_names)
+
+    def match_client_name(self, message: str) -> Optional[str]:
+        """사용자 메시지에서 고객사 이름 찾기 (별칭/정규화 이름 포함, 메시지 1회 순회)"""
+        return self.client_matcher.match(message)
+
+    def fuzzy_match_client_name(self, message: str) -> Tuple[Optional[str], float]:
+        """사용자 메시지와 가장 비슷한 고객사 이름과 신뢰도 (자모 n-gram 유사도)"""
+        return self.client_matcher.fuzzy_match(message)
+
     def get_responsible_person(self, client_name: str) -> Optional[Dict]:
         """고객사별 최근 담당자 정보 가져오기"""
         if not self.posts_data:
             return None
-        
-        # 해당 고객사의 최근 게시글 찾기
-        client_posts = [post for post in self.posts_data 
-                       if client_name in post.get('name', '')]
-        
-        if not client_posts:
+
+        # 해당 고객사의 최근 게시글 찾기 (고객사별 등록일 인덱스의 마지막 값, 전체 게시글을 훑지 않음)
+        # 날짜가 없는 게시글은 가장 오래된 것으로 취급하고, 같은 시각이면 앞쪽 게시글
+        latest = None
+        for name, (ts_list, idx_list) in self._client_dated.items():
+            if client_name not in name:
+                continue
+            if ts_list:
+                ts = ts_list[-1]
+                key = (ts, -idx_list[bisect.bisect_left(ts_list, ts)])
+            elif self._client_undated[name]:
+                key = (float('-inf'), -self._client_undated[name][0])
+            else:
+                continue
+            if latest is None or key > latest:
+                latest = key
+
+        if latest is None:
             return None
-        
+
         # 최근 게시글의 작성자 정보
-        latest_post = max(client_posts, 
-                         key=lambda x: self._parse_date(x.get('reg_date', '')) or datetime.min)
-        
+        latest_post = self.posts_data[-latest[1]]
+
         return {
-            'name': latest_post.get('writer', ''),
-            'last_activity': latest_post.get('reg_date', '')
+            'name': latest_post.writer,
+            'last_activity': latest_post.reg_date
         }
-
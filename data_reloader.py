@@ -0,0 +1,217 @@
+"""
+CSV 데이터 무중단 새로고침 모듈
+새 CSVDataLoader(데이터 + 인덱스)를 백그라운드 스레드에서 만든 뒤 참조 하나만 바꿔 끼웁니다.
+처리 중인 요청은 시작할 때 가져간 이전 로더를 끝까지 사용하며,
+CSV 파일의 수정 시각/크기가 바뀌면 자동으로 새로고침합니다.
+새로고침은 파일 끝에 추가된 행만 읽어 병합하며 (CSVDataLoader.refresh),
+파일이 새로 쓰인 경우에만 전체를 다시 로드합니다.
+바이너리 스냅샷(snapshot.py)이 있으면 첫 로드는 CSV 대신 스냅샷을 불러옵니다.
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+from csv_loader import CSVDataLoader
+from snapshot import load_snapshot
+
+logger = logging.getLogger(__name__)
+
+# 파일별 (수정 시각 ns, 크기), 파일이 없으면 None
+FileSignature = Tuple[Optional[Tuple[int, int]], ...]
+
+
+def file_signature(paths: List[str]) -> FileSignature:
+    """파일 변경 감지용 서명"""
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            signature.append(None)
+            continue
+        signature.append((st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+class DataReloader:
+    """
+    CSVDataLoader 스냅샷 관리
+
+    loader: 현재 스냅샷 (요청마다 한 번 읽어서 끝까지 사용)
+    poll_interval: CSV 파일 변경 확인 주기 (초, 0이면 자동 새로고침 안 함)
+    on_reload: 새 스냅샷으로 바꾼 뒤 호출할 함수 목록 (인자: 새 로더)
+    snapshot_path: 첫 로드에 사용할 바이너리 스냅샷 파일 (없거나 읽을 수 없으면 CSV 로드)
+    """
+
+    def __init__(self, posts_csv_path: str, comments_csv_path: str, poll_interval: float = 0,
+                 loader_factory: Callable[[str, str], CSVDataLoader] = CSVDataLoader,
+                 snapshot_path: Optional[str] = None):
+        self.posts_csv_path = posts_csv_path
+        self.comments_csv_path = comments_csv_path
+        self.poll_interval = poll_interval
+        self.snapshot_path = snapshot_path
+        self._loader_factory = loader_factory
+        self.on_reload: List[Callable[[CSVDataLoader], None]] = []
+
+        self.loader: Optional[CSVDataLoader] = None
+        self._signature: Optional[FileSignature] = None
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._pending = False
+        self._idle = threading.Event()
+        self._idle.set()
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+        self.reloads = 0
+        self.failures = 0
+        self.last_duration_ms: Optional[float] = None
+        self.last_reloaded_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_mode: Optional[str] = None
+        self.last_appended_rows = 0
+
+    def _paths(self) -> List[str]:
+        return [self.posts_csv_path, self.comments_csv_path]
+
+    def load(self, full: bool = False) -> CSVDataLoader:
+        """
+        현재 스레드에서 새로 로드해 바꿔 끼우고 새 로더 반환 (기존 스냅샷보다 나쁘면 유지)
+
+        full=False이면 추가된 행만 읽고, 처음 로드이거나 full=True이면 전체를 읽습니다.
+        """
+        started = time.perf_counter()
+        signature = file_signature(self._paths())
+        try:
+            if self.loader is None and not full:
+                loader = self._load_initial()
+            elif full:
+                loader = self._loader_factory(self.posts_csv_path, self.comments_csv_path)
+            else:
+                loader = self.loader.refresh()
+        except Exception as e:
+            self._record_failure(f"로드 실패: {e}")
+            return self.loader
+
+        # 파일을 쓰는 도중에 읽었으면 반쯤 쓰인 데이터일 수 있으므로 한 번 더 로드
+        if file_signature(self._paths()) != signature:
+            with self._lock:
+                self._pending = True
+            logger.info("로드 중 CSV 파일이 바뀌어 다시 로드합니다.")
+
+        # CSVDataLoader는 읽기 오류를 로그로만 남기므로, 데이터가 있던 상태에서 빈 결과는 반영하지 않음
+        if self.loader is not None and self.loader.posts_data and not loader.posts_data:
+            self._record_failure("새 원글 데이터가 비어 있어 기존 데이터를 유지합니다.")
+            return self.loader
+
+        self._signature = signature
+        self.reloads += 1
+        self.last_duration_ms = (time.perf_counter() - started) * 1000
+        self.last_reloaded_at = time.time()
+        self.last_error = None
+        self.last_mode = loader.load_mode
+        self.last_appended_rows = loader.appended_rows
+        if loader.load_mode == 'unchanged':
+            # 데이터가 같으므로 기존 스냅샷과 응답 캐시를 그대로 사용
+            return self.loader
+
+        self.loader = loader
+        logger.info(f"CSV 데이터 로드 완료 ({loader.load_mode}, {self.last_duration_ms:.0f}ms, "
+                    f"원글 {len(loader.posts_data)}개, 댓글 {len(loader.comments_data)}개)")
+        for callback in self.on_reload:
+            try:
+                callback(loader)
+            except Exception as e:
+                logger.warning(f"새로고침 후 처리 실패: {str(e)}")
+        return loader
+
+    def _load_initial(self) -> CSVDataLoader:
+        """스냅샷이 있으면 불러온 뒤 그 이후 CSV에 추가된 행만 병합, 없으면 CSV 전체 로드"""
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            try:
+                snapshot = load_snapshot(self.snapshot_path, self.posts_csv_path, self.comments_csv_path)
+            except Exception as e:
+                logger.warning(f"스냅샷을 불러오지 못해 CSV를 로드합니다: {str(e)}")
+            else:
+                # CSV가 스냅샷 이후 새로 쓰였으면 refresh가 전체 로드로 바뀜
+                loader = snapshot.refresh()
+                return snapshot if loader.load_mode == 'unchanged' else loader
+        return self._loader_factory(self.posts_csv_path, self.comments_csv_path)
+
+    def _record_failure(self, message: str):
+        self.failures += 1
+        self.last_error = message
+        logger.error(f"CSV 데이터 새로고침 실패: {message}")
+
+    def reload_async(self) -> bool:
+        """
+        백그라운드 새로고침 시작
+
+        이미 진행 중이면 끝난 뒤 한 번 더 로드하도록 예약하고 False를 반환합니다.
+        """
+        with self._lock:
+            if self._worker is not None:
+                self._pending = True
+                return False
+            self._idle.clear()
+            self._worker = threading.Thread(target=self._run_reloads, name='csv-reload', daemon=True)
+            self._worker.start()
+            return True
+
+    def _run_reloads(self):
+        while True:
+            try:
+                self.load()
+            except Exception as e:
+                self._record_failure(str(e))
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    self._idle.set()
+                    return
+                self._pending = False
+
+    @property
+    def reloading(self) -> bool:
+        return not self._idle.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """진행 중인 새로고침이 끝날 때까지 대기 (timeout 안에 끝나면 True)"""
+        return self._idle.wait(timeout)
+
+    def files_changed(self) -> bool:
+        return file_signature(self._paths()) != self._signature
+
+    def start_watching(self):
+        """poll_interval마다 CSV 파일 변경을 확인해 자동 새로고침"""
+        if self.poll_interval <= 0 or self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, name='csv-watch', daemon=True)
+        self._watcher.start()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            if not self.reloading and self.files_changed():
+                logger.info("CSV 파일 변경 감지, 백그라운드 새로고침 시작")
+                self.reload_async()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> Dict:
+        loader = self.loader
+        return {
+            'reloading': self.reloading,
+            'reloads': self.reloads,
+            'failures': self.failures,
+            'last_duration_ms': round(self.last_duration_ms, 1) if self.last_duration_ms is not None else None,
+            'last_reloaded_at': self.last_reloaded_at,
+            'last_error': self.last_error,
+            'last_mode': self.last_mode,
+            'last_appended_rows': self.last_appended_rows,
+            'posts_count': len(loader.posts_data) if loader else 0,
+            'comments_count': len(loader.comments_data) if loader else 0,
+            'poll_interval': self.poll_interval,
+        }
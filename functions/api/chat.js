@@ -1,4 +1,299 @@
 // Cloudflare Pages Function for chat API with CSV data support
+
+// 날짜 필터 확인
+function matchesDateFilter(post, dateFilter, now) {
+  if (!post.reg_date) return true;
+  const postDate = new Date(post.reg_date);
+
+  switch (dateFilter) {
+    case 'today':
+      return postDate.toDateString() === now.toDateString();
+    case 'yesterday':
+      const yesterday = new Date(now);
+      yesterday.setDate(yesterday.getDate() - 1);
+      return postDate.toDateString() === yesterday.toDateString();
+    case 'this_week':
+      const weekStart = new Date(now);
+      weekStart.setDate(weekStart.getDate() - weekStart.getDay());
+      return postDate >= weekStart;
+    case 'last_week':
+      const lastWeekStart = new Date(now);
+      lastWeekStart.setDate(lastWeekStart.getDate() - lastWeekStart.getDay() - 7);
+      const lastWeekEnd = new Date(now);
+      lastWeekEnd.setDate(lastWeekEnd.getDate() - lastWeekEnd.getDay());
+      return postDate >= lastWeekStart && postDate < lastWeekEnd;
+    case 'this_month':
+      return postDate.getMonth() === now.getMonth() && postDate.getFullYear() === now.getFullYear();
+    case 'last_month':
+      const lastMonth = new Date(now);
+      lastMonth.setMonth(lastMonth.getMonth() - 1);
+      return postDate.getMonth() === lastMonth.getMonth() && postDate.getFullYear() === lastMonth.getFullYear();
+    case 'recent':
+      const weekAgo = new Date(now);
+      weekAgo.setDate(weekAgo.getDate() - 7);
+      return postDate >= weekAgo;
+    default:
+      return true;
+  }
+}
+
+// 날짜 필터가 걸칠 수 있는 월 버킷 범위 ['YYYY-MM', 'YYYY-MM' 또는 null(상한 없음)]
+function monthRangeForFilter(dateFilter, now) {
+  const monthKey = date => `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
+  const daysAgo = days => {
+    const date = new Date(now);
+    date.setDate(date.getDate() - days);
+    return date;
+  };
+
+  switch (dateFilter) {
+    case 'today':
+      return [monthKey(now), monthKey(now)];
+    case 'yesterday':
+      return [monthKey(daysAgo(1)), monthKey(daysAgo(1))];
+    case 'this_week':
+      return [monthKey(daysAgo(now.getDay())), null];
+    case 'last_week':
+      return [monthKey(daysAgo(now.getDay() + 7)), monthKey(now)];
+    case 'this_month':
+      return [monthKey(now), monthKey(now)];
+    case 'last_month':
+      const lastMonth = new Date(now);
+      lastMonth.setMonth(lastMonth.getMonth() - 1);
+      return [monthKey(lastMonth), monthKey(lastMonth)];
+    case 'recent':
+      return [monthKey(daysAgo(7)), null];
+    default:
+      return ['', null];
+  }
+}
+
+// 댓글 수 내림차순 상위 k개 선택
+// 전체 정렬 대신 크기 k의 정렬 버퍼만 유지하며, 원본 배열은 변경하지 않음
+// 동률은 tieKey(기본: 배열 내 위치) 오름차순으로 정해 결과가 항상 같음
+function selectTopByComments(posts, k, tieKey = (post, i) => i) {
+  const before = (a, b) => a.count > b.count || (a.count === b.count && a.tie < b.tie);
+  const top = [];
+  for (let i = 0; i < posts.length; i++) {
+    const entry = { post: posts[i], count: posts[i].comm_cnt || 0, tie: tieKey(posts[i], i) };
+    if (top.length === k && !before(entry, top[k - 1])) continue;
+
+    let lo = 0;
+    let hi = top.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (before(top[mid], entry)) lo = mid + 1;
+      else hi = mid;
+    }
+    top.splice(lo, 0, entry);
+    if (top.length > k) top.pop();
+  }
+  return top.map(entry => entry.post);
+}
+
+// 시스템 프롬프트에 넣는 게시판 컨텍스트 길이와 게시글 구분자
+const CONTEXT_CHARS = 3000;
+const POST_SEPARATOR = '\n---\n';
+// 게시글 위치 목록에서 한 번에 읽는 게시글 수
+const POST_BATCH = 6;
+
+// 컨텍스트에 넣는 게시글 한 건
+function formatPost(post, comments) {
+  const commentsText = comments.length > 0 
+    ? `\n댓글 (${comments.length}개): ${comments.map(c => `${c.writer}: ${c.content}`).join(' | ')}`
+    : '';
+  return `[고객사: ${post.name}] 작성자: ${post.writer} | 제목: ${post.subject}\n내용: ${post.content}\n등록일: ${post.reg_date} | 댓글 수: ${post.comm_cnt}${commentsText}`;
+}
+
+// 선택된 게시글 위치 목록을 앞에서부터 게시글로 바꿈
+// 컨텍스트는 앞 CONTEXT_CHARS자만 사용하므로 그 길이를 채우면 나머지 고객사 샤드는 읽지 않음
+async function resolveContextPosts(bundle, refs) {
+  const posts = [];
+  let offset = 0;
+  for (let i = 0; i < refs.length && offset < CONTEXT_CHARS; i += POST_BATCH) {
+    for (const post of await bundle.postsAt(refs.slice(i, i + POST_BATCH))) {
+      posts.push(post);
+      offset += formatPost(post, []).length + POST_SEPARATOR.length;
+    }
+  }
+  return posts;
+}
+
+// 값 배열을 필드 이름 객체로 변환
+function toObject(fields, values) {
+  const obj = {};
+  for (let i = 0; i < fields.length; i++) obj[fields[i]] = values[i];
+  return obj;
+}
+
+// 게시글 ID 비교 (길이 -> 문자열 순, 숫자 ID는 숫자 순) - 변환 시 댓글 샤드 정렬 기준과 같음
+function comparePostId(a, b) {
+  return a.length - b.length || (a < b ? -1 : a > b ? 1 : 0);
+}
+
+// 게시글 ID가 들어 있는 댓글 샤드 번호 (없으면 -1)
+function findCommentShard(shards, postId) {
+  let lo = 0;
+  let hi = shards.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (comparePostId(shards[mid][0], postId) <= 0) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo > 0 && comparePostId(postId, shards[lo - 1][1]) <= 0 ? lo - 1 : -1;
+}
+
+// convert_csv_to_json.py가 만든 번들(manifest.json + 샤드)을 필요한 파일만 읽는 요청별 리더
+class DataBundle {
+  constructor(origin, manifest) {
+    this.origin = origin;
+    this.manifest = manifest;
+    this.clientNames = manifest.clients.map(client => client[0]);
+    this.shards = new Map();
+  }
+
+  // 번들이 배포되지 않았으면 posts.json / comments.json 전체를 읽어 같은 구조로 사용
+  static async load(origin) {
+    const manifest = await fetchJSON(`${origin}/data/manifest.json`);
+    if (manifest) return new DataBundle(origin, manifest);
+    const [posts, comments] = await Promise.all([
+      fetchJSON(`${origin}/data/posts.json`),
+      fetchJSON(`${origin}/data/comments.json`),
+    ]);
+    return posts ? DataBundle.fromArrays(origin, posts, comments || []) : null;
+  }
+
+  // 게시글/댓글 객체 배열로 번들과 같은 매니페스트와 샤드를 메모리에 만듦 (convert_csv_to_json.write_bundle과 같은 순서)
+  static fromArrays(origin, posts, comments) {
+    const postFields = ['id', 'writer', 'subject', 'content', 'reg_date', 'comm_cnt', 'hit_cnt', 'idx'];
+    const commentFields = ['writer', 'content', 'reg_date'];
+    // 댓글 수 내림차순 순위 (동률은 원래 순서)
+    const ranking = posts.map((post, i) => i)
+      .sort((a, b) => (posts[b].comm_cnt || 0) - (posts[a].comm_cnt || 0) || a - b);
+    const names = [...new Set(posts.map(post => post.name || ''))].sort();
+    const clientIndices = new Map(names.map((name, i) => [name, i]));
+    const clientRows = names.map(() => []);
+    const monthRows = new Map();
+    const refs = [];
+    for (const i of ranking) {
+      const post = posts[i];
+      const clientIndex = clientIndices.get(post.name || '');
+      const ref = [clientIndex, clientRows[clientIndex].length];
+      refs.push(ref);
+      clientRows[clientIndex].push(postFields.map(field => (field === 'idx' ? i : post[field])));
+      const month = /^\d{4}-\d{2}/.test(post.reg_date || '') ? post.reg_date.slice(0, 7) : '';
+      if (!monthRows.has(month)) monthRows.set(month, []);
+      monthRows.get(month).push([...ref, post.reg_date, post.comm_cnt, i]);
+    }
+    // 게시글 ID별 댓글 (등록일 순, 같으면 원래 순서)
+    const commentsByPost = {};
+    for (const comment of comments) {
+      const postId = String(comment.post_id ?? '');
+      (commentsByPost[postId] ||= []).push(comment);
+    }
+    const postIds = Object.keys(commentsByPost).sort(comparePostId);
+    for (const postId of postIds) {
+      commentsByPost[postId] = commentsByPost[postId]
+        .sort((a, b) => ((a.reg_date || '') < (b.reg_date || '') ? -1 : (a.reg_date || '') > (b.reg_date || '') ? 1 : 0))
+        .map(comment => commentFields.map(field => comment[field]));
+    }
+
+    const months = [...monthRows.keys()].sort();
+    const bundle = new DataBundle(origin, {
+      version: 1,
+      post_fields: postFields,
+      comment_fields: commentFields,
+      clients: names.map((name, i) => [name, clientRows[i].length]),
+      top: refs.slice(0, 30),
+      months,
+      comment_shards: postIds.length ? [[postIds[0], postIds[postIds.length - 1]]] : [],
+    });
+    clientRows.forEach((rows, i) => bundle.shards.set(`posts/${i}.json`, Promise.resolve(rows)));
+    for (const month of months) {
+      bundle.shards.set(`months/${month || 'undated'}.json`, Promise.resolve(monthRows.get(month)));
+    }
+    bundle.shards.set('comments/0.json', Promise.resolve(commentsByPost));
+    return bundle;
+  }
+
+  // 같은 요청 안에서는 샤드를 한 번만 읽음
+  shard(path) {
+    if (!this.shards.has(path)) {
+      this.shards.set(path, fetchJSON(`${this.origin}/data/${path}`));
+    }
+    return this.shards.get(path);
+  }
+
+  // 고객사 게시글 (댓글 수 순위 순서)
+  async clientPosts(clientIndex) {
+    const [name] = this.manifest.clients[clientIndex];
+    const rows = (await this.shard(`posts/${clientIndex}.json`)) || [];
+    return rows.map(row => {
+      const post = toObject(this.manifest.post_fields, row);
+      post.name = name;
+      return post;
+    });
+  }
+
+  // [고객사 번호, 샤드 안 위치] 목록의 게시글 (필요한 고객사 샤드만 읽음)
+  async postsAt(refs) {
+    const clientIndices = [...new Set(refs.map(([clientIndex]) => clientIndex))];
+    const posts = new Map(await Promise.all(
+      clientIndices.map(async clientIndex => [clientIndex, await this.clientPosts(clientIndex)])
+    ));
+    return refs.map(([clientIndex, pos]) => posts.get(clientIndex)[pos]).filter(Boolean);
+  }
+
+  // 날짜 필터에 맞는 전체 게시글 중 댓글 수 상위 k개의 [고객사 번호, 샤드 안 위치] (동률은 원래 순서)
+  // 필터 범위에 걸친 월 인덱스만 읽음
+  async refsByDate(dateFilter, now, k) {
+    const [fromKey, toKey] = monthRangeForFilter(dateFilter, now);
+    const months = this.manifest.months.filter(
+      key => !key || !(key < fromKey || (toKey && key > toKey))
+    );
+    const indexes = await Promise.all(months.map(key => this.shard(`months/${key || 'undated'}.json`)));
+    const candidates = [];
+    for (const entries of indexes) {
+      for (const [clientIndex, pos, reg_date, comm_cnt, idx] of entries || []) {
+        const entry = { clientIndex, pos, reg_date, comm_cnt, idx };
+        if (matchesDateFilter(entry, dateFilter, now)) candidates.push(entry);
+      }
+    }
+    return selectTopByComments(candidates, k, entry => entry.idx).map(entry => [entry.clientIndex, entry.pos]);
+  }
+
+  // 게시글 ID별 댓글 (등록일 순), 필요한 댓글 샤드만 읽음
+  async commentsFor(postIds) {
+    const shardIndices = new Set();
+    for (const postId of postIds) {
+      const shardIndex = findCommentShard(this.manifest.comment_shards, String(postId));
+      if (shardIndex >= 0) shardIndices.add(shardIndex);
+    }
+    const shards = await Promise.all([...shardIndices].map(i => this.shard(`comments/${i}.json`)));
+    const comments = new Map();
+    for (const shard of shards) {
+      if (!shard) continue;
+      for (const postId of postIds) {
+        if (shard[postId]) {
+          comments.set(postId, shard[postId].map(row => toObject(this.manifest.comment_fields, row)));
+        }
+      }
+    }
+    return comments;
+  }
+}
+
+// JSON 파일 읽기 (없거나 실패하면 null)
+async function fetchJSON(url) {
+  try {
+    const response = await fetch(url);
+    return response.ok ? await response.json() : null;
+  } catch (e) {
+    console.warn('JSON 데이터 로드 실패:', url, e);
+    return null;
+  }
+}
+
 export async function onRequestPost(context) {
   try {
     const { request, env } = context;
@@ -15,34 +310,18 @@ export async function onRequestPost(context) {
       );
     }
 
-    // JSON 데이터 로드
-    let postsData = [];
-    let commentsData = [];
-    let indexedData = null;
-    
-    try {
-      // Cloudflare Pages에서는 public 디렉토리의 파일에 접근
-      const baseUrl = new URL(request.url);
-      const postsResponse = await fetch(`${baseUrl.origin}/data/posts.json`);
-      const commentsResponse = await fetch(`${baseUrl.origin}/data/comments.json`);
-      const indexedResponse = await fetch(`${baseUrl.origin}/data/indexed.json`);
-      
-      if (postsResponse.ok) postsData = await postsResponse.json();
-      if (commentsResponse.ok) commentsData = await commentsResponse.json();
-      if (indexedResponse.ok) indexedData = await indexedResponse.json();
-    } catch (e) {
-      console.warn('JSON 데이터 로드 실패:', e);
-    }
+    // 번들 매니페스트 로드 (게시글/댓글 샤드는 필요한 것만 이후에 읽음)
+    // Cloudflare Pages에서는 public 디렉토리의 파일에 접근
+    const bundle = await DataBundle.load(new URL(request.url).origin);
 
     // 고객사 이름 추출
     let clientName = null;
-    if (indexedData && indexedData.client_names) {
-      for (const name of indexedData.client_names) {
-        if (userMessage.includes(name) || name.includes(userMessage.split(' ')[0])) {
-          clientName = name;
-          break;
-        }
-      }
+    let clientIndex = -1;
+    if (bundle) {
+      clientIndex = bundle.clientNames.findIndex(
+        name => userMessage.includes(name) || name.includes(userMessage.split(' ')[0])
+      );
+      if (clientIndex >= 0) clientName = bundle.clientNames[clientIndex];
     }
 
     // 날짜 필터 감지
@@ -68,84 +347,46 @@ export async function onRequestPost(context) {
       }
     }
 
-    // 필터링된 게시글 가져오기
-    let filteredPosts = postsData;
-    
-    if (clientName && indexedData && indexedData.clients) {
-      filteredPosts = indexedData.clients[clientName] || [];
-    }
-    
-    // 날짜 필터 적용
-    if (dateFilter) {
-      const now = new Date();
-      filteredPosts = filteredPosts.filter(post => {
-        if (!post.reg_date) return true;
-        const postDate = new Date(post.reg_date);
-        
-        switch (dateFilter) {
-          case 'today':
-            return postDate.toDateString() === now.toDateString();
-          case 'yesterday':
-            const yesterday = new Date(now);
-            yesterday.setDate(yesterday.getDate() - 1);
-            return postDate.toDateString() === yesterday.toDateString();
-          case 'this_week':
-            const weekStart = new Date(now);
-            weekStart.setDate(weekStart.getDate() - weekStart.getDay());
-            return postDate >= weekStart;
-          case 'last_week':
-            const lastWeekStart = new Date(now);
-            lastWeekStart.setDate(lastWeekStart.getDate() - lastWeekStart.getDay() - 7);
-            const lastWeekEnd = new Date(now);
-            lastWeekEnd.setDate(lastWeekEnd.getDate() - lastWeekEnd.getDay());
-            return postDate >= lastWeekStart && postDate < lastWeekEnd;
-          case 'this_month':
-            return postDate.getMonth() === now.getMonth() && postDate.getFullYear() === now.getFullYear();
-          case 'last_month':
-            const lastMonth = new Date(now);
-            lastMonth.setMonth(lastMonth.getMonth() - 1);
-            return postDate.getMonth() === lastMonth.getMonth() && postDate.getFullYear() === lastMonth.getFullYear();
-          case 'recent':
-            const weekAgo = new Date(now);
-            weekAgo.setDate(weekAgo.getDate() - 7);
-            return postDate >= weekAgo;
-          default:
-            return true;
-        }
-      });
-    }
+    // 필터링 후 댓글 수 상위 30개 선택 (문제 케이스 우선)
+    // 고객사 샤드와 전체 상위 목록은 변환 시 댓글 수 순으로 미리 정렬되어 있음
+    const now = new Date();
+    let selectedPosts = [];
+    const clientPosts = clientName ? await bundle.clientPosts(clientIndex) : [];
 
-    // 댓글 수 기준으로 정렬 (문제 케이스 우선)
-    filteredPosts.sort((a, b) => (b.comm_cnt || 0) - (a.comm_cnt || 0));
-    
-    // 최대 30개만 선택
-    const selectedPosts = filteredPosts.slice(0, 30);
+    if (clientName) {
+      selectedPosts = dateFilter
+        ? selectTopByComments(clientPosts.filter(post => matchesDateFilter(post, dateFilter, now)), 30)
+        : clientPosts.slice(0, 30);
+    } else if (bundle) {
+      const refs = dateFilter ? await bundle.refsByDate(dateFilter, now, 30) : bundle.manifest.top;
+      selectedPosts = await resolveContextPosts(bundle, refs);
+    }
 
     // 컨텍스트 생성
     let boardContext = '';
     if (selectedPosts.length > 0) {
-      boardContext = selectedPosts.map(post => {
-        const comments = indexedData && indexedData.comments_by_post 
-          ? (indexedData.comments_by_post[post.id] || []) 
-          : [];
-        const commentsText = comments.length > 0 
-          ? `\n댓글 (${comments.length}개): ${comments.map(c => `${c.writer}: ${c.content}`).join(' | ')}`
-          : '';
-        
-        return `[고객사: ${post.name}] 작성자: ${post.writer} | 제목: ${post.subject}\n내용: ${post.content}\n등록일: ${post.reg_date} | 댓글 수: ${post.comm_cnt}${commentsText}`;
-      }).join('\n---\n');
+      // 컨텍스트는 앞 CONTEXT_CHARS자만 사용하므로, 댓글 없이 계산한 시작 위치가 그 안에 드는 게시글만 댓글을 읽음
+      // (댓글이 붙으면 뒤 게시글의 시작 위치는 더 뒤로 밀리므로 결과는 전체 댓글을 읽은 것과 같음)
+      const contextPostIds = [];
+      let offset = 0;
+      for (const post of selectedPosts) {
+        if (offset >= CONTEXT_CHARS) break;
+        contextPostIds.push(post.id);
+        offset += formatPost(post, []).length + POST_SEPARATOR.length;
+      }
+      const commentsByPost = await bundle.commentsFor(contextPostIds);
+      boardContext = selectedPosts.map(post => formatPost(post, commentsByPost.get(post.id) || [])).join(POST_SEPARATOR);
     }
 
     // 담당자 정보 추출
     let responsiblePersonInfo = null;
     if (userMessage.includes('담당자') || userMessage.includes('문의') || userMessage.includes('누구')) {
-      if (clientName && indexedData && indexedData.clients && indexedData.clients[clientName]) {
-        const clientPosts = indexedData.clients[clientName];
+      if (clientName) {
         if (clientPosts.length > 0) {
-          // 최근 게시글의 작성자
-          const latestPost = clientPosts.sort((a, b) => 
-            new Date(b.reg_date || 0) - new Date(a.reg_date || 0)
-          )[0];
+          // 최근 게시글의 작성자 (공유 인덱스 배열을 정렬하지 않도록 한 번만 순회)
+          const latestPost = clientPosts.reduce((latest, post) =>
+            new Date(post.reg_date || 0) > new Date(latest.reg_date || 0) ? post : latest
+          );
           responsiblePersonInfo = {
             name: latestPost.writer,
             last_activity: latestPost.reg_date
@@ -186,7 +427,7 @@ CSV 데이터를 참고하여 정확하고 도움이 되는 답변을 제공하
     }
 
     if (boardContext) {
-      systemPrompt += `\n\n[사내 게시판 정보]\n${boardContext.substring(0, 3000)}\n\n위 정보를 참고하여 답변하세요.`;
+      systemPrompt += `\n\n[사내 게시판 정보]\n${boardContext.substring(0, CONTEXT_CHARS)}\n\n위 정보를 참고하여 답변하세요.`;
     }
 
     // OpenAI API 호출
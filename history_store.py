@@ -0,0 +1,251 @@
+"""
+세션별 대화 기록 저장소 모듈
+사용자(세션)마다 최근 메시지만 보관하고, 오래 사용하지 않은 세션은 제거합니다.
+단일 프로세스용 메모리 저장소와 다중 프로세스 배포용 SQLite 저장소를 제공합니다.
+"""
+import abc
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+Message = Dict[str, str]
+
+
+class HistoryStore(abc.ABC):
+    """
+    대화 기록 저장소 인터페이스
+
+    max_messages: 세션별로 보관하는 최근 메시지 수 (GPT에 보내는 기록 길이와 동일)
+    idle_ttl_seconds: 마지막 사용 후 이 시간이 지나면 세션 제거
+    """
+
+    def __init__(self, max_messages: int = 10, idle_ttl_seconds: float = 3600,
+                 clock: Callable[[], float] = time.time):
+        self.max_messages = max_messages
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._clock = clock
+
+    @abc.abstractmethod
+    def get(self, session_id: str) -> List[Message]:
+        """세션의 최근 메시지 목록 (오래된 것부터)"""
+
+    @abc.abstractmethod
+    def append(self, session_id: str, messages: List[Message]):
+        """세션에 메시지 추가 (max_messages를 넘는 오래된 메시지는 버림)"""
+
+    @abc.abstractmethod
+    def clear(self, session_id: str):
+        """세션 기록 삭제"""
+
+    @abc.abstractmethod
+    def evict_idle(self) -> int:
+        """유휴 세션 제거 후 제거한 세션 수 반환"""
+
+    @abc.abstractmethod
+    def stats(self) -> Dict:
+        """저장소 상태 (세션 수 등)"""
+
+
+class MemoryHistoryStore(HistoryStore):
+    """
+    프로세스 메모리 저장소
+
+    세션별 deque(maxlen)로 길이를 고정하고, 세션은 마지막 사용 순서로 관리해
+    유휴 세션과 max_sessions 초과분을 오래된 것부터 제거합니다.
+    """
+
+    def __init__(self, max_messages: int = 10, idle_ttl_seconds: float = 3600,
+                 max_sessions: int = 10000, clock: Callable[[], float] = time.time):
+        super().__init__(max_messages, idle_ttl_seconds, clock)
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        # 세션 ID -> (메시지 deque, 마지막 사용 시각), 마지막 사용 순서
+        self._sessions: 'OrderedDict[str, Tuple[Deque[Message], float]]' = OrderedDict()
+        self.evicted_sessions = 0
+
+    def _evict_locked(self, now: float) -> int:
+        evicted = 0
+        expire_before = now - self.idle_ttl_seconds
+        while self._sessions:
+            session_id, (_, last_used) = next(iter(self._sessions.items()))
+            if last_used > expire_before and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[session_id]
+            evicted += 1
+        self.evicted_sessions += evicted
+        return evicted
+
+    def get(self, session_id: str) -> List[Message]:
+        with self._lock:
+            now = self._clock()
+            self._evict_locked(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return []
+            self._sessions[session_id] = (entry[0], now)
+            self._sessions.move_to_end(session_id)
+            return list(entry[0])
+
+    def append(self, session_id: str, messages: List[Message]):
+        with self._lock:
+            now = self._clock()
+            entry = self._sessions.pop(session_id, None)
+            history = entry[0] if entry else deque(maxlen=self.max_messages)
+            history.extend(messages)
+            self._sessions[session_id] = (history, now)
+            self._evict_locked(now)
+
+    def clear(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            return self._evict_locked(self._clock())
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'sessions': len(self._sessions),
+                'messages': sum(len(history) for history, _ in self._sessions.values()),
+                'max_messages': self.max_messages,
+                'max_sessions': self.max_sessions,
+                'idle_ttl_seconds': self.idle_ttl_seconds,
+                'evicted_sessions': self.evicted_sessions,
+            }
+
+
+class SQLiteHistoryStore(HistoryStore):
+    """
+    SQLite 저장소 (여러 워커 프로세스가 같은 DB 파일 공유)
+
+    스레드별 연결을 사용하며, WAL 모드로 읽기와 쓰기가 서로 막지 않도록 합니다.
+    유휴 세션 정리는 evict_interval번 쓰기마다 한 번 수행합니다.
+    """
+
+    def __init__(self, db_path: str, max_messages: int = 10, idle_ttl_seconds: float = 3600,
+                 evict_interval: int = 100, clock: Callable[[], float] = time.time):
+        super().__init__(max_messages, idle_ttl_seconds, clock)
+        self.db_path = db_path
+        self.evict_interval = evict_interval
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self.evicted_sessions = 0
+
+        conn = self._conn()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chat_sessions (
+                    session_id TEXT PRIMARY KEY,
+                    last_used REAL NOT NULL
+                )""")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS chat_messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_messages_session "
+                         "ON chat_messages (session_id, id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_sessions_last_used "
+                         "ON chat_sessions (last_used)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id: str) -> List[Message]:
+        conn = self._conn()
+        now = self._clock()
+        with conn:
+            updated = conn.execute(
+                "UPDATE chat_sessions SET last_used = ? WHERE session_id = ? AND last_used > ?",
+                (now, session_id, now - self.idle_ttl_seconds)).rowcount
+            if not updated:
+                return []
+            rows = conn.execute(
+                "SELECT role, content FROM chat_messages WHERE session_id = ? "
+                "ORDER BY id DESC LIMIT ?", (session_id, self.max_messages)).fetchall()
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def append(self, session_id: str, messages: List[Message]):
+        conn = self._conn()
+        now = self._clock()
+        with conn:
+            # 유휴 시간이 지난 세션에 이어 쓰면 이전 기록은 버림
+            conn.execute("DELETE FROM chat_messages WHERE session_id IN ("
+                         "SELECT session_id FROM chat_sessions WHERE session_id = ? AND last_used <= ?)",
+                         (session_id, now - self.idle_ttl_seconds))
+            conn.execute("INSERT INTO chat_sessions (session_id, last_used) VALUES (?, ?) "
+                         "ON CONFLICT(session_id) DO UPDATE SET last_used = excluded.last_used",
+                         (session_id, now))
+            conn.executemany("INSERT INTO chat_messages (session_id, role, content) VALUES (?, ?, ?)",
+                             [(session_id, m["role"], m["content"]) for m in messages])
+            conn.execute("DELETE FROM chat_messages WHERE session_id = ? AND id <= ("
+                         "SELECT id FROM chat_messages WHERE session_id = ? "
+                         "ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                         (session_id, session_id, self.max_messages))
+
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % self.evict_interval == 0
+        if due:
+            self.evict_idle()
+
+    def clear(self, session_id: str):
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM chat_messages WHERE session_id = ?", (session_id,))
+            conn.execute("DELETE FROM chat_sessions WHERE session_id = ?", (session_id,))
+
+    def evict_idle(self) -> int:
+        conn = self._conn()
+        expire_before = self._clock() - self.idle_ttl_seconds
+        with conn:
+            conn.execute("DELETE FROM chat_messages WHERE session_id IN ("
+                         "SELECT session_id FROM chat_sessions WHERE last_used <= ?)", (expire_before,))
+            evicted = conn.execute("DELETE FROM chat_sessions WHERE last_used <= ?",
+                                   (expire_before,)).rowcount
+        self.evicted_sessions += evicted
+        if evicted:
+            logger.info(f"유휴 대화 세션 {evicted}개 제거")
+        return evicted
+
+    def stats(self) -> Dict:
+        conn = self._conn()
+        sessions = conn.execute("SELECT COUNT(*) FROM chat_sessions").fetchone()[0]
+        messages = conn.execute("SELECT COUNT(*) FROM chat_messages").fetchone()[0]
+        return {
+            'backend': 'sqlite',
+            'sessions': sessions,
+            'messages': messages,
+            'max_messages': self.max_messages,
+            'idle_ttl_seconds': self.idle_ttl_seconds,
+            'evicted_sessions': self.evicted_sessions,
+        }
+
+
+def create_history_store(backend: str = 'memory', db_path: Optional[str] = None,
+                         max_messages: int = 10, idle_ttl_seconds: float = 3600,
+                         max_sessions: int = 10000) -> HistoryStore:
+    """설정값으로 대화 기록 저장소 생성 ('memory' 또는 'sqlite')"""
+    if backend == 'memory':
+        return MemoryHistoryStore(max_messages, idle_ttl_seconds, max_sessions)
+    if backend == 'sqlite':
+        if not db_path:
+            raise ValueError("SQLite 대화 기록 저장소에는 DB 파일 경로가 필요합니다.")
+        return SQLiteHistoryStore(db_path, max_messages, idle_ttl_seconds)
+    raise ValueError(f"지원하지 않는 대화 기록 저장소입니다: {backend}")
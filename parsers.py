@@ -0,0 +1,112 @@
+"""
+CSV 필드 파싱 모듈
+csv_loader와 convert_csv_to_json이 공통으로 사용하는 날짜 파싱 엔진과 HTML 정리 함수입니다.
+"""
+import html
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+
+def _digits(text: str) -> bool:
+    return text.isascii() and text.isdigit()
+
+
+def _parse_date_uncached(date_str: str) -> Optional[datetime]:
+    """
+    고정 위치 슬라이싱으로 날짜 문자열 파싱
+
+    지원 형식:
+        YYYYMMDDHHMMSS, YYYYMMDD (PPM 내보내기 형식)
+        YYYY-MM-DD HH:MM:SS, YYYY-MM-DD HH:MM, YYYY-MM-DD ('/' 구분자, ISO 'T' 구분자 포함)
+    """
+    s = date_str.strip()
+    n = len(s)
+
+    try:
+        if _digits(s):
+            if n == 14:
+                return datetime(int(s[0:4]), int(s[4:6]), int(s[6:8]),
+                                int(s[8:10]), int(s[10:12]), int(s[12:14]))
+            if n == 8:
+                return datetime(int(s[0:4]), int(s[4:6]), int(s[6:8]))
+            return None
+
+        if n not in (10, 16, 19) or s[4] not in '-/' or s[7] != s[4]:
+            return None
+        year, month, day = s[0:4], s[5:7], s[8:10]
+        if not (_digits(year) and _digits(month) and _digits(day)):
+            return None
+        if n == 10:
+            return datetime(int(year), int(month), int(day))
+
+        if s[10] not in ' T' or s[13] != ':':
+            return None
+        hour, minute = s[11:13], s[14:16]
+        second = '0'
+        if n == 19:
+            if s[16] != ':':
+                return None
+            second = s[17:19]
+        if not (_digits(hour) and _digits(minute) and _digits(second)):
+            return None
+        return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+    except ValueError:
+        # 형식은 맞지만 값이 범위를 벗어난 경우 (예: 13월)
+        return None
+
+
+@lru_cache(maxsize=65536)
+def parse_date(date_str: str) -> Optional[datetime]:
+    """날짜 문자열을 datetime 객체로 변환 (실패 시 None, 문자열별 결과 캐시)"""
+    if not date_str:
+        return None
+    return _parse_date_uncached(date_str)
+
+
+def parse_timestamps(values: Iterable[str]) -> List[Optional[int]]:
+    """날짜 컬럼을 epoch 초(로컬 시간 기준) 목록으로 일괄 변환 (실패 시 None)"""
+    cache: Dict[str, Optional[int]] = {}
+    result = []
+    for value in values:
+        if value in cache:
+            ts = cache[value]
+        else:
+            parsed = _parse_date_uncached(value) if value else None
+            ts = cache[value] = int(parsed.timestamp()) if parsed else None
+        result.append(ts)
+    return result
+
+
+# HTML 태그 패턴 (모듈 로드 시 1회 컴파일)
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# 이 길이 이하의 값(제목, 짧은 댓글 등)은 결과를 캐시
+_CLEAN_CACHE_MAX_LEN = 256
+
+
+def _clean_html_uncached(text: str) -> str:
+    # 태그 제거 -> 엔티티 디코딩 순서이므로 디코딩된 '&lt;b&gt;'는 태그로 다시 제거되지 않음
+    if '<' in text:
+        text = _TAG_RE.sub('', text)
+    if '&' in text:
+        text = html.unescape(text)
+    # &nbsp;(\xa0)를 포함한 모든 공백 구간을 공백 하나로
+    return ' '.join(text.split())
+
+
+_clean_html_cached = lru_cache(maxsize=4096)(_clean_html_uncached)
+
+
+def clean_html(text: str) -> str:
+    """
+    HTML 태그 제거, 전체 HTML 엔티티 디코딩, 공백 정리
+
+    태그나 엔티티가 없는 텍스트는 해당 단계를 건너뛰고, 짧은 값은 결과를 캐시합니다.
+    """
+    if not text:
+        return ""
+    if len(text) <= _CLEAN_CACHE_MAX_LEN:
+        return _clean_html_cached(text)
+    return _clean_html_uncached(text)
@@ -0,0 +1,281 @@
+"""
+OpenAI 호출 안정화 모듈
+일시적인 오류(429, 5xx, 시간 초과, 연결 오류)는 지터를 섞은 지수 백오프로 재시도하고,
+연속 실패 시 회로 차단기로 호출을 잠시 멈추며,
+동시에 들어온 같은 요청은 진행 중인 호출 하나의 결과를 함께 사용합니다.
+"""
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 재시도할 HTTP 상태 코드
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# 재시도할 예외 이름 (openai 1.x: APITimeoutError, APIConnectionError, RateLimitError, InternalServerError)
+RETRYABLE_ERROR_NAMES = {'APITimeoutError', 'APIConnectionError', 'RateLimitError', 'InternalServerError'}
+# 서버가 보낸 Retry-After를 따르되 이 시간(초)을 넘지 않음
+MAX_RETRY_AFTER = 30.0
+
+
+class CircuitOpenError(Exception):
+    """회로 차단기가 열려 있어 호출하지 않음"""
+
+
+def is_retryable(error: BaseException) -> bool:
+    """일시적인 오류인지 (재시도하면 성공할 수 있는지)"""
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError)):
+        return True
+    status = getattr(error, 'status_code', None)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """오류 응답의 Retry-After 헤더 값 (초, 없으면 None)"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    value = headers.get('retry-after')
+    try:
+        return min(max(float(value), 0.0), MAX_RETRY_AFTER)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    """
+    지터를 섞은 지수 백오프 (full jitter)
+
+    n번째 재시도 전 대기 시간은 0 ~ min(max_delay, base_delay * 2^n) 사이의 임의 값이며,
+    서버가 Retry-After를 보내면 그 값을 하한으로 사용합니다.
+    """
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 rng: Optional[random.Random] = None):
+        self.max_attempts = max(max_attempts, 1)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def delay(self, retry_index: int, error: Optional[BaseException] = None) -> float:
+        backoff = self._rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry_index)))
+        server_delay = retry_after_seconds(error) if error is not None else None
+        return max(backoff, server_delay) if server_delay is not None else backoff
+
+
+class CircuitBreaker:
+    """
+    회로 차단기
+
+    closed: 정상 호출. 일시적 오류가 failure_threshold번 연속되면 open
+    open: reset_timeout 동안 호출하지 않고 즉시 CircuitOpenError
+    half_open: reset_timeout 후 시험 호출 1개만 허용. 성공하면 closed, 실패하면 다시 open
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.rejected = 0
+        self.opened = 0
+
+    def before_call(self):
+        """호출 전 확인 (차단 중이면 CircuitOpenError)"""
+        with self._lock:
+            if self.state == 'open':
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError("OpenAI API 호출이 일시적으로 차단되었습니다.")
+                self.state = 'half_open'
+                self._probe_in_flight = False
+            if self.state == 'half_open':
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError("OpenAI API 상태를 확인하는 중입니다.")
+                self._probe_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = 'closed'
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == 'half_open' or self._failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.opened += 1
+                    logger.warning(f"OpenAI API 회로 차단 ({self.reset_timeout}초)")
+                self.state = 'open'
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+    def release_probe(self):
+        """시험 호출이 일시적 오류가 아닌 이유로 끝난 경우 (상태 유지)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+
+class _Flight:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ResilientCaller:
+    """
+    재시도 + 회로 차단 + 같은 요청 합치기(single-flight)
+
+    call/call_async의 key가 같은 요청이 진행 중이면 새로 호출하지 않고 그 결과를 기다립니다.
+    """
+
+    def __init__(self, policy: Optional[RetryPolicy] = None, breaker: Optional[CircuitBreaker] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Hashable, 'asyncio.Task'] = {}
+
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.coalesced = 0
+
+    def _on_error(self, error: BaseException, attempt: int) -> Optional[float]:
+        """오류 기록 후 재시도 대기 시간 반환 (재시도하지 않으면 None)"""
+        if not is_retryable(error):
+            self.breaker.release_probe()
+            return None
+        self.breaker.record_failure()
+        if attempt + 1 >= self.policy.max_attempts or self.breaker.state == 'open':
+            return None
+        self.retries += 1
+        delay = self.policy.delay(attempt, error)
+        logger.warning(f"OpenAI API 일시 오류, {delay:.2f}초 후 재시도 ({attempt + 1}/"
+                       f"{self.policy.max_attempts - 1}): {error}")
+        return delay
+
+    def _call_with_retry(self, fn: Callable[[], Any]) -> Any:
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            self.attempts += 1
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    self.failures += 1
+                    raise
+                self._sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    def call(self, fn: Callable[[], Any], key: Optional[Hashable] = None) -> Any:
+        """fn을 재시도/회로 차단 아래에서 실행 (key가 같은 동시 요청은 한 번만 실행)"""
+        self.calls += 1
+        if key is None:
+            return self._call_with_retry(fn)
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._call_with_retry(fn)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+    async def _call_with_retry_async(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            self.attempts += 1
+            try:
+                result = await fn()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    self.failures += 1
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def call_async(self, fn: Callable[[], Awaitable[Any]], key: Optional[Hashable] = None) -> Any:
+        """
+        call의 비동기 버전 (같은 이벤트 루프 안의 동시 요청을 합침)
+
+        합친 호출은 어느 요청에도 속하지 않는 별도 태스크로 실행하고 모든 요청이 shield로 기다리므로,
+        처음 요청한 쪽이 취소되어도 나머지 요청은 결과를 받습니다.
+        """
+        self.calls += 1
+        if key is None:
+            return await self._call_with_retry_async(fn)
+
+        task = self._async_flights.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._call_with_retry_async(fn))
+            self._async_flights[key] = task
+            task.add_done_callback(lambda done: self._async_flight_done(key, done))
+        return await asyncio.shield(task)
+
+    def _async_flight_done(self, key: Hashable, task: 'asyncio.Task'):
+        if self._async_flights.get(key) is task:
+            del self._async_flights[key]
+        # 기다리던 요청이 모두 취소되었어도 '예외를 확인하지 않음' 경고가 나지 않도록
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'attempts': self.attempts,
+            'retries': self.retries,
+            'failures': self.failures,
+            'coalesced': self.coalesced,
+            'circuit_state': self.breaker.state,
+            'circuit_opened': self.breaker.opened,
+            'circuit_rejected': self.breaker.rejected,
+        }
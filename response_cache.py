@@ -0,0 +1,127 @@
+"""
+챗봇 응답 캐시 모듈
+같은 질문(정규화 메시지, 고객사, 날짜 필터, 게시판 컨텍스트)에 대한 GPT 응답을
+LRU + TTL 방식으로 보관합니다.
+"""
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 캐시 키: (정규화 메시지, 고객사, 날짜 필터, 게시판 컨텍스트 해시)
+CacheKey = Tuple[str, str, str, str]
+
+_SPACE_RE = re.compile(r'\s+')
+# 문장 끝 문장부호/물결표는 질문 의미에 영향이 없으므로 제거
+_TRAILING_PUNCT_RE = re.compile(r'[\s?!.~,]+$')
+# 항목별 고정 오버헤드 추정치 (키 튜플, OrderedDict 노드, 만료 시각)
+_ENTRY_OVERHEAD = 200
+
+
+def normalize_message(message: str) -> str:
+    """캐시 키용 메시지 정규화 (유니코드 NFKC, 소문자, 공백 정리, 끝 문장부호 제거)"""
+    text = unicodedata.normalize('NFKC', message or '').lower()
+    text = _SPACE_RE.sub(' ', text).strip()
+    return _TRAILING_PUNCT_RE.sub('', text)
+
+
+def make_cache_key(message: str, client_name: Optional[str], date_filter: Optional[str],
+                   board_context: str) -> CacheKey:
+    """응답 캐시 키 생성"""
+    context_hash = hashlib.sha1((board_context or '').encode('utf-8')).hexdigest()
+    return (normalize_message(message), client_name or '', date_filter or '', context_hash)
+
+
+def _entry_size(key: CacheKey, value: str) -> int:
+    return sum(len(part.encode('utf-8')) for part in key) + len(value.encode('utf-8')) + _ENTRY_OVERHEAD
+
+
+class ResponseCache:
+    """
+    크기(바이트) 상한과 TTL을 갖는 스레드 안전 LRU 캐시
+
+    가장 오래 사용되지 않은 항목부터 제거하며, 만료된 항목은 조회 시 제거합니다.
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024, ttl_seconds: float = 600,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        # 키 -> (응답, 만료 시각, 크기)
+        self._entries: 'OrderedDict[CacheKey, Tuple[str, float, int]]' = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: CacheKey) -> Optional[str]:
+        """캐시된 응답 (없거나 만료되었으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, size = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: CacheKey, value: str):
+        """응답 저장 (상한을 넘으면 오래된 항목부터 제거)"""
+        size = _entry_size(key, value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (value, self._clock() + self.ttl_seconds, size)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """전체 무효화 (게시판 데이터 새로고침 시)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.invalidations += 1
+        logger.info("응답 캐시 초기화")
+
+    def stats(self) -> Dict:
+        """적중률 등 캐시 통계"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+            }
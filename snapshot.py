@@ -0,0 +1,308 @@
+"""
+CSV 데이터 바이너리 스냅샷 모듈
+파싱과 인덱스 생성이 끝난 CSVDataLoader를 파일 하나로 저장하고,
+서버 시작 시 CSV를 다시 파싱하지 않고 mmap으로 바로 불러옵니다.
+
+파일 구성:
+    MAGIC(8) | 메타 길이(8) | 메타(pickle) | 패딩 | 배열 영역
+    - 문자열 테이블: 모든 문자열(중복 제거)의 UTF-8 바이트와 시작 위치 배열
+    - 게시글/댓글: 열마다 배열 하나 (문자열 열은 문자열 번호)
+    - 인덱스: 등록일/순위 배열, 고객사/일자/게시글별 목록은 이어 붙인 배열 + 구간
+배열은 mmap 위의 memoryview로 그대로 사용하므로 로드 시 복사가 없고,
+같은 파일을 여는 여러 워커 프로세스가 페이지 캐시를 공유합니다.
+레코드(PostRecord/CommentRecord)는 접근할 때 만듭니다.
+
+빌드:
+    python snapshot.py [원글 CSV] [댓글 CSV] [스냅샷 경로]
+"""
+import mmap
+import os
+import pickle
+import struct
+import sys
+import time
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Tuple
+import logging
+
+from csv_loader import CommentRecord, CSVDataLoader, PostRecord
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'PPMSNAP1'
+SNAPSHOT_VERSION = 1
+# 등록일이 없는 레코드의 reg_ts 값
+NONE_TS = -(2 ** 63)
+
+POST_STRING_FIELDS = ('id', 'name', 'writer', 'subject', 'content', 'reg_date')
+POST_INT_FIELDS = ('reg_ts', 'comm_cnt', 'hit_cnt')
+COMMENT_STRING_FIELDS = ('id', 'post_id', 'writer', 'content', 'reg_date')
+COMMENT_INT_FIELDS = ('reg_ts',)
+
+
+class SnapshotError(Exception):
+    """스냅샷 파일이 없거나 형식/버전이 맞지 않음"""
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class _StringTableBuilder:
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.blob = bytearray()
+        self.offsets = array('q', [0])
+
+    def add(self, value: str) -> int:
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self.offsets) - 1
+            self.blob += value.encode('utf-8')
+            self.offsets.append(len(self.blob))
+        return string_id
+
+
+def _int_column(records, field: str) -> array:
+    if field == 'reg_ts':
+        return array('q', (NONE_TS if r.reg_ts is None else r.reg_ts for r in records))
+    return array('q', (getattr(r, field) for r in records))
+
+
+def _concat(groups: Dict, values, typecode: str = 'i') -> Tuple[array, Dict]:
+    """키별 정수 목록을 배열 하나로 이어 붙이고 키 -> (시작, 끝) 구간 반환"""
+    merged = array(typecode)
+    ranges = {}
+    for key, items in groups.items():
+        start = len(merged)
+        merged.extend(values(items))
+        ranges[key] = (start, len(merged))
+    return merged, ranges
+
+
+def write_snapshot(loader: CSVDataLoader, path: str) -> int:
+    """
+    로더의 레코드와 인덱스를 스냅샷 파일로 저장 (임시 파일에 쓴 뒤 교체)
+
+    CSV에서 바로 로드한 로더만 저장할 수 있습니다 (댓글 목록을 레코드 객체 기준으로 대응시킴).
+
+    Returns:
+        파일 크기 (바이트)
+    """
+    if not isinstance(loader.posts_data, list) or not isinstance(loader.comments_data, list):
+        raise SnapshotError("CSV에서 로드한 데이터만 스냅샷으로 저장할 수 있습니다.")
+    strings = _StringTableBuilder()
+    posts, comments = loader.posts_data, loader.comments_data
+    arrays: Dict[str, array] = {}
+    for field in POST_STRING_FIELDS:
+        arrays[f'post_{field}'] = array('i', (strings.add(getattr(p, field)) for p in posts))
+    for field in POST_INT_FIELDS:
+        arrays[f'post_{field}'] = _int_column(posts, field)
+    for field in COMMENT_STRING_FIELDS:
+        arrays[f'comment_{field}'] = array('i', (strings.add(getattr(c, field)) for c in comments))
+    for field in COMMENT_INT_FIELDS:
+        arrays[f'comment_{field}'] = _int_column(comments, field)
+    arrays['string_offsets'] = strings.offsets
+    arrays['string_blob'] = array('B', strings.blob)
+
+    arrays['date_ts'] = array('q', loader._date_ts)
+    arrays['date_idx'] = array('i', loader._date_idx)
+    arrays['undated'] = array('i', loader._undated)
+    arrays['rank_pos'] = array('i', loader._rank_pos)
+    arrays['ranked_all'] = array('i', loader._ranked_all)
+    arrays['undated_ranked'] = array('i', loader._undated_ranked)
+
+    client_ranges = {}
+    for key, source in (('client_dated_ts', lambda n: loader._client_dated[n][0]),
+                        ('client_dated_idx', lambda n: loader._client_dated[n][1]),
+                        ('client_undated', loader._client_undated.__getitem__),
+                        ('client_ranked', loader._client_ranked.__getitem__)):
+        typecode = 'q' if key == 'client_dated_ts' else 'i'
+        arrays[key], client_ranges[key] = _concat({name: name for name in loader._client_dated}, source,
+                                                  typecode)
+    arrays['day_ranked'], day_ranges = _concat(loader._day_ranked, list)
+
+    # 댓글 번호 (게시글별 등록일 순)
+    comment_index = {id(c): i for i, c in enumerate(comments)}
+    arrays['comment_order'], comment_ranges = _concat(
+        loader._comments_by_post, lambda items: (comment_index[id(c)] for c in items))
+
+    offset = 0
+    layout = {}
+    for name, values in arrays.items():
+        layout[name] = (offset, len(values), values.typecode)
+        offset = _align(offset + len(values) * values.itemsize)
+
+    meta = pickle.dumps({
+        'version': SNAPSHOT_VERSION,
+        'byteorder': sys.byteorder,
+        'built_at': time.time(),
+        'arrays': layout,
+        'client_names': list(loader._client_names),
+        'client_matches': {name: loader._client_matches[name] for name in loader._client_dated
+                           if name in loader._client_matches},
+        'client_matcher': loader.client_matcher,
+        'client_ranges': client_ranges,
+        'day_keys': list(loader._day_keys),
+        'day_ranges': day_ranges,
+        'comment_ranges': comment_ranges,
+        'file_states': loader._file_states,
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        header = MAGIC + struct.pack('<Q', len(meta)) + meta
+        f.write(header + b'\0' * (_align(len(header)) - len(header)))
+        for values in arrays.values():
+            data = values.tobytes()
+            f.write(data + b'\0' * (_align(len(data)) - len(data)))
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+class _Strings:
+    """문자열 테이블 (번호 -> 문자열, 접근할 때 디코딩)"""
+
+    def __init__(self, blob: memoryview, offsets: memoryview):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __getitem__(self, string_id: int) -> str:
+        return str(self._blob[self._offsets[string_id]:self._offsets[string_id + 1]], 'utf-8')
+
+
+class _RecordColumns(Sequence):
+    """열 배열 위의 레코드 목록 (접근할 때 레코드 생성, 변경 불가)"""
+
+    def __init__(self, record_class, strings: _Strings, string_columns: List[memoryview],
+                 int_columns: List[memoryview]):
+        self._record_class = record_class
+        self._strings = strings
+        self._string_columns = string_columns
+        self._int_columns = int_columns
+
+    def __len__(self) -> int:
+        return len(self._int_columns[0])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        strings = self._strings
+        values = [strings[column[i]] for column in self._string_columns]
+        reg_ts = self._int_columns[0][i]
+        values.append(None if reg_ts == NONE_TS else reg_ts)
+        values.extend(column[i] for column in self._int_columns[1:])
+        return self._record_class(*values)
+
+
+class _CommentsByPost(Mapping):
+    """게시글 ID -> 댓글 목록 (등록일 순, 접근할 때 생성)"""
+
+    def __init__(self, comments: _RecordColumns, order: memoryview, ranges: Dict[str, Tuple[int, int]]):
+        self._comments = comments
+        self._order = order
+        self._ranges = ranges
+
+    def __getitem__(self, post_id: str) -> List[CommentRecord]:
+        start, end = self._ranges[post_id]
+        return [self._comments[i] for i in self._order[start:end]]
+
+    def __iter__(self):
+        return iter(self._ranges)
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+
+def load_snapshot(path: str, posts_csv_path: str, comments_csv_path: str) -> CSVDataLoader:
+    """
+    스냅샷 파일로 CSVDataLoader 생성 (CSV 파싱, 인덱스 생성 없음)
+
+    CSV 파일이 스냅샷 이후 바뀌었는지는 확인하지 않으므로, 필요하면 refresh()로 추가된 행을 병합합니다.
+    """
+    try:
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        raise SnapshotError(f"스냅샷 파일을 열 수 없습니다: {path} ({e})")
+    if mapped[:len(MAGIC)] != MAGIC:
+        raise SnapshotError(f"스냅샷 파일 형식이 아닙니다: {path}")
+    meta_len, = struct.unpack_from('<Q', mapped, len(MAGIC))
+    meta_start = len(MAGIC) + 8
+    meta = pickle.loads(mapped[meta_start:meta_start + meta_len])
+    if meta.get('version') != SNAPSHOT_VERSION or meta.get('byteorder') != sys.byteorder:
+        raise SnapshotError(f"스냅샷 버전이 맞지 않습니다: {path}")
+
+    view = memoryview(mapped)
+    data_start = _align(meta_start + meta_len)
+
+    def column(name: str) -> memoryview:
+        offset, count, typecode = meta['arrays'][name]
+        start = data_start + offset
+        return view[start:start + count * array(typecode).itemsize].cast(typecode)
+
+    strings = _Strings(column('string_blob'), column('string_offsets'))
+    posts = _RecordColumns(PostRecord, strings,
+                           [column(f'post_{field}') for field in POST_STRING_FIELDS],
+                           [column(f'post_{field}') for field in POST_INT_FIELDS])
+    comments = _RecordColumns(CommentRecord, strings,
+                              [column(f'comment_{field}') for field in COMMENT_STRING_FIELDS],
+                              [column(f'comment_{field}') for field in COMMENT_INT_FIELDS])
+
+    def grouped(name: str, ranges: Dict) -> Dict:
+        values = column(name)
+        return {key: values[start:end] for key, (start, end) in ranges.items()}
+
+    client_ranges = meta['client_ranges']
+    dated_ts = grouped('client_dated_ts', client_ranges['client_dated_ts'])
+    dated_idx = grouped('client_dated_idx', client_ranges['client_dated_idx'])
+
+    loader = CSVDataLoader.__new__(CSVDataLoader)
+    loader.posts_csv_path = posts_csv_path
+    loader.comments_csv_path = comments_csv_path
+    loader.posts_data = posts
+    loader.comments_data = comments
+    loader._client_names = meta['client_names']
+    loader._client_dated = {name: (dated_ts[name], dated_idx[name]) for name in dated_ts}
+    loader._client_undated = grouped('client_undated', client_ranges['client_undated'])
+    loader._client_matches = meta['client_matches']
+    loader._date_ts = column('date_ts')
+    loader._date_idx = column('date_idx')
+    loader._undated = column('undated')
+    loader._rank_pos = column('rank_pos')
+    loader._ranked_all = column('ranked_all')
+    loader._client_ranked = grouped('client_ranked', client_ranges['client_ranked'])
+    loader._day_ranked = grouped('day_ranked', meta['day_ranges'])
+    loader._day_keys = meta['day_keys']
+    loader._undated_ranked = column('undated_ranked')
+    loader._comments_by_post = _CommentsByPost(comments, column('comment_order'), meta['comment_ranges'])
+    loader.client_matcher = meta['client_matcher']
+    loader._file_states = meta['file_states']
+    loader.load_mode = 'snapshot'
+    loader.appended_rows = 0
+    return loader
+
+
+def main():
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    posts_csv = sys.argv[1] if len(sys.argv) > 1 else os.path.join(base_dir, '20251125_PPM학습용데이터_원글.csv')
+    comments_csv = sys.argv[2] if len(sys.argv) > 2 else os.path.join(base_dir, '20251125_PPM학습용데이터_댓글.csv')
+    snapshot_path = sys.argv[3] if len(sys.argv) > 3 else os.path.join(base_dir, 'data_snapshot.bin')
+
+    for path in (posts_csv, comments_csv):
+        if not os.path.exists(path):
+            print(f"오류: CSV 파일을 찾을 수 없습니다: {path}")
+            return
+
+    started = time.perf_counter()
+    loader = CSVDataLoader(posts_csv, comments_csv)
+    size = write_snapshot(loader, snapshot_path)
+    print(f"스냅샷 저장 완료: {snapshot_path} ({size / 1024 / 1024:.1f}MB, "
+          f"원글 {len(loader.posts_data)}개, 댓글 {len(loader.comments_data)}개, "
+          f"{time.perf_counter() - started:.2f}s)")
+
+
+if __name__ == '__main__':
+    main()